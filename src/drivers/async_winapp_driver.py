@@ -0,0 +1,537 @@
+"""
+Cliente asíncrono (asyncio) para WinAppDriver.
+
+Este módulo habla los mismos endpoints W3C que WinAppDriver/webdriver.Remote
+pero sin bloquear: permite que un único proceso controle muchas sesiones
+(varias instancias de la aplicación o varios endpoints) sobre un mismo event
+loop, compartiendo un pool de conexiones HTTP/1.1 persistentes.
+
+Solo usa la biblioteca estándar; los errores W3C se traducen a las mismas
+excepciones de Selenium que lanza el cliente síncrono.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.remote_connection import remote_commands
+from src.drivers.circuit_breaker import BreakerRegistry, session_breakers
+from src.drivers.grid import GridNode, get_grid
+from src.drivers.transport import CLOSE_APP_COMMAND, LAUNCH_APP_COMMAND
+from src.utils.config import Config
+from src.utils.metrics import command_metrics
+from src.utils.tracing import tracer
+
+
+# Claves con las que el servidor devuelve la referencia de un elemento
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+LEGACY_ELEMENT_KEY = "ELEMENT"
+
+# Tiempo máximo por comando HTTP (mismo valor por defecto que Selenium)
+DEFAULT_COMMAND_TIMEOUT = 120
+
+
+def _command_pattern(path: str) -> "re.Pattern":
+    """Convierte una ruta de Selenium ('/session/$sessionId/...') en una expresión regular."""
+    return re.compile("^" + "/".join(
+        "[^/]+" if segment.startswith("$") else re.escape(segment) for segment in path.split("/")
+    ) + "$")
+
+
+# Comandos de Selenium y de WinAppDriver (los que WinAppDriver.start_driver añade al
+# transporte síncrono), con los parámetros primero en orden de rutas más literales
+SELENIUM_COMMANDS: List[Tuple[str, str, "re.Pattern"]] = sorted(
+    ((name, method, _command_pattern(path)) for name, (method, path) in {
+        **remote_commands,
+        CLOSE_APP_COMMAND: ("POST", "/session/$sessionId/appium/app/close"),
+        LAUNCH_APP_COMMAND: ("POST", "/session/$sessionId/appium/app/launch"),
+    }.items()),
+    key=lambda command: command[2].pattern.count("[^/]+"),
+)
+
+
+def command_name(method: str, path: str) -> str:
+    """
+    Obtiene el nombre de un comando, el mismo que registra el transporte síncrono.
+    
+    Así las métricas y la traza de los drivers síncrono y asíncrono cuentan
+    cada comando W3C en una sola serie.
+    
+    Args:
+        method: Método HTTP
+        path: Ruta del comando
+    
+    Returns:
+        str: Nombre de Selenium (p. ej. 'findElement'), o 'POST /session/{id}/...'
+        si el comando no es de Selenium
+    """
+    for name, command_method, pattern in SELENIUM_COMMANDS:
+        if command_method == method and pattern.match(path):
+            return name
+    return f"{method} " + re.sub(r"/(session|element)/[^/]+", r"/\1/{id}", path)
+
+
+class AsyncConnectionPool:
+    """
+    Pool de conexiones HTTP/1.1 keep-alive compartible entre sesiones.
+    
+    Limita el número total de conexiones abiertas y reutiliza las ociosas
+    por host, de modo que cientos de comandos concurrentes no abren cientos
+    de sockets.
+    """
+    
+    def __init__(self, max_connections: Optional[int] = None,
+                 timeout: float = DEFAULT_COMMAND_TIMEOUT):
+        """
+        Inicializa el pool.
+        
+        Args:
+            max_connections: Conexiones simultáneas máximas (por defecto,
+                ASYNC_MAX_CONNECTIONS)
+            timeout: Tiempo máximo por petición en segundos
+        """
+        self.max_connections = max_connections or Config().get_async_max_connections()
+        self.timeout = timeout
+        self.stats = {"opened": 0, "reused": 0, "requests": 0}
+        self.logger = logging.getLogger(__name__)
+        self._idle: Dict[Tuple[str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._closed = False
+    
+    async def request(self, base_url: str, method: str, path: str,
+                      payload: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """
+        Envía una petición y devuelve el estado y el cuerpo de la respuesta.
+        
+        Args:
+            base_url: URL base del servidor (p. ej. http://127.0.0.1:4723)
+            method: Método HTTP
+            path: Ruta relativa a la URL base
+            payload: Cuerpo JSON (opcional)
+            timeout: Tiempo máximo de la petición (por defecto, el del pool)
+        
+        Returns:
+            Tuple[int, bytes]: Código de estado HTTP y cuerpo
+        """
+        if self._closed:
+            raise RuntimeError("El pool de conexiones está cerrado")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        url = urlsplit(base_url)
+        key = (url.hostname or "127.0.0.1", url.port or 80)
+        full_path = url.path.rstrip("/") + path
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            return await asyncio.wait_for(
+                self._request(key, method, full_path, body), timeout or self.timeout
+            )
+    
+    async def close(self) -> None:
+        """Cierra todas las conexiones ociosas."""
+        self._closed = True
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+    
+    async def _request(self, key: Tuple[str, int], method: str, path: str,
+                       body: bytes) -> Tuple[int, bytes]:
+        """Ejecuta la petición, reintentando una vez si la conexión reutilizada estaba cerrada."""
+        reused = bool(self._idle.get(key))
+        reader, writer = await self._acquire(key)
+        try:
+            status, data, keep_alive = await self._exchange(reader, writer, key, method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            if not reused:
+                raise
+            # El servidor cerró la conexión ociosa: se repite con una nueva
+            reader, writer = await self._open(key)
+            try:
+                status, data, keep_alive = await self._exchange(reader, writer, key, method, path, body)
+            except BaseException:
+                writer.close()
+                raise
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive and not self._closed:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+        return status, data
+    
+    async def _acquire(self, key: Tuple[str, int]):
+        """Obtiene una conexión ociosa o abre una nueva."""
+        connections = self._idle.get(key, [])
+        while connections:
+            reader, writer = connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.stats["reused"] += 1
+                return reader, writer
+            writer.close()
+        return await self._open(key)
+    
+    async def _open(self, key: Tuple[str, int]):
+        """Abre una conexión TCP nueva."""
+        self.stats["opened"] += 1
+        return await asyncio.open_connection(*key)
+    
+    @staticmethod
+    async def _exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        key: Tuple[str, int], method: str, path: str,
+                        body: bytes) -> Tuple[int, bytes, bool]:
+        """Escribe la petición y lee la respuesta completa."""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {key[0]}:{key[1]}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(head.encode("ascii") + body)
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Conexión cerrada por el servidor")
+        version, status = status_line.decode("latin-1").split()[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                data += await reader.readexactly(size)
+                await reader.readline()
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return int(status), data, keep_alive
+
+
+class AsyncWebElement:
+    """
+    Referencia asíncrona a un elemento de la interfaz.
+    """
+    
+    def __init__(self, driver: "AsyncWinAppDriver", element_id: str):
+        """
+        Inicializa el elemento.
+        
+        Args:
+            driver: Driver asíncrono propietario de la sesión
+            element_id: Identificador W3C del elemento
+        """
+        self.driver = driver
+        self.id = element_id
+    
+    def _path(self, suffix: str = "") -> str:
+        return f"/element/{self.id}{suffix}"
+    
+    async def click(self) -> None:
+        """Hace clic en el elemento."""
+        await self.driver.execute("POST", self._path("/click"), {})
+    
+    async def clear(self) -> None:
+        """Limpia el contenido del elemento."""
+        await self.driver.execute("POST", self._path("/clear"), {})
+    
+    async def send_keys(self, text: str) -> None:
+        """Envía texto al elemento."""
+        await self.driver.execute("POST", self._path("/value"), {"text": text, "value": list(text)})
+    
+    async def get_text(self) -> str:
+        """Obtiene el texto del elemento."""
+        return await self.driver.execute("GET", self._path("/text"))
+    
+    async def get_attribute(self, name: str) -> Optional[str]:
+        """Obtiene un atributo del elemento."""
+        return await self.driver.execute("GET", self._path(f"/attribute/{name}"))
+    
+    async def is_displayed(self) -> bool:
+        """Verifica si el elemento es visible."""
+        return bool(await self.driver.execute("GET", self._path("/displayed")))
+    
+    async def is_enabled(self) -> bool:
+        """Verifica si el elemento está habilitado."""
+        return bool(await self.driver.execute("GET", self._path("/enabled")))
+    
+    async def screenshot_as_png(self) -> bytes:
+        """Obtiene la captura del elemento en PNG."""
+        return base64.b64decode(await self.driver.execute("GET", self._path("/screenshot")))
+    
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        """Busca un elemento descendiente."""
+        result = await self.driver.execute(
+            "POST", self._path("/element"), {"using": by, "value": value}
+        )
+        return self.driver._to_element(result)
+    
+    async def find_elements(self, by: str, value: str) -> List["AsyncWebElement"]:
+        """Busca todos los elementos descendientes."""
+        result = await self.driver.execute(
+            "POST", self._path("/elements"), {"using": by, "value": value}
+        )
+        return [self.driver._to_element(item) for item in result]
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+    
+    def __hash__(self) -> int:
+        return hash(self.id)
+    
+    def __repr__(self) -> str:
+        return f"<AsyncWebElement id={self.id}>"
+
+
+class AsyncWinAppDriver:
+    """
+    Contraparte asíncrona de WinAppDriver.
+    
+    Varias instancias pueden compartir un AsyncConnectionPool para ejecutar
+    comandos de muchas sesiones en paralelo sobre un único event loop.
+    """
+    
+    def __init__(self, app_path: Optional[str] = None, url: Optional[str] = None,
+                 pool: Optional[AsyncConnectionPool] = None):
+        """
+        Inicializa el driver asíncrono.
+        
+        Args:
+            app_path: Ruta a la aplicación WPF a automatizar
+            url: URL de WinAppDriver (por defecto, el nodo menos cargado del grid
+                si WINAPPDRIVER_URLS está definido, o WINAPPDRIVER_URL)
+            pool: Pool de conexiones compartido (si no se indica, se crea
+                uno propio que se cierra en quit_driver)
+        """
+        self.config = Config()
+        self.app_path = app_path or self.config.get_app_path()
+        self.url = url or self.config.get_winappdriver_url()
+        self.grid_node: Optional[GridNode] = None
+        self._grid = None if url else get_grid(self.config)
+        self.breakers: BreakerRegistry = session_breakers
+        self.pool = pool or AsyncConnectionPool()
+        self.session_id: Optional[str] = None
+        self.logger = logging.getLogger(__name__)
+        self._owns_pool = pool is None
+        self._error_handler = ErrorHandler()
+    
+    async def start_driver(self) -> "AsyncWinAppDriver":
+        """
+        Crea la sesión en WinAppDriver.
+        
+        Las esperas se hacen en el cliente con sondeo cooperativo, así que el
+        wait implícito se fija a 0 para que el servidor no retenga conexiones
+        del pool durante las búsquedas fallidas.
+        
+        Returns:
+            AsyncWinAppDriver: La propia instancia, para encadenar llamadas
+        """
+        capabilities = {
+            "platformName": "Windows",
+            "appium:automationName": "Windows",
+            "appium:app": self.app_path,
+            "appium:deviceName": "WindowsPC",
+            "ms:waitForAppLaunch": "25",
+            "ms:experimental-webdriver": True,
+        }
+        if self._grid is not None:
+            # Reservar un nodo puede esperar a que otro quede libre: fuera del event loop
+            self.grid_node = await asyncio.get_running_loop().run_in_executor(None, self._grid.acquire)
+            self.url = self.grid_node.url
+        try:
+            breaker = self.breakers.get(self.url)
+            # Con el circuito del endpoint abierto se falla al instante, sin esperar al timeout
+            breaker.before_call()
+            try:
+                value = await self._command("POST", "/session", {
+                    "capabilities": {"firstMatch": [{}], "alwaysMatch": capabilities}
+                })
+            except BaseException as e:
+                breaker.record_failure(e)
+                raise
+            breaker.record_success()
+            self.session_id = value["sessionId"]
+            await self.implicitly_wait(0)
+            self.logger.info(f"Sesión asíncrona iniciada: {self.session_id}")
+            return self
+        except Exception as e:
+            self.logger.error(f"Error al iniciar sesión asíncrona: {str(e)}")
+            if self.grid_node is not None:
+                self._grid.release(self.grid_node, error=e)
+                self.grid_node = None
+            raise
+    
+    async def quit_driver(self) -> None:
+        """Cierra la sesión y, si es propio, el pool de conexiones."""
+        try:
+            if self.session_id:
+                await self._command("DELETE", f"/session/{self.session_id}")
+                self.logger.info(f"Sesión asíncrona cerrada: {self.session_id}")
+        except Exception as e:
+            self.logger.error(f"Error al cerrar sesión asíncrona: {str(e)}")
+        finally:
+            self.session_id = None
+            if self.grid_node is not None:
+                self._grid.release(self.grid_node)
+                self.grid_node = None
+            if self._owns_pool:
+                await self.pool.close()
+    
+    async def __aenter__(self) -> "AsyncWinAppDriver":
+        return await self.start_driver()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.quit_driver()
+    
+    async def execute(self, method: str, path: str,
+                      payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Ejecuta un comando W3C de la sesión actual.
+        
+        Args:
+            method: Método HTTP
+            path: Ruta relativa a /session/{id}
+            payload: Cuerpo JSON (opcional)
+        
+        Returns:
+            Any: Contenido de 'value' de la respuesta
+        """
+        if not self.session_id:
+            raise WebDriverException("La sesión asíncrona no está iniciada")
+        return await self._command(method, f"/session/{self.session_id}{path}", payload)
+    
+    async def _command(self, method: str, path: str,
+                       payload: Optional[Dict[str, Any]] = None) -> Any:
+        """Envía la petición y traduce los errores W3C a excepciones de Selenium."""
+        start = time.time()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            status, data = await self.pool.request(self.url, method, path, payload)
+            outcome = "error" if status >= 400 else "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            strategy = payload.get("using") if payload else None
+            name = command_name(method, path)
+            command_metrics.observe(name, elapsed, strategy)
+            tracer.emit("command", name, elapsed, outcome, start=start,
+                        **({"using": strategy} if strategy else {}))
+        text = data.decode("utf-8") if data else ""
+        response = json.loads(text) if text else {}
+        value = response.get("value") if isinstance(response, dict) else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            self._error_handler.check_response({"status": status, "value": text})
+            raise WebDriverException(f"Respuesta HTTP {status}: {text}")
+        if path == "/session" and "sessionId" in response:
+            value = dict(value or {}, sessionId=response["sessionId"])
+        return value
+    
+    def _to_element(self, value: Dict[str, str]) -> AsyncWebElement:
+        """Convierte una referencia W3C en AsyncWebElement."""
+        return AsyncWebElement(self, value.get(ELEMENT_KEY) or value[LEGACY_ELEMENT_KEY])
+    
+    async def implicitly_wait(self, seconds: float) -> None:
+        """Configura el wait implícito del servidor."""
+        await self.execute("POST", "/timeouts", {"implicit": int(seconds * 1000)})
+    
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        """
+        Busca un elemento.
+        
+        Args:
+            by: Estrategia de búsqueda (By.NAME, AppiumBy.ACCESSIBILITY_ID, etc.)
+            value: Valor del localizador
+        
+        Returns:
+            AsyncWebElement: Elemento encontrado
+        """
+        result = await self.execute("POST", "/element", {"using": by, "value": value})
+        return self._to_element(result)
+    
+    async def find_elements(self, by: str, value: str) -> List[AsyncWebElement]:
+        """
+        Busca todos los elementos que coinciden con el localizador.
+        
+        Args:
+            by: Estrategia de búsqueda
+            value: Valor del localizador
+        
+        Returns:
+            List[AsyncWebElement]: Elementos encontrados
+        """
+        result = await self.execute("POST", "/elements", {"using": by, "value": value})
+        return [self._to_element(item) for item in result]
+    
+    async def page_source(self) -> str:
+        """Obtiene el XML de la interfaz."""
+        return await self.execute("GET", "/source")
+    
+    async def title(self) -> str:
+        """Obtiene el título de la ventana actual."""
+        return await self.execute("GET", "/title")
+    
+    async def window_handles(self) -> List[str]:
+        """Obtiene los identificadores de las ventanas de la sesión."""
+        return await self.execute("GET", "/window/handles")
+    
+    async def get_screenshot_as_png(self) -> bytes:
+        """Obtiene la captura de pantalla en PNG."""
+        return base64.b64decode(await self.execute("GET", "/screenshot"))
+    
+    async def save_screenshot(self, filepath: str) -> bool:
+        """
+        Guarda una captura de pantalla en disco.
+        
+        Args:
+            filepath: Ruta del archivo PNG
+        
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        png = await self.get_screenshot_as_png()
+        # Escritura fuera del event loop (asyncio.to_thread no existe en Python 3.8)
+        await asyncio.get_running_loop().run_in_executor(None, Path(filepath).write_bytes, png)
+        return True
+    
+    async def is_healthy(self) -> bool:
+        """
+        Verifica que la sesión sigue respondiendo.
+        
+        Returns:
+            bool: True si la sesión está activa
+        """
+        if not self.session_id:
+            return False
+        try:
+            await self.window_handles()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Sesión asíncrona no saludable: {str(e)}")
+            return False
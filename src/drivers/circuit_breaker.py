@@ -0,0 +1,291 @@
+"""
+Circuit breaker para la creación de sesiones de WinAppDriver.
+
+Si WinAppDriver no responde, cada prueba esperaría el timeout de conexión
+antes de fallar. Tras CIRCUIT_BREAKER_THRESHOLD fallos de conexión seguidos
+el circuito se abre y start_driver() (y con él todos los fixtures del driver
+y los pasos de Gauge que abren la aplicación) falla al instante con
+CircuitOpenError. Pasados CIRCUIT_BREAKER_COOLDOWN segundos el circuito
+queda semiabierto: la siguiente sesión se intenta como sondeo y, según su
+resultado, el circuito se cierra o vuelve a abrirse.
+
+Hay un circuito por endpoint (WINAPPDRIVER_URL o cada nodo del grid), de
+modo que un nodo caído no bloquea las sesiones en los demás.
+
+Cada cambio de estado se registra en el log y en la traza; el plugin de
+src.utils.circuit_breaker_plugin los lleva al reporte de pytest y los pasos
+de Gauge escriben circuit_breaker.json con write_report().
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from urllib3.exceptions import HTTPError
+from src.utils.config import config
+from src.utils.tracing import tracer
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    El circuito está abierto: no se intenta crear la sesión.
+    """
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    Indica si un error al crear la sesión se debe a que WinAppDriver no responde.
+    
+    Los errores que devuelve el propio servidor (p. ej. la aplicación no
+    arranca) no cuentan: el servidor está accesible.
+    
+    Args:
+        error: Excepción lanzada al crear la sesión
+    
+    Returns:
+        bool: True para errores de conexión, de socket o timeouts
+    """
+    return isinstance(error, (OSError, HTTPError, TimeoutException))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de tres estados (cerrado, abierto y semiabierto).
+    """
+    
+    def __init__(self, threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 enabled: Optional[bool] = None, endpoint: str = ""):
+        """
+        Inicializa el circuito cerrado.
+        
+        Args:
+            threshold: Fallos de conexión seguidos que abren el circuito (por
+                defecto, CIRCUIT_BREAKER_THRESHOLD)
+            cooldown: Segundos hasta el siguiente sondeo (por defecto,
+                CIRCUIT_BREAKER_COOLDOWN)
+            enabled: Si el circuito está activo (por defecto,
+                CIRCUIT_BREAKER_ENABLED)
+            endpoint: URL de WinAppDriver que protege
+        """
+        self.endpoint = endpoint
+        self.threshold = max(config.get_circuit_breaker_threshold() if threshold is None else threshold, 1)
+        self.cooldown = config.get_circuit_breaker_cooldown() if cooldown is None else cooldown
+        self.enabled = config.is_circuit_breaker_enabled() if enabled is None else enabled
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.transitions: List[Dict[str, Any]] = []
+        self.logger = logging.getLogger(__name__)
+        self._probing = False
+        self._reported = 0
+        self._lock = threading.Lock()
+    
+    def before_call(self) -> None:
+        """
+        Comprueba si se puede intentar crear una sesión.
+        
+        Con el circuito abierto y el cooldown cumplido pasa a semiabierto y
+        deja pasar un único intento de sondeo.
+        
+        Raises:
+            CircuitOpenError: Si el circuito está abierto o ya hay un sondeo en curso
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self._transition(HALF_OPEN, "cooldown cumplido, se sondea WinAppDriver")
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            retry = f"nuevo intento en {remaining:.0f}s" if remaining > 0 else "sondeo en curso"
+            raise CircuitOpenError(
+                f"WinAppDriver {self.endpoint} no está accesible: circuito abierto tras {self.failures} fallos de "
+                f"conexión seguidos ({retry}). Último error: {self.last_error}"
+            )
+    
+    def record_success(self) -> None:
+        """Registra una sesión creada (o un error del servidor): cierra el circuito."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._probing = False
+            self.failures = 0
+            if self.state != CLOSED:
+                self._transition(CLOSED, "WinAppDriver vuelve a responder")
+    
+    def record_failure(self, error: BaseException) -> None:
+        """
+        Registra un error al crear la sesión.
+        
+        Solo los errores de conexión (ver is_connection_error) cuentan para
+        abrir el circuito; un error devuelto por el servidor equivale a un
+        éxito (WinAppDriver responde) y el resto no cambia el estado.
+        
+        Args:
+            error: Excepción lanzada al crear la sesión
+        """
+        if not self.enabled:
+            return
+        if not is_connection_error(error):
+            if isinstance(error, WebDriverException):
+                self.record_success()
+            else:
+                self.release()
+            return
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {str(error)[:200]}"
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                self._transition(OPEN, self.last_error)
+    
+    def release(self) -> None:
+        """Libera el sondeo en curso sin cambiar el estado (p. ej. si el intento no llegó al servidor)."""
+        with self._lock:
+            self._probing = False
+    
+    def _transition(self, state: str, reason: str) -> None:
+        """Cambia de estado y lo registra (con el lock tomado)."""
+        transition = {
+            "ts": round(time.time(), 6),
+            "endpoint": self.endpoint,
+            "from": self.state,
+            "to": state,
+            "failures": self.failures,
+            "reason": reason,
+            "test": tracer.test_id,
+            "worker": config.get_worker_id() or "master",
+        }
+        self.state = state
+        self.transitions.append(transition)
+        log = self.logger.warning if state == OPEN else self.logger.info
+        log(f"Circuit breaker de WinAppDriver {self.endpoint}: {transition['from']} -> {state} ({reason})")
+        tracer.emit("breaker", state, 0.0, start=transition["ts"], previous=transition["from"],
+                    failures=self.failures, endpoint=self.endpoint)
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Obtiene los cambios de estado no entregados todavía al reporte.
+        
+        Returns:
+            List[Dict]: Cambios de estado nuevos
+        """
+        with self._lock:
+            new = self.transitions[self._reported:]
+            self._reported = len(self.transitions)
+            return new
+    
+    def reset(self) -> None:
+        """Cierra el circuito y olvida su historial."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.last_error = None
+            self.rejected = 0
+            self.transitions = []
+            self._probing = False
+            self._reported = 0
+
+
+class BreakerRegistry:
+    """
+    Circuitos por endpoint de WinAppDriver, creados la primera vez que se usan.
+    """
+    
+    def __init__(self, threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        """
+        Inicializa el registro vacío.
+        
+        Args:
+            threshold: Umbral de los circuitos (por defecto, CIRCUIT_BREAKER_THRESHOLD)
+            cooldown: Cooldown de los circuitos (por defecto, CIRCUIT_BREAKER_COOLDOWN)
+            enabled: Si los circuitos están activos (por defecto, CIRCUIT_BREAKER_ENABLED)
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, url: str) -> CircuitBreaker:
+        """
+        Obtiene el circuito de un endpoint.
+        
+        Args:
+            url: URL de WinAppDriver
+        
+        Returns:
+            CircuitBreaker: Circuito del endpoint
+        """
+        endpoint = url.rstrip("/")
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(self.threshold, self.cooldown, self.enabled, endpoint)
+                self._breakers[endpoint] = breaker
+            return breaker
+    
+    def breakers(self) -> List[CircuitBreaker]:
+        """Obtiene los circuitos creados."""
+        with self._lock:
+            return list(self._breakers.values())
+    
+    @property
+    def transitions(self) -> List[Dict[str, Any]]:
+        """Cambios de estado de todos los circuitos, en orden."""
+        return sorted((transition for breaker in self.breakers() for transition in breaker.transitions),
+                      key=lambda transition: transition["ts"])
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Obtiene los cambios de estado no entregados todavía al reporte.
+        
+        Returns:
+            List[Dict]: Cambios de estado nuevos de todos los circuitos, en orden
+        """
+        return sorted((transition for breaker in self.breakers() for transition in breaker.drain()),
+                      key=lambda transition: transition["ts"])
+    
+    def reset(self) -> None:
+        """Olvida todos los circuitos (todos los endpoints vuelven a estar cerrados)."""
+        with self._lock:
+            self._breakers = {}
+
+
+def write_report(transitions: List[Dict[str, Any]], path: Optional[str] = None) -> str:
+    """
+    Escribe los cambios de estado del circuito como JSON.
+    
+    Args:
+        transitions: Cambios de estado, en orden
+        path: Archivo de salida (por defecto, circuit_breaker.json en METRICS_DIR)
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    path = path or os.path.join(config.get_metrics_dir(), "circuit_breaker.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump({"transitions": transitions}, report_file, indent=2, ensure_ascii=False)
+    return path
+
+
+# Circuitos por endpoint compartidos por todas las sesiones del proceso
+session_breakers = BreakerRegistry()
@@ -0,0 +1,752 @@
+"""
+Servidor WinAppDriver simulado para ejecuciones sin Windows.
+
+Este módulo implementa un subconjunto del protocolo W3C WebDriver sobre un
+árbol de interfaz en memoria cargado desde un fixture YAML/JSON. Permite que
+WinAppDriver.start_driver() y los Page Objects funcionen sin cambios en Linux
+y en CI, con latencia configurable por comando para obtener una línea base
+de rendimiento repetible.
+
+Uso desde línea de comandos:
+    python -m src.drivers.fake_winappdriver --port 4723 --latency 0.05
+"""
+
+import argparse
+import base64
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+DEFAULT_FIXTURE = Path(__file__).parent.parent / "data" / "fake_ui_tree.yaml"
+
+# Estrategias de localización soportadas y atributo del nodo que consultan
+LOCATOR_ATTRIBUTES = {
+    "name": "name",
+    "accessibility id": "automation_id",
+    "class name": "class_name",
+    "tag name": "control_type",
+    "id": "runtime_id",
+}
+
+
+class FakeWebDriverError(Exception):
+    """
+    Error W3C devuelto por el servidor simulado.
+    """
+    
+    def __init__(self, error: str, message: str, status: int = 404):
+        """
+        Inicializa el error.
+        
+        Args:
+            error: Código de error W3C (p. ej. 'no such element')
+            message: Mensaje descriptivo
+            status: Código de estado HTTP
+        """
+        super().__init__(message)
+        self.error = error
+        self.message = message
+        self.status = status
+
+
+def load_ui_tree(path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    Carga la definición del árbol de interfaz desde un fichero YAML o JSON.
+    
+    Args:
+        path: Ruta del fixture (por defecto, el árbol de ejemplo del proyecto)
+    
+    Returns:
+        Dict: Definición del fixture con las claves 'window' y opcionalmente 'latency'
+    """
+    path = Path(path or DEFAULT_FIXTURE)
+    with open(path, encoding="utf-8") as fixture_file:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            import yaml
+            return yaml.safe_load(fixture_file)
+        return json.load(fixture_file)
+
+
+class UINode:
+    """
+    Nodo del árbol de interfaz simulado.
+    """
+    
+    def __init__(self, spec: Dict[str, Any], runtime_id: str):
+        """
+        Inicializa el nodo a partir de su definición.
+        
+        Args:
+            spec: Definición del nodo en el fixture
+            runtime_id: Identificador único del nodo dentro de la sesión
+        """
+        self.control_type = spec.get("control_type", "Custom")
+        self.name = spec.get("name", "")
+        self.automation_id = spec.get("automation_id", "")
+        self.class_name = spec.get("class_name", self.control_type)
+        self.text = spec.get("text")
+        self.enabled = spec.get("enabled", True)
+        self.visible = spec.get("visible", True)
+        self.selected = spec.get("selected", False)
+        self.rect = spec.get("rect", {"x": 0, "y": 0, "width": 100, "height": 20})
+        self.on_click = spec.get("on_click", [])
+        self.runtime_id = runtime_id
+        self.children: List["UINode"] = []
+        self.parent: Optional["UINode"] = None
+    
+    def get_text(self) -> str:
+        """Obtiene el texto visible del nodo (valor o, si no tiene, su nombre)."""
+        return self.text if self.text is not None else self.name
+    
+    def attributes(self) -> Dict[str, str]:
+        """Obtiene los atributos UIA que se exponen en el page source."""
+        attributes = {
+            "Name": self.name,
+            "AutomationId": self.automation_id,
+            "ClassName": self.class_name,
+            "IsEnabled": str(self.enabled),
+            "IsOffscreen": "False",
+            "RuntimeId": self.runtime_id,
+            "x": str(self.rect.get("x", 0)),
+            "y": str(self.rect.get("y", 0)),
+            "width": str(self.rect.get("width", 0)),
+            "height": str(self.rect.get("height", 0)),
+        }
+        if self.text is not None:
+            attributes["Value.Value"] = self.text
+        return attributes
+    
+    def iter_visible(self):
+        """Recorre en profundidad los nodos visibles a partir de este."""
+        if not self.visible:
+            return
+        yield self
+        for child in self.children:
+            yield from child.iter_visible()
+    
+    def is_attached(self) -> bool:
+        """Verifica si el nodo y todos sus ancestros son visibles."""
+        node = self
+        while node is not None:
+            if not node.visible:
+                return False
+            node = node.parent
+        return True
+
+
+class FakeApplication:
+    """
+    Estado en memoria de la aplicación WPF simulada para una sesión.
+    """
+    
+    def __init__(self, window_spec: Dict[str, Any]):
+        """
+        Inicializa la aplicación a partir de la definición de su ventana.
+        
+        Args:
+            window_spec: Definición de la ventana principal en el fixture
+        """
+        self.window_spec = window_spec
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.launch()
+    
+    def launch(self) -> None:
+        """(Re)lanza la aplicación con el árbol inicial del fixture."""
+        with self.lock:
+            self.generation += 1
+            self._counter = 0
+            self.nodes: Dict[str, UINode] = {}
+            self.pending: List[Tuple[float, Dict[str, Any]]] = []
+            self.root = self._build(copy.deepcopy(self.window_spec), None)
+            self.window_handle = uuid.uuid4().hex[:8]
+            self.running = True
+    
+    def close(self) -> None:
+        """Cierra la aplicación; las referencias a elementos quedan obsoletas."""
+        with self.lock:
+            self.running = False
+            self.nodes = {}
+            self.pending = []
+    
+    def _build(self, spec: Dict[str, Any], parent: Optional[UINode]) -> UINode:
+        """Construye recursivamente los nodos del árbol."""
+        self._counter += 1
+        node = UINode(spec, f"42.{self.generation}.{self._counter}")
+        node.parent = parent
+        self.nodes[node.runtime_id] = node
+        for child_spec in spec.get("children", []):
+            node.children.append(self._build(child_spec, node))
+        return node
+    
+    def apply_pending(self) -> None:
+        """Aplica los efectos diferidos cuyo momento ya ha llegado."""
+        now = time.monotonic()
+        with self.lock:
+            due = [effect for at, effect in self.pending if at <= now]
+            self.pending = [(at, effect) for at, effect in self.pending if at > now]
+            for effect in due:
+                self._apply_effect(effect)
+    
+    def find_by_name(self, name: str) -> Optional[UINode]:
+        """Busca un nodo (visible o no) por Name o AutomationId."""
+        for node in self.nodes.values():
+            if name in (node.name, node.automation_id):
+                return node
+        return None
+    
+    def find(self, using: str, value: str, scope: Optional[UINode] = None) -> List[UINode]:
+        """
+        Busca nodos visibles según una estrategia de localización.
+        
+        Args:
+            using: Estrategia W3C o de WinAppDriver
+            value: Valor del localizador
+            scope: Nodo a partir del cual buscar (por defecto, la ventana)
+        
+        Returns:
+            List[UINode]: Nodos encontrados en orden de documento
+        """
+        self.apply_pending()
+        with self.lock:
+            if not self.running:
+                raise FakeWebDriverError("no such window", "La aplicación está cerrada")
+            scope = scope or self.root
+            if using == "xpath":
+                return self._find_by_xpath(value, scope)
+            attribute = LOCATOR_ATTRIBUTES.get(using)
+            if attribute is None:
+                raise FakeWebDriverError(
+                    "invalid argument", f"Estrategia no soportada: {using}", status=400
+                )
+            return [node for node in scope.iter_visible() if getattr(node, attribute) == value]
+    
+    def _find_by_xpath(self, xpath: str, scope: UINode) -> List[UINode]:
+        """Resuelve un XPath sencillo usando ElementTree sobre el page source."""
+        tree = self.to_element_tree(scope)
+        wrapper = ET.Element("Root")
+        wrapper.append(tree)
+        expression = "." + xpath if xpath.startswith("/") else xpath
+        try:
+            matches = wrapper.findall(expression)
+        except SyntaxError as e:
+            raise FakeWebDriverError("invalid selector", str(e), status=400)
+        return [self.nodes[match.get("RuntimeId")] for match in matches]
+    
+    def to_element_tree(self, node: Optional[UINode] = None) -> ET.Element:
+        """Convierte los nodos visibles en un árbol XML con formato de WinAppDriver."""
+        node = node or self.root
+        element = ET.Element(node.control_type, node.attributes())
+        for child in node.children:
+            if child.visible:
+                element.append(self.to_element_tree(child))
+        return element
+    
+    def page_source(self) -> str:
+        """Obtiene el XML del árbol visible."""
+        self.apply_pending()
+        with self.lock:
+            if not self.running:
+                raise FakeWebDriverError("no such window", "La aplicación está cerrada")
+            body = ET.tostring(self.to_element_tree(), encoding="unicode")
+        return '<?xml version="1.0" encoding="utf-16"?>' + body
+    
+    def get_node(self, element_id: str) -> UINode:
+        """
+        Obtiene un nodo por su id comprobando que siga en el árbol.
+        
+        Args:
+            element_id: Identificador del elemento devuelto al cliente
+        
+        Returns:
+            UINode: Nodo correspondiente
+        """
+        self.apply_pending()
+        with self.lock:
+            node = self.nodes.get(element_id)
+            if node is None or not node.is_attached():
+                raise FakeWebDriverError(
+                    "stale element reference",
+                    f"El elemento {element_id} ya no está en el árbol",
+                )
+            return node
+    
+    def click(self, node: UINode) -> None:
+        """
+        Ejecuta la primera regla on_click cuya condición se cumpla.
+        
+        Cada regla puede definir 'when' (valores esperados de otros campos),
+        'delay' (segundos hasta aplicar el efecto) y los efectos 'show',
+        'hide' y 'set_text'.
+        """
+        with self.lock:
+            if not node.enabled:
+                raise FakeWebDriverError(
+                    "element not interactable", f"Elemento deshabilitado: {node.name}", 400
+                )
+            for rule in node.on_click:
+                if self._matches(rule.get("when", {})):
+                    delay = float(rule.get("delay", 0))
+                    if delay > 0:
+                        self.pending.append((time.monotonic() + delay, rule))
+                    else:
+                        self._apply_effect(rule)
+                    break
+    
+    def _matches(self, conditions: Dict[str, Any]) -> bool:
+        """Evalúa las condiciones 'when' de una regla."""
+        for name, expected in conditions.items():
+            node = self.find_by_name(name)
+            if node is None or (node.text or "") != str(expected):
+                return False
+        return True
+    
+    def _apply_effect(self, effect: Dict[str, Any]) -> None:
+        """Aplica los efectos de una regla sobre el árbol."""
+        for name in effect.get("show", []):
+            node = self.find_by_name(name)
+            if node is not None:
+                node.visible = True
+        for name in effect.get("hide", []):
+            node = self.find_by_name(name)
+            if node is not None:
+                node.visible = False
+        for name, text in effect.get("set_text", {}).items():
+            node = self.find_by_name(name)
+            if node is not None:
+                node.text = text
+    
+    def state_digest(self) -> bytes:
+        """Obtiene un resumen del estado visible (sirve como 'contenido' de la pantalla)."""
+        with self.lock:
+            state = [(n.runtime_id, n.get_text()) for n in self.root.iter_visible()]
+        return hashlib.sha256(repr(state).encode("utf-8")).digest()
+
+
+def render_png(digest: bytes, size: int = 16) -> bytes:
+    """
+    Genera un PNG sólido cuyo color depende del estado de la pantalla.
+    
+    Args:
+        digest: Resumen del estado visible
+        size: Ancho y alto de la imagen en píxeles
+    
+    Returns:
+        bytes: Imagen PNG
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        payload = kind + data
+        return struct.pack(">I", len(data)) + payload + struct.pack(">I", zlib.crc32(payload))
+    
+    row = b"\x00" + digest[:3] * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(row * size))
+        + chunk(b"IEND", b"")
+    )
+
+
+class FakeSession:
+    """
+    Sesión W3C abierta en el servidor simulado.
+    """
+    
+    def __init__(self, session_id: str, capabilities: Dict[str, Any], window_spec: Dict[str, Any]):
+        """
+        Inicializa la sesión y lanza la aplicación.
+        
+        Args:
+            session_id: Identificador de la sesión
+            capabilities: Capabilities solicitadas por el cliente
+            window_spec: Definición de la ventana principal
+        """
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.app = FakeApplication(window_spec)
+        self.implicit_wait = 0.0
+    
+    def find(self, using: str, value: str, scope: Optional[UINode] = None) -> List[UINode]:
+        """Busca nodos respetando el wait implícito configurado por el cliente."""
+        deadline = time.monotonic() + self.implicit_wait
+        while True:
+            nodes = self.app.find(using, value, scope)
+            if nodes or time.monotonic() >= deadline:
+                return nodes
+            time.sleep(0.05)
+
+
+class FakeWinAppDriver:
+    """
+    Servidor HTTP que emula WinAppDriver con un árbol de interfaz en memoria.
+    """
+    
+    def __init__(self, fixture: Union[str, Path, Dict[str, Any], None] = None,
+                 host: str = "127.0.0.1", port: int = 0,
+                 latency: Union[float, Dict[str, float], None] = None,
+                 jitter: Optional[float] = None, seed: int = 0):
+        """
+        Inicializa el servidor simulado.
+        
+        Args:
+            fixture: Ruta del fixture YAML/JSON o diccionario ya cargado
+            host: Interfaz en la que escuchar
+            port: Puerto (0 para elegir uno libre)
+            latency: Segundos de latencia por comando, o diccionario por nombre
+                de comando con la clave 'default' como valor general
+            jitter: Variación aleatoria máxima (segundos) añadida a la latencia
+            seed: Semilla del generador de jitter para ejecuciones repetibles
+        """
+        definition = fixture if isinstance(fixture, dict) else load_ui_tree(fixture)
+        self.window_spec = definition["window"]
+        latency = latency if latency is not None else definition.get("latency", 0.0)
+        self.latency = latency if isinstance(latency, dict) else {"default": float(latency)}
+        self.jitter = float(jitter if jitter is not None else definition.get("jitter", 0.0))
+        self.host = host
+        self.port = port
+        self.sessions: Dict[str, FakeSession] = {}
+        self.command_counts: Dict[str, int] = {}
+        self.compressed_responses = 0
+        self.logger = logging.getLogger(__name__)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """URL base del servidor para usar como WINAPPDRIVER_URL."""
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self) -> "FakeWinAppDriver":
+        """
+        Arranca el servidor en un hilo en segundo plano.
+        
+        Returns:
+            FakeWinAppDriver: La propia instancia, para encadenar llamadas
+        """
+        handler = type("BoundHandler", (_RequestHandler,), {"fake": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"WinAppDriver simulado escuchando en {self.url}")
+        return self
+    
+    def stop(self) -> None:
+        """Detiene el servidor y descarta las sesiones abiertas."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.sessions.clear()
+    
+    def __enter__(self) -> "FakeWinAppDriver":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def reset_counts(self) -> None:
+        """Reinicia los contadores de comandos recibidos."""
+        with self._lock:
+            self.command_counts.clear()
+            self.compressed_responses = 0
+    
+    def _simulate_latency(self, command: str) -> None:
+        """Espera la latencia configurada para el comando."""
+        delay = self.latency.get(command, self.latency.get("default", 0.0))
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def dispatch(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        Resuelve una petición HTTP contra las rutas W3C soportadas.
+        
+        Args:
+            method: Método HTTP
+            path: Ruta de la petición
+            body: Cuerpo JSON decodificado
+        
+        Returns:
+            Tuple[int, Any]: Código de estado y valor a devolver en 'value'
+        """
+        for route_method, pattern, command, handler in ROUTES:
+            match = pattern.fullmatch(path.rstrip("/") or "/")
+            if route_method == method and match:
+                with self._lock:
+                    self.command_counts[command] = self.command_counts.get(command, 0) + 1
+                self._simulate_latency(command)
+                params = match.groupdict()
+                session = None
+                if "session_id" in params:
+                    session = self.sessions.get(params["session_id"])
+                    if session is None:
+                        raise FakeWebDriverError(
+                            "invalid session id", f"Sesión desconocida: {params['session_id']}"
+                        )
+                return 200, handler(self, session, params, body)
+        raise FakeWebDriverError("unknown command", f"{method} {path} no soportado")
+    
+    # Manejadores de comandos
+    
+    def _status(self, session, params, body):
+        return {"ready": True, "message": "WinAppDriver simulado",
+                "build": {"version": "1.2.1-fake"}}
+    
+    def _new_session(self, session, params, body):
+        capabilities = body.get("capabilities", {}).get("alwaysMatch", {})
+        session_id = str(uuid.uuid4()).upper()
+        self.sessions[session_id] = FakeSession(session_id, capabilities, self.window_spec)
+        return {"sessionId": session_id, "capabilities": capabilities}
+    
+    def _delete_session(self, session, params, body):
+        self.sessions.pop(session.session_id, None)
+        return None
+    
+    def _set_timeouts(self, session, params, body):
+        if body.get("implicit") is not None:
+            session.implicit_wait = float(body["implicit"]) / 1000
+        return None
+    
+    def _get_timeouts(self, session, params, body):
+        return {"implicit": int(session.implicit_wait * 1000), "pageLoad": 300000, "script": 30000}
+    
+    def _find_element(self, session, params, body):
+        nodes = self._find(session, params, body)
+        if not nodes:
+            raise FakeWebDriverError(
+                "no such element", f"Elemento no encontrado: {body.get('using')}={body.get('value')}"
+            )
+        return _element_reference(nodes[0])
+    
+    def _find_elements(self, session, params, body):
+        return [_element_reference(node) for node in self._find(session, params, body)]
+    
+    def _find(self, session, params, body):
+        scope = session.app.get_node(params["element_id"]) if params.get("element_id") else None
+        return session.find(body.get("using", ""), body.get("value", ""), scope)
+    
+    def _click(self, session, params, body):
+        session.app.click(session.app.get_node(params["element_id"]))
+        return None
+    
+    def _clear(self, session, params, body):
+        node = session.app.get_node(params["element_id"])
+        node.text = ""
+        return None
+    
+    def _send_keys(self, session, params, body):
+        node = session.app.get_node(params["element_id"])
+        text = body.get("text")
+        if text is None:
+            text = "".join(body.get("value", []))
+        node.text = (node.text or "") + text
+        return None
+    
+    def _get_text(self, session, params, body):
+        return session.app.get_node(params["element_id"]).get_text()
+    
+    def _get_attribute(self, session, params, body):
+        node = session.app.get_node(params["element_id"])
+        return node.attributes().get(params["name"])
+    
+    def _is_displayed(self, session, params, body):
+        return session.app.get_node(params["element_id"]).visible
+    
+    def _is_enabled(self, session, params, body):
+        return session.app.get_node(params["element_id"]).enabled
+    
+    def _is_selected(self, session, params, body):
+        return session.app.get_node(params["element_id"]).selected
+    
+    def _get_rect(self, session, params, body):
+        return session.app.get_node(params["element_id"]).rect
+    
+    def _get_tag_name(self, session, params, body):
+        return session.app.get_node(params["element_id"]).control_type
+    
+    def _screenshot(self, session, params, body):
+        if params.get("element_id"):
+            session.app.get_node(params["element_id"])
+        session.app.apply_pending()
+        return base64.b64encode(render_png(session.app.state_digest())).decode("ascii")
+    
+    def _page_source(self, session, params, body):
+        return session.app.page_source()
+    
+    def _title(self, session, params, body):
+        return session.app.root.name
+    
+    def _window_handle(self, session, params, body):
+        if not session.app.running:
+            raise FakeWebDriverError("no such window", "La aplicación está cerrada")
+        return session.app.window_handle
+    
+    def _window_handles(self, session, params, body):
+        return [session.app.window_handle] if session.app.running else []
+    
+    def _switch_window(self, session, params, body):
+        if body.get("handle") != session.app.window_handle:
+            raise FakeWebDriverError("no such window", f"Ventana desconocida: {body.get('handle')}")
+        return None
+    
+    def _close_window(self, session, params, body):
+        session.app.close()
+        return []
+    
+    def _execute_script(self, session, params, body):
+        return None
+    
+    def _close_app(self, session, params, body):
+        session.app.close()
+        return None
+    
+    def _launch_app(self, session, params, body):
+        session.app.launch()
+        return None
+
+
+def _element_reference(node: UINode) -> Dict[str, str]:
+    """Construye la referencia W3C (y la heredada de JSONWP) de un elemento."""
+    return {ELEMENT_KEY: node.runtime_id, "ELEMENT": node.runtime_id}
+
+
+def _route(method: str, path: str, command: str, handler) -> tuple:
+    """Compila una ruta con parámetros {session_id}, {element_id} y {name}."""
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path)
+    return method, re.compile(pattern), command, handler
+
+
+_S = "/session/{session_id}"
+_E = _S + "/element/{element_id}"
+
+ROUTES = [
+    _route("GET", "/status", "status", FakeWinAppDriver._status),
+    _route("POST", "/session", "newSession", FakeWinAppDriver._new_session),
+    _route("DELETE", _S, "deleteSession", FakeWinAppDriver._delete_session),
+    _route("GET", _S + "/timeouts", "getTimeouts", FakeWinAppDriver._get_timeouts),
+    _route("POST", _S + "/timeouts", "setTimeouts", FakeWinAppDriver._set_timeouts),
+    _route("POST", _S + "/element", "findElement", FakeWinAppDriver._find_element),
+    _route("POST", _S + "/elements", "findElements", FakeWinAppDriver._find_elements),
+    _route("POST", _E + "/element", "findChildElement", FakeWinAppDriver._find_element),
+    _route("POST", _E + "/elements", "findChildElements", FakeWinAppDriver._find_elements),
+    _route("POST", _E + "/click", "click", FakeWinAppDriver._click),
+    _route("POST", _E + "/clear", "clear", FakeWinAppDriver._clear),
+    _route("POST", _E + "/value", "sendKeys", FakeWinAppDriver._send_keys),
+    _route("GET", _E + "/text", "getText", FakeWinAppDriver._get_text),
+    _route("GET", _E + "/attribute/{name}", "getAttribute", FakeWinAppDriver._get_attribute),
+    _route("GET", _E + "/displayed", "isDisplayed", FakeWinAppDriver._is_displayed),
+    _route("GET", _E + "/enabled", "isEnabled", FakeWinAppDriver._is_enabled),
+    _route("GET", _E + "/selected", "isSelected", FakeWinAppDriver._is_selected),
+    _route("GET", _E + "/rect", "getRect", FakeWinAppDriver._get_rect),
+    _route("GET", _E + "/name", "getTagName", FakeWinAppDriver._get_tag_name),
+    _route("GET", _E + "/screenshot", "elementScreenshot", FakeWinAppDriver._screenshot),
+    _route("GET", _S + "/screenshot", "screenshot", FakeWinAppDriver._screenshot),
+    _route("GET", _S + "/source", "pageSource", FakeWinAppDriver._page_source),
+    _route("GET", _S + "/title", "getTitle", FakeWinAppDriver._title),
+    _route("GET", _S + "/window", "getWindowHandle", FakeWinAppDriver._window_handle),
+    _route("GET", _S + "/window/handles", "getWindowHandles", FakeWinAppDriver._window_handles),
+    _route("POST", _S + "/window", "switchToWindow", FakeWinAppDriver._switch_window),
+    _route("DELETE", _S + "/window", "closeWindow", FakeWinAppDriver._close_window),
+    _route("POST", _S + "/execute/sync", "executeScript", FakeWinAppDriver._execute_script),
+    _route("POST", _S + "/appium/app/close", "closeApp", FakeWinAppDriver._close_app),
+    _route("POST", _S + "/appium/app/launch", "launchApp", FakeWinAppDriver._launch_app),
+]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Manejador HTTP que traduce peticiones W3C a FakeWinAppDriver.dispatch().
+    """
+    
+    protocol_version = "HTTP/1.1"
+    fake: FakeWinAppDriver
+    
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+            status, value = self.fake.dispatch(method, self.path, body)
+            payload = {"value": value}
+            if method == "POST" and self.path.rstrip("/") == "/session":
+                payload["sessionId"] = value["sessionId"]
+        except FakeWebDriverError as e:
+            status = e.status
+            payload = {"value": {"error": e.error, "message": e.message, "stacktrace": ""}}
+        except Exception as e:
+            status = 500
+            payload = {"value": {"error": "unknown error", "message": str(e), "stacktrace": ""}}
+        data = json.dumps(payload).encode("utf-8")
+        compress = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if compress:
+            data = gzip.compress(data)
+            with self.fake._lock:
+                self.fake.compressed_responses += 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self) -> None:
+        self._handle("GET")
+    
+    def do_POST(self) -> None:
+        self._handle("POST")
+    
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+    
+    def log_message(self, format: str, *args) -> None:
+        self.fake.logger.debug(format % args)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Arranca el servidor simulado desde línea de comandos."""
+    parser = argparse.ArgumentParser(description="WinAppDriver simulado")
+    parser.add_argument("--fixture", default=None, help="Fixture YAML/JSON del árbol de interfaz")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency", type=float, default=None, help="Latencia por comando (s)")
+    parser.add_argument("--jitter", type=float, default=None, help="Variación máxima (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    server = FakeWinAppDriver(args.fixture, args.host, args.port, args.latency, args.jitter, args.seed)
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
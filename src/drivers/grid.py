@@ -0,0 +1,288 @@
+"""
+Reparto de sesiones entre varios servidores WinAppDriver.
+
+Con WINAPPDRIVER_URLS (lista de URLs con su capacidad) cada start_driver()
+crea la sesión en el nodo sano menos cargado (sesiones abiertas respecto a su
+capacidad), de modo que una ejecución escala a varias máquinas sin tocar las
+pruebas. Un hilo en segundo plano sondea /status de cada nodo; los nodos que
+fallan GRID_FAILURE_THRESHOLD veces seguidas (en el sondeo o al crear una
+sesión) quedan en cuarentena GRID_QUARANTINE_SECONDS; al terminar vuelven al
+reparto, y un solo fallo más (p. ej. el siguiente sondeo) la renueva.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import urllib3
+from src.utils.config import Config, config
+
+
+class GridNode:
+    """
+    Servidor WinAppDriver del grid.
+    """
+    
+    def __init__(self, url: str, capacity: int = 1):
+        """
+        Inicializa el nodo.
+        
+        Args:
+            url: URL base del servidor
+            capacity: Sesiones simultáneas que admite
+        """
+        self.url = url.rstrip("/")
+        self.capacity = max(capacity, 1)
+        self.active = 0
+        self.failures = 0
+        self.quarantined_until = 0.0
+        self.stats = {"sessions": 0, "failures": 0, "quarantines": 0}
+    
+    @property
+    def load(self) -> float:
+        """Fracción de la capacidad en uso."""
+        return self.active / self.capacity
+    
+    def __repr__(self) -> str:
+        return f"GridNode({self.url!r}, {self.active}/{self.capacity})"
+
+
+class WinAppDriverGrid:
+    """
+    Dispatcher de sesiones entre varios nodos WinAppDriver.
+    """
+    
+    def __init__(self, nodes: Iterable[Tuple[str, int]], probe_interval: Optional[float] = None,
+                 probe_timeout: Optional[float] = None, failure_threshold: Optional[int] = None,
+                 quarantine_seconds: Optional[float] = None):
+        """
+        Inicializa el grid.
+        
+        Args:
+            nodes: Pares (URL, capacidad)
+            probe_interval: Segundos entre sondeos (por defecto, GRID_PROBE_INTERVAL)
+            probe_timeout: Timeout de cada sondeo (por defecto, GRID_PROBE_TIMEOUT)
+            failure_threshold: Fallos seguidos antes de la cuarentena (por
+                defecto, GRID_FAILURE_THRESHOLD)
+            quarantine_seconds: Duración de la cuarentena (por defecto,
+                GRID_QUARANTINE_SECONDS)
+        """
+        self.nodes = [GridNode(url, capacity) for url, capacity in nodes]
+        if not self.nodes:
+            raise ValueError("El grid necesita al menos un nodo")
+        self.probe_interval = config.get_grid_probe_interval() if probe_interval is None else probe_interval
+        self.probe_timeout = config.get_grid_probe_timeout() if probe_timeout is None else probe_timeout
+        self.failure_threshold = (config.get_grid_failure_threshold()
+                                  if failure_threshold is None else failure_threshold)
+        self.quarantine_seconds = (config.get_grid_quarantine_seconds()
+                                   if quarantine_seconds is None else quarantine_seconds)
+        self.logger = logging.getLogger(__name__)
+        # Con pytest-xdist cada worker tiene su propio grid: a igual carga, cada
+        # worker empieza por un nodo distinto para no concentrarse en el primero
+        worker = config.get_worker_id()
+        self._offset = int(worker[2:]) if worker[2:].isdigit() else 0
+        self._condition = threading.Condition()
+        self._http = urllib3.PoolManager(num_pools=len(self.nodes), retries=False)
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+    
+    def acquire(self, timeout: Optional[float] = None, exclude: Iterable[str] = ()) -> GridNode:
+        """
+        Reserva una sesión en el nodo sano menos cargado.
+        
+        Si todos los nodos sanos están llenos, espera a que se libere uno.
+        
+        Args:
+            timeout: Tiempo máximo de espera (por defecto, EXPLICIT_WAIT)
+            exclude: URLs de nodos a descartar (p. ej. los que ya fallaron)
+        
+        Returns:
+            GridNode: Nodo reservado (devolver con release())
+        
+        Raises:
+            RuntimeError: Si no queda ningún nodo sano
+            TimeoutError: Si no se libera capacidad a tiempo
+        """
+        excluded = set(exclude)
+        deadline = time.monotonic() + (timeout or config.get_explicit_wait())
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                candidates = [node for node in self.nodes if node.url not in excluded]
+                healthy = [node for node in candidates if now >= node.quarantined_until]
+                if not healthy:
+                    raise RuntimeError(
+                        f"No hay nodos WinAppDriver sanos ({len(candidates)} en cuarentena o descartados)"
+                    )
+                available = [node for node in healthy if node.active < node.capacity]
+                if available:
+                    node = min(available, key=self._rank)
+                    node.active += 1
+                    node.stats["sessions"] += 1
+                    return node
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Todos los nodos WinAppDriver están llenos ({sum(n.capacity for n in healthy)} sesiones)"
+                    )
+                self._condition.wait(min(remaining, self.probe_interval or remaining))
+    
+    def _rank(self, node: GridNode) -> Tuple[float, int, int]:
+        """Orden de preferencia: menor carga, menos sesiones y nodo inicial del worker."""
+        position = (self.nodes.index(node) - self._offset) % len(self.nodes)
+        return node.load, node.active, position
+    
+    def release(self, node: GridNode, error: Optional[BaseException] = None) -> None:
+        """
+        Libera la sesión reservada en un nodo.
+        
+        Args:
+            node: Nodo obtenido con acquire()
+            error: Error al crear la sesión, si falló (cuenta para la cuarentena)
+        """
+        with self._condition:
+            node.active = max(node.active - 1, 0)
+            if error is not None:
+                self._record_failure(node, error)
+            self._condition.notify_all()
+    
+    def report_success(self, node: GridNode) -> None:
+        """
+        Registra que el nodo respondió correctamente.
+        
+        Una respuesta correcta no levanta una cuarentena en curso (el nodo
+        puede responder a /status y aun así fallar al crear sesiones); solo
+        reinicia la cuenta de fallos una vez terminada.
+        
+        Args:
+            node: Nodo del grid
+        """
+        with self._condition:
+            if node.failures and time.monotonic() >= node.quarantined_until:
+                self.logger.info(f"Nodo WinAppDriver recuperado: {node.url}")
+                node.failures = 0
+                self._condition.notify_all()
+    
+    def _record_failure(self, node: GridNode, error: BaseException) -> None:
+        """Cuenta un fallo y pone el nodo en cuarentena al llegar al umbral (con el lock tomado)."""
+        node.failures += 1
+        node.stats["failures"] += 1
+        if node.failures >= self.failure_threshold and time.monotonic() >= node.quarantined_until:
+            node.quarantined_until = time.monotonic() + self.quarantine_seconds
+            node.stats["quarantines"] += 1
+            self.logger.warning(
+                f"Nodo WinAppDriver en cuarentena {self.quarantine_seconds:.0f}s tras "
+                f"{node.failures} fallos: {node.url} ({str(error)})"
+            )
+    
+    def probe(self, node: GridNode) -> bool:
+        """
+        Comprueba /status de un nodo y actualiza su estado.
+        
+        Args:
+            node: Nodo a sondear
+        
+        Returns:
+            bool: True si el nodo respondió y está listo
+        """
+        try:
+            response = self._http.request(
+                "GET", f"{node.url}/status", timeout=urllib3.Timeout(total=self.probe_timeout)
+            )
+            if response.status != 200:
+                raise ConnectionError(f"HTTP {response.status}")
+            value = json.loads(response.data or b"{}").get("value", {})
+            if isinstance(value, dict) and value.get("ready") is False:
+                raise ConnectionError("el servidor no está listo")
+        except Exception as e:
+            with self._condition:
+                self._record_failure(node, e)
+            return False
+        self.report_success(node)
+        return True
+    
+    def probe_all(self) -> Dict[str, bool]:
+        """
+        Sondea todos los nodos.
+        
+        Returns:
+            Dict[str, bool]: Resultado del sondeo por URL
+        """
+        return {node.url: self.probe(node) for node in self.nodes}
+    
+    def start_probes(self) -> None:
+        """Arranca el sondeo periódico en segundo plano (si no está en marcha)."""
+        if self._prober is not None or self.probe_interval <= 0:
+            return
+        self._stop.clear()
+        self._prober = threading.Thread(target=self._probe_loop, name="grid-prober", daemon=True)
+        self._prober.start()
+    
+    def stop(self) -> None:
+        """Detiene el sondeo periódico."""
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join(timeout=self.probe_timeout + 1)
+            self._prober = None
+    
+    def _probe_loop(self) -> None:
+        """Sondea los nodos cada probe_interval segundos hasta stop()."""
+        while not self._stop.wait(self.probe_interval):
+            self.probe_all()
+    
+    def get_stats(self) -> List[Dict[str, object]]:
+        """
+        Obtiene el estado de cada nodo.
+        
+        Returns:
+            List[Dict]: URL, sesiones activas, capacidad, cuarentena y contadores
+        """
+        now = time.monotonic()
+        with self._condition:
+            return [{"url": node.url, "active": node.active, "capacity": node.capacity,
+                     "quarantined": now < node.quarantined_until, **node.stats}
+                    for node in self.nodes]
+
+
+_grid: Optional[WinAppDriverGrid] = None
+_grid_lock = threading.Lock()
+
+
+def get_grid(app_config: Optional[Config] = None) -> Optional[WinAppDriverGrid]:
+    """
+    Obtiene el grid del proceso, creándolo la primera vez.
+    
+    Args:
+        app_config: Configuración a usar (por defecto, la global)
+    
+    Returns:
+        Optional[WinAppDriverGrid]: Grid con sondeo activo, o None si
+        WINAPPDRIVER_URLS está vacío (se usa solo WINAPPDRIVER_URL)
+    """
+    global _grid
+    app_config = app_config or config
+    with _grid_lock:
+        if _grid is None:
+            nodes = app_config.get_winappdriver_urls()
+            if not nodes:
+                return None
+            _grid = WinAppDriverGrid(nodes)
+            _grid.start_probes()
+        return _grid
+
+
+def reset_grid() -> Optional[List[Dict[str, object]]]:
+    """
+    Detiene y descarta el grid del proceso (al terminar o al cambiar la configuración).
+    
+    Returns:
+        Optional[List[Dict]]: Estado final de los nodos, o None si no había grid
+    """
+    global _grid
+    with _grid_lock:
+        grid, _grid = _grid, None
+    if grid is None:
+        return None
+    grid.stop()
+    return grid.get_stats()
@@ -0,0 +1,245 @@
+"""
+Capa de transporte HTTP para la conexión con WinAppDriver.
+
+Construye el command_executor del driver a partir de Config: tamaño del pool
+de conexiones keep-alive, reintentos de conexión, timeouts de conexión y de
+lectura por clase de comando y compresión gzip opcional de page_source.
+Así las suites largas reutilizan las conexiones TCP y un comando colgado
+falla en un tiempo acotado en lugar de bloquear la prueba.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+import urllib3
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.command import Command
+from src.utils.config import Config
+from src.utils.metrics import command_metrics
+from src.utils.tracing import tracer
+
+
+# Endpoints heredados de WinAppDriver para reiniciar la aplicación sin crear
+# una nueva sesión (no forman parte del protocolo W3C).
+CLOSE_APP_COMMAND = "winAppDriverCloseApp"
+LAUNCH_APP_COMMAND = "winAppDriverLaunchApp"
+
+# Clase de cada comando para elegir su timeout de lectura
+COMMAND_CLASSES = {
+    Command.NEW_SESSION: "session",
+    Command.QUIT: "session",
+    CLOSE_APP_COMMAND: "session",
+    LAUNCH_APP_COMMAND: "session",
+    Command.FIND_ELEMENT: "find",
+    Command.FIND_ELEMENTS: "find",
+    Command.FIND_CHILD_ELEMENT: "find",
+    Command.FIND_CHILD_ELEMENTS: "find",
+    Command.GET_PAGE_SOURCE: "source",
+    Command.SCREENSHOT: "source",
+    Command.ELEMENT_SCREENSHOT: "source",
+}
+
+
+class TransportSettings:
+    """
+    Parámetros de la capa de transporte.
+    """
+    
+    def __init__(self, pool_size: int = 4, keep_alive: bool = True,
+                 connect_timeout: float = 5.0, connect_retries: int = 2,
+                 read_timeouts: Optional[Dict[str, float]] = None,
+                 gzip_page_source: bool = False):
+        """
+        Inicializa los parámetros.
+        
+        Args:
+            pool_size: Conexiones keep-alive máximas por endpoint
+            keep_alive: Si reutilizar las conexiones entre comandos
+            connect_timeout: Timeout de establecimiento de conexión en segundos
+            connect_retries: Reintentos ante fallos de conexión (nunca de lectura,
+                para no repetir comandos que el servidor ya pudo ejecutar)
+            read_timeouts: Timeout de lectura por clase de comando ('session',
+                'find', 'source' y 'default')
+            gzip_page_source: Si pedir page_source y capturas comprimidas con gzip
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.connect_retries = connect_retries
+        self.read_timeouts = {"session": 120.0, "find": 30.0, "source": 60.0, "default": 30.0}
+        self.read_timeouts.update(read_timeouts or {})
+        self.gzip_page_source = gzip_page_source
+    
+    @classmethod
+    def from_config(cls, config: Optional[Config] = None) -> "TransportSettings":
+        """
+        Crea los parámetros a partir de la configuración.
+        
+        Args:
+            config: Instancia de Config (por defecto, una nueva)
+        
+        Returns:
+            TransportSettings: Parámetros configurados
+        """
+        config = config or Config()
+        return cls(
+            pool_size=config.get_transport_pool_size(),
+            keep_alive=config.is_transport_keep_alive_enabled(),
+            connect_timeout=config.get_transport_connect_timeout(),
+            connect_retries=config.get_transport_connect_retries(),
+            read_timeouts={
+                "session": config.get_transport_session_timeout(),
+                "find": config.get_transport_find_timeout(),
+                "source": config.get_transport_source_timeout(),
+                "default": config.get_transport_read_timeout(),
+            },
+            gzip_page_source=config.is_transport_gzip_enabled(),
+        )
+
+
+class _TransportClientConfig(AppiumClientConfig):
+    """
+    AppiumClientConfig cuyo timeout puede fijarse por hilo para el comando en curso.
+    
+    RemoteConnection lee client_config.timeout en cada petición, así que basta
+    con sustituirlo mientras se ejecuta el comando.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._local = threading.local()
+        super().__init__(*args, **kwargs)
+    
+    @property
+    def timeout(self):
+        return getattr(self._local, "timeout", None) or self.__dict__.get("_timeout")
+    
+    @timeout.setter
+    def timeout(self, value) -> None:
+        self.__dict__["_timeout"] = value
+
+
+class WinAppDriverConnection(AppiumConnection):
+    """
+    Conexión con WinAppDriver configurada a partir de TransportSettings.
+    """
+    
+    def __init__(self, remote_server_addr: str, settings: Optional[TransportSettings] = None):
+        """
+        Inicializa la conexión.
+        
+        Args:
+            remote_server_addr: URL de WinAppDriver
+            settings: Parámetros de transporte (por defecto, los de Config)
+        """
+        self.settings = settings or TransportSettings.from_config()
+        self.implicit_wait = 0.0
+        self.stats = {"commands": 0, "timeouts": 0}
+        self.logger = logging.getLogger(__name__)
+        retries = urllib3.Retry(
+            total=self.settings.connect_retries, connect=self.settings.connect_retries,
+            read=0, status=0, redirect=3, backoff_factor=0.2, raise_on_status=False,
+        )
+        client_config = _TransportClientConfig(
+            remote_server_addr=remote_server_addr,
+            keep_alive=self.settings.keep_alive,
+            timeout=self.timeout_for(None),
+            init_args_for_pool_manager={"init_args_for_pool_manager": {
+                "maxsize": self.settings.pool_size,
+                "retries": retries,
+            }},
+        )
+        super().__init__(client_config=client_config)
+        self._local = threading.local()
+    
+    def timeout_for(self, command: Optional[str]) -> urllib3.Timeout:
+        """
+        Calcula el timeout de un comando.
+        
+        Las búsquedas esperan en el servidor hasta el wait implícito vigente,
+        por lo que su timeout de lectura se suma a él.
+        
+        Args:
+            command: Nombre del comando de Selenium/Appium
+        
+        Returns:
+            urllib3.Timeout: Timeouts de conexión y lectura
+        """
+        command_class = COMMAND_CLASSES.get(command, "default")
+        read_timeout = self.settings.read_timeouts[command_class]
+        if command_class == "find":
+            read_timeout += self.implicit_wait
+        return urllib3.Timeout(connect=self.settings.connect_timeout, read=read_timeout)
+    
+    def execute(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ejecuta un comando con el timeout de su clase.
+        
+        Args:
+            command: Nombre del comando
+            params: Parámetros del comando
+        
+        Returns:
+            Dict: Respuesta decodificada del servidor
+        """
+        if command == Command.SET_TIMEOUTS and "implicit" in params:
+            self.implicit_wait = params["implicit"] / 1000
+        timeout = self.timeout_for(command)
+        self.stats["commands"] += 1
+        self._client_config._local.timeout = timeout
+        self._local.gzip = self.settings.gzip_page_source and COMMAND_CLASSES.get(command) == "source"
+        start = time.time()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = super().execute(command, params)
+            value = response.get("value") if isinstance(response, dict) else None
+            outcome = "error" if isinstance(value, dict) and "error" in value else "ok"
+            return response
+        except (ReadTimeoutError, MaxRetryError, ProtocolError) as e:
+            reason = getattr(e, "reason", e)
+            if isinstance(e, ReadTimeoutError) or isinstance(reason, ReadTimeoutError):
+                self.stats["timeouts"] += 1
+                outcome = "timeout"
+                raise TimeoutException(
+                    f"WinAppDriver no respondió a '{command}' en {timeout.read_timeout}s"
+                ) from e
+            raise
+        finally:
+            self._client_config._local.timeout = None
+            self._local.gzip = False
+            elapsed = time.perf_counter() - started
+            command_metrics.observe(command, elapsed, params.get("using"))
+            tracer.emit("command", command, elapsed, outcome, start=start,
+                        **({"using": params["using"]} if "using" in params else {}))
+    
+    def get_remote_connection_headers(self, parsed_url, keep_alive: bool = True) -> Dict[str, Any]:
+        """Añade Accept-Encoding: gzip a las respuestas grandes si está activado."""
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive=keep_alive)
+        if getattr(self._local, "gzip", False):
+            headers["Accept-Encoding"] = "gzip"
+        return headers
+
+
+def create_connection(remote_server_addr: Optional[str] = None,
+                      settings: Optional[TransportSettings] = None,
+                      config: Optional[Config] = None) -> WinAppDriverConnection:
+    """
+    Crea el command_executor para webdriver.Remote.
+    
+    Args:
+        remote_server_addr: URL de WinAppDriver (por defecto, WINAPPDRIVER_URL)
+        settings: Parámetros de transporte (por defecto, los de la configuración)
+        config: Instancia de Config a usar
+    
+    Returns:
+        WinAppDriverConnection: Conexión configurada
+    """
+    config = config or Config()
+    return WinAppDriverConnection(
+        remote_server_addr or config.get_winappdriver_url(),
+        settings or TransportSettings.from_config(config),
+    )
@@ -11,8 +11,16 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import logging
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from src.drivers.circuit_breaker import BreakerRegistry, session_breakers
+from src.drivers.grid import GridNode, WinAppDriverGrid, get_grid
+from src.drivers.transport import CLOSE_APP_COMMAND, LAUNCH_APP_COMMAND, create_connection
 from src.utils.config import Config
+from src.utils.tracing import tracer
+from src.utils.waits import AdaptiveWait, PollingPolicy
 
 
 class WinAppDriver:
@@ -32,39 +40,116 @@ class WinAppDriver:
         self.config = Config()
         self.app_path = app_path or self.config.get_app_path()
         self.logger = logging.getLogger(__name__)
+        self.grid: Optional[WinAppDriverGrid] = None
+        self.grid_node: Optional[GridNode] = None
+        self.breakers: BreakerRegistry = session_breakers
         
     def start_driver(self) -> webdriver.Remote:
         """
         Inicia el driver WinAppDriver.
         
+        Con WINAPPDRIVER_URLS la sesión se crea en el nodo sano menos cargado
+        del grid (ver grid.py). Tras varios fallos de conexión seguidos a un
+        endpoint, su circuit breaker hace fallar los intentos siguientes al
+        instante (ver circuit_breaker.py); en el grid se pasa al siguiente nodo.
+        
         Returns:
             webdriver.Remote: Instancia del driver configurado
+        
+        Raises:
+            CircuitOpenError: Si el circuito está abierto (WinAppDriver no responde)
         """
-        try:
-            options = WindowsOptions()
-            options.app = self.app_path
-            options.platform_name = "Windows"
-            options.device_name = "WindowsPC"
-            
-            # Configuraciones adicionales
-            options.set_capability("ms:waitForAppLaunch", "25")
-            options.set_capability("ms:experimental-webdriver", True)
-            
-            self.driver = webdriver.Remote(
-                command_executor=self.config.get_winappdriver_url(),
-                options=options
-            )
+        with tracer.span("driver", "start") as fields:
+            try:
+                options = WindowsOptions()
+                options.app = self.app_path
+                options.platform_name = "Windows"
+                options.device_name = "WindowsPC"
+                
+                # Configuraciones adicionales
+                options.set_capability("ms:waitForAppLaunch", "25")
+                options.set_capability("ms:experimental-webdriver", True)
+                
+                grid = get_grid(self.config)
+                if grid is None:
+                    self.driver = self._new_guarded_session(options, self.config.get_winappdriver_url())
+                else:
+                    self.driver = self._new_session_on_grid(grid, options)
+                    fields["node"] = self.grid_node.url
+                
+                self.driver.command_executor.add_command(
+                    CLOSE_APP_COMMAND, "POST", "/session/$sessionId/appium/app/close"
+                )
+                self.driver.command_executor.add_command(
+                    LAUNCH_APP_COMMAND, "POST", "/session/$sessionId/appium/app/launch"
+                )
+                
+                # Configurar wait implícito
+                self.driver.implicitly_wait(self.config.get_implicit_wait())
+                self.wait = AdaptiveWait(
+                    self.driver, self.config.get_explicit_wait(),
+                    policy=PollingPolicy.from_config(self.config)
+                )
+                
+                self.logger.info(f"WinAppDriver iniciado exitosamente para: {self.app_path}")
+                return self.driver
             
-            # Configurar wait implícito
-            self.driver.implicitly_wait(self.config.get_implicit_wait())
-            self.wait = WebDriverWait(self.driver, self.config.get_explicit_wait())
-            
-            self.logger.info(f"WinAppDriver iniciado exitosamente para: {self.app_path}")
-            return self.driver
-            
-        except Exception as e:
-            self.logger.error(f"Error al iniciar WinAppDriver: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Error al iniciar WinAppDriver: {str(e)}")
+                raise
+    
+    def _new_session(self, options: WindowsOptions, url: Optional[str] = None) -> webdriver.Remote:
+        """Crea la sesión en WinAppDriver (por defecto, en WINAPPDRIVER_URL)."""
+        return webdriver.Remote(
+            command_executor=create_connection(url, config=self.config),
+            options=options
+        )
+    
+    def _new_guarded_session(self, options: WindowsOptions, url: str) -> webdriver.Remote:
+        """
+        Crea la sesión a través del circuit breaker del endpoint.
+        
+        Raises:
+            CircuitOpenError: Si el circuito del endpoint está abierto
+        """
+        breaker = self.breakers.get(url)
+        # Con el circuito abierto se falla al instante, sin esperar al timeout
+        breaker.before_call()
+        try:
+            driver = self._new_session(options, url)
+        except BaseException as e:
+            breaker.record_failure(e)
             raise
+        breaker.record_success()
+        return driver
+    
+    def _new_session_on_grid(self, grid: WinAppDriverGrid, options: WindowsOptions) -> webdriver.Remote:
+        """
+        Crea la sesión en el nodo menos cargado del grid.
+        
+        Si la sesión no se puede crear (o el circuito del nodo está abierto),
+        el fallo cuenta para la cuarentena del nodo y se prueba con el siguiente.
+        """
+        tried: List[str] = []
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                node = grid.acquire(exclude=tried)
+            except RuntimeError:
+                if last_error is None:
+                    raise
+                raise last_error
+            try:
+                driver = self._new_guarded_session(options, node.url)
+            except Exception as e:
+                grid.release(node, error=e)
+                tried.append(node.url)
+                last_error = e
+                self.logger.warning(f"No se pudo crear la sesión en {node.url}: {str(e)}")
+                continue
+            self.grid, self.grid_node = grid, node
+            self.logger.info(f"Sesión creada en el nodo {node.url} ({node.active}/{node.capacity})")
+            return driver
     
     def stop_driver(self) -> None:
         """
@@ -72,10 +157,41 @@ class WinAppDriver:
         """
         try:
             if self.driver:
-                self.driver.quit()
+                with tracer.span("driver", "stop"):
+                    self.driver.quit()
                 self.logger.info("WinAppDriver detenido exitosamente")
         except Exception as e:
             self.logger.error(f"Error al detener WinAppDriver: {str(e)}")
+        if self.grid_node is not None:
+            self.grid.release(self.grid_node)
+            self.grid_node = None
+    
+    def is_healthy(self) -> bool:
+        """
+        Verifica que la sesión siga activa y responda a comandos.
+        
+        Returns:
+            bool: True si la sesión responde correctamente
+        """
+        if not self.driver or not self.driver.session_id:
+            return False
+        try:
+            return bool(self.driver.window_handles)
+        except Exception as e:
+            self.logger.warning(f"Sesión de WinAppDriver no responde: {str(e)}")
+            return False
+    
+    def reset_app(self) -> None:
+        """
+        Reinicia la aplicación reutilizando la sesión actual.
+        
+        Cierra y vuelve a lanzar la aplicación a través de los endpoints de
+        WinAppDriver, evitando el coste de negociar una sesión nueva.
+        """
+        driver = self.get_driver()
+        driver.execute(CLOSE_APP_COMMAND)
+        driver.execute(LAUNCH_APP_COMMAND)
+        self.logger.info(f"Aplicación reiniciada en sesión existente: {self.app_path}")
     
     def find_element_by_automation_id(self, automation_id: str):
         """
@@ -140,3 +256,187 @@ class WinAppDriver:
         if not self.wait:
             raise RuntimeError("Wait no inicializado. Llamar start_driver() primero.")
         return self.wait
+
+
+
+class SessionPool:
+    """
+    Pool de sesiones WinAppDriver reutilizables entre pruebas.
+    
+    Mantiene sesiones "calientes" para evitar el lanzamiento de la aplicación
+    en cada prueba. Las sesiones se verifican antes de entregarse, se reinician
+    al devolverse y se reciclan tras un número máximo de usos.
+    """
+    
+    def __init__(self, app_path: Optional[str] = None, max_size: Optional[int] = None,
+                 max_uses: Optional[int] = None,
+                 driver_factory: Optional[Callable[[Optional[str]], WinAppDriver]] = None):
+        """
+        Inicializa el pool de sesiones.
+        
+        Args:
+            app_path: Ruta a la aplicación WPF a automatizar
+            max_size: Número máximo de sesiones simultáneas
+            max_uses: Usos máximos de una sesión antes de descartarla
+            driver_factory: Función que crea instancias de WinAppDriver
+        """
+        self.config = Config()
+        self.app_path = app_path or self.config.get_app_path()
+        self.max_size = max_size or self.config.get_session_pool_size()
+        self.max_uses = max_uses or self.config.get_session_pool_max_uses()
+        self.driver_factory = driver_factory or WinAppDriver
+        self.logger = logging.getLogger(__name__)
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+        self._idle: List[WinAppDriver] = []
+        self._uses: Dict[int, int] = {}
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def warm_up(self, count: Optional[int] = None) -> None:
+        """
+        Crea sesiones por adelantado para que las primeras pruebas no esperen.
+        
+        Args:
+            count: Número de sesiones a crear (por defecto, el tamaño del pool)
+        """
+        count = min(count or self.max_size, self.max_size)
+        while True:
+            with self._condition:
+                if self._closed or len(self._idle) + self._in_use >= count:
+                    return
+                self._in_use += 1
+            try:
+                win_driver = self._create_session()
+            except BaseException:
+                self._return_slot()
+                raise
+            with self._condition:
+                self._in_use -= 1
+                self._idle.append(win_driver)
+                self._condition.notify()
+    
+    def acquire(self, timeout: Optional[float] = None) -> WinAppDriver:
+        """
+        Obtiene una sesión del pool, creándola si hace falta.
+        
+        Args:
+            timeout: Tiempo máximo de espera si el pool está lleno
+        
+        Returns:
+            WinAppDriver: Driver con una sesión activa
+        """
+        deadline = time.monotonic() + (timeout or self.config.get_explicit_wait())
+        while True:
+            candidate = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("El pool de sesiones está cerrado")
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        break
+                    if self._in_use < self.max_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No hay sesiones disponibles en el pool (máximo {self.max_size})"
+                        )
+                    self._condition.wait(remaining)
+                self._in_use += 1
+            
+            if candidate is None:
+                try:
+                    candidate = self._create_session()
+                except Exception:
+                    self._return_slot()
+                    raise
+            elif not candidate.is_healthy():
+                self.logger.warning("Sesión del pool no saludable, se descarta")
+                self._discard(candidate)
+                self._return_slot()
+                continue
+            else:
+                self.stats["reused"] += 1
+            
+            self._uses[id(candidate)] = self._uses.get(id(candidate), 0) + 1
+            return candidate
+    
+    def release(self, win_driver: WinAppDriver, discard: bool = False) -> None:
+        """
+        Devuelve una sesión al pool dejando la aplicación en su estado inicial.
+        
+        Args:
+            win_driver: Driver obtenido con acquire()
+            discard: Si descartar la sesión en lugar de reutilizarla
+        """
+        uses = self._uses.get(id(win_driver), 0)
+        if not discard and uses >= self.max_uses:
+            self.logger.info(f"Sesión reciclada tras {uses} usos")
+            discard = True
+        
+        if not discard and not self._closed:
+            try:
+                with tracer.span("driver", "reset"):
+                    win_driver.reset_app()
+            except Exception as e:
+                self.logger.warning(f"No se pudo reiniciar la aplicación: {str(e)}")
+                discard = True
+        
+        with self._condition:
+            self._in_use -= 1
+            if not discard and not self._closed:
+                self._idle.append(win_driver)
+                self._condition.notify()
+                return
+            self._condition.notify()
+        self._discard(win_driver)
+    
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[WinAppDriver]:
+        """
+        Context manager que obtiene y devuelve una sesión del pool.
+        
+        Args:
+            timeout: Tiempo máximo de espera si el pool está lleno
+        
+        Yields:
+            WinAppDriver: Driver con una sesión activa
+        """
+        win_driver = self.acquire(timeout)
+        try:
+            yield win_driver
+        finally:
+            self.release(win_driver)
+    
+    def close(self) -> None:
+        """
+        Cierra el pool y detiene todas las sesiones inactivas.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for win_driver in idle:
+            self._discard(win_driver)
+        self.logger.info(f"Pool de sesiones cerrado: {self.stats}")
+    
+    def _create_session(self) -> WinAppDriver:
+        """Crea e inicia una nueva sesión de WinAppDriver."""
+        win_driver = self.driver_factory(self.app_path)
+        win_driver.start_driver()
+        self.stats["created"] += 1
+        return win_driver
+    
+    def _discard(self, win_driver: WinAppDriver) -> None:
+        """Detiene una sesión y la elimina del registro de usos."""
+        self._uses.pop(id(win_driver), None)
+        self.stats["discarded"] += 1
+        win_driver.stop_driver()
+    
+    def _return_slot(self) -> None:
+        """Libera un hueco del pool reservado por acquire()."""
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
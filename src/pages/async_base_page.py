@@ -0,0 +1,307 @@
+"""
+Clase base asíncrona para implementar el patrón Page Object Model.
+
+Contraparte de BasePage para AsyncWinAppDriver: las acciones son corrutinas
+y las esperas ceden el event loop entre sondeos, de modo que muchas páginas
+(de distintas sesiones) pueden avanzar a la vez en un único hilo.
+"""
+
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, List, Optional
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from src.drivers.async_winapp_driver import AsyncWebElement, AsyncWinAppDriver
+from src.utils.config import config
+from src.utils.helpers import save_screenshot_bytes
+from src.utils.screenshots import screenshot_policy
+from src.utils.waits import PollingPolicy, async_wait_until
+
+
+class AsyncBasePage:
+    """
+    Clase base asíncrona para todas las páginas usando Page Object Model.
+    """
+    
+    def __init__(self, driver: AsyncWinAppDriver):
+        """
+        Inicializa la página base asíncrona.
+        
+        Args:
+            driver: Instancia de AsyncWinAppDriver con la sesión iniciada
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    async def find_element(self, locator: tuple, timeout: Optional[float] = None) -> AsyncWebElement:
+        """
+        Encuentra un elemento en la página, esperando a que esté presente.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            AsyncWebElement: Elemento encontrado
+        """
+        try:
+            return await self.wait_until(
+                lambda: self.driver.find_element(*locator), timeout,
+                message=f"Elemento no encontrado: {locator}",
+            )
+        except TimeoutException as e:
+            self.logger.error(f"Elemento no encontrado: {locator}")
+            await self.capture_failure(f"element_not_found_{locator[1]}", e)
+            raise
+    
+    async def find_elements(self, locator: tuple) -> List[AsyncWebElement]:
+        """
+        Encuentra múltiples elementos en la página.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            List: Lista de elementos encontrados
+        """
+        try:
+            return await self.driver.find_elements(*locator)
+        except NoSuchElementException:
+            self.logger.warning(f"Elementos no encontrados: {locator}")
+            return []
+    
+    async def click_element(self, locator: tuple, timeout: Optional[float] = None) -> None:
+        """
+        Hace clic en un elemento cuando está visible y habilitado.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        """
+        try:
+            element = await self.wait_for_clickable(locator, timeout)
+            await element.click()
+            self.logger.info("Clic realizado en elemento: %s", locator)
+        except Exception as e:
+            self.logger.error(f"Error al hacer clic en elemento {locator}: {str(e)}")
+            await self.capture_failure(f"click_error_{locator[1]}", e)
+            raise
+    
+    async def send_keys_to_element(self, locator: tuple, text: str, clear_first: bool = True) -> None:
+        """
+        Envía texto a un elemento.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            text: Texto a enviar
+            clear_first: Si limpiar el campo antes de escribir
+        """
+        try:
+            element = await self.find_element(locator)
+            if clear_first:
+                await element.clear()
+            await element.send_keys(text)
+            self.logger.info("Texto enviado a elemento %s: %s", locator, text)
+        except Exception as e:
+            self.logger.error(f"Error al enviar texto a elemento {locator}: {str(e)}")
+            await self.capture_failure(f"send_keys_error_{locator[1]}", e)
+            raise
+    
+    async def get_element_text(self, locator: tuple) -> str:
+        """
+        Obtiene el texto de un elemento.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            str: Texto del elemento
+        """
+        try:
+            element = await self.find_element(locator)
+            text = await element.get_text()
+            self.logger.info("Texto obtenido de elemento %s: %s", locator, text)
+            return text
+        except Exception as e:
+            self.logger.error(f"Error al obtener texto de elemento {locator}: {str(e)}")
+            raise
+    
+    async def is_element_visible(self, locator: tuple, timeout: float = 5) -> bool:
+        """
+        Verifica si un elemento es visible.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera
+        
+        Returns:
+            bool: True si el elemento es visible
+        """
+        try:
+            await self.wait_for_element_to_appear(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    async def is_element_present(self, locator: tuple) -> bool:
+        """
+        Verifica si un elemento está presente, sin esperar.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            bool: True si el elemento está presente
+        """
+        return bool(await self.find_elements(locator))
+    
+    async def wait_for_clickable(self, locator: tuple, timeout: Optional[float] = None) -> AsyncWebElement:
+        """
+        Espera a que un elemento sea visible y esté habilitado.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            AsyncWebElement: Elemento clickeable
+        """
+        async def clickable():
+            element = await self.driver.find_element(*locator)
+            if await element.is_displayed() and await element.is_enabled():
+                return element
+            return None
+        
+        return await self.wait_until(clickable, timeout, message=f"Elemento no clickeable: {locator}")
+    
+    async def wait_for_element_to_appear(self, locator: tuple,
+                                         timeout: Optional[float] = None) -> AsyncWebElement:
+        """
+        Espera a que un elemento aparezca y sea visible.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            AsyncWebElement: Elemento visible
+        """
+        async def visible():
+            for element in await self.driver.find_elements(*locator):
+                if await element.is_displayed():
+                    return element
+            return None
+        
+        return await self.wait_until(visible, timeout, message=f"Elemento no visible: {locator}")
+    
+    async def wait_for_element_to_disappear(self, locator: tuple,
+                                            timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que un elemento desaparezca o deje de ser visible.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            bool: True si el elemento desapareció
+        """
+        async def gone():
+            for element in await self.driver.find_elements(*locator):
+                if await element.is_displayed():
+                    return False
+            return True
+        
+        try:
+            return await self.wait_until(gone, timeout)
+        except TimeoutException:
+            return False
+    
+    async def wait_until(self, condition: Callable[[], Awaitable[Any]],
+                         timeout: Optional[float] = None,
+                         poll_interval: Optional[float] = None, message: str = "") -> Any:
+        """
+        Espera hasta que una corrutina devuelva un valor verdadero.
+        
+        Args:
+            condition: Función sin argumentos que devuelve un awaitable
+            timeout: Tiempo máximo de espera (por defecto, el explícito)
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+            message: Mensaje de la excepción si se agota el tiempo
+        
+        Returns:
+            Any: Primer valor verdadero devuelto por la condición
+        """
+        return await async_wait_until(
+            condition, timeout or config.get_explicit_wait(),
+            policy=PollingPolicy.fixed(poll_interval) if poll_interval else None,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+            message=message,
+        )
+    
+    async def take_screenshot(self, step_name: str) -> str:
+        """
+        Toma una captura de pantalla.
+        
+        Se guarda con save_screenshot_bytes, igual que en BasePage (escritura
+        en segundo plano, deduplicación y directorio por worker según la
+        configuración).
+        
+        Args:
+            step_name: Nombre del paso actual
+        
+        Returns:
+            str: Ruta o referencia de la captura (vacía si falló)
+        """
+        try:
+            png = await self.driver.get_screenshot_as_png()
+            filepath = save_screenshot_bytes(png, self.__class__.__name__, step_name)
+            self.logger.info(f"Screenshot guardado: {filepath}")
+            return filepath
+        except Exception as e:
+            self.logger.error(f"Error al tomar screenshot: {str(e)}")
+            return ""
+    
+    async def capture_failure(self, step_name: str, error: Optional[BaseException] = None) -> str:
+        """
+        Toma una captura de fallo respetando la política de capturas.
+        
+        Args:
+            step_name: Nombre del paso actual
+            error: Excepción que provoca la captura
+        
+        Returns:
+            str: Ruta del archivo de screenshot (vacía si se omitió)
+        """
+        if not screenshot_policy.should_capture(error):
+            return ""
+        try:
+            png = await self.driver.get_screenshot_as_png()
+        except Exception as e:
+            self.logger.error(f"Error al tomar screenshot: {str(e)}")
+            return ""
+        screen_hash = None
+        if screenshot_policy.needs_screen_hash():
+            screen_hash = hashlib.sha256(png).hexdigest()
+            if not screenshot_policy.should_capture(error, screen_hash):
+                return ""
+        path = save_screenshot_bytes(png, self.__class__.__name__, step_name)
+        screenshot_policy.record_capture(path, error, screen_hash, png)
+        return path
+    
+    async def get_window_title(self) -> str:
+        """
+        Obtiene el título de la ventana actual.
+        
+        Returns:
+            str: Título de la ventana
+        """
+        try:
+            return await self.driver.title()
+        except Exception as e:
+            self.logger.error(f"Error al obtener título de ventana: {str(e)}")
+            return ""
@@ -5,14 +5,26 @@ Esta clase proporciona funcionalidades comunes para todas las páginas
 de la aplicación WPF.
 """
 
+import hashlib
 import logging
-from typing import Optional, List
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, List, Tuple, Union
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from src.pages.element_cache import ElementCache
+from src.pages.page_snapshot import PageSnapshot, SnapshotElement
 from src.utils.config import config
-from src.utils.helpers import take_screenshot
+from src.utils.helpers import save_screenshot_bytes, take_screenshot
+from src.utils.screenshots import screenshot_policy
+from src.utils.tracing import tracer
+from src.utils.waits import AdaptiveWait, PollingPolicy
 
 
 class BasePage:
@@ -20,16 +32,24 @@ class BasePage:
     Clase base para todas las páginas usando Page Object Model.
     """
     
-    def __init__(self, driver):
+    def __init__(self, driver, use_element_cache: Optional[bool] = None):
         """
         Inicializa la página base.
         
         Args:
             driver: Instancia del driver WinAppDriver
+            use_element_cache: Si cachear los elementos por localizador
+                (por defecto, según ELEMENT_CACHE_ENABLED)
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, config.get_explicit_wait())
+        self.wait = AdaptiveWait(driver, config.get_explicit_wait())
         self.logger = logging.getLogger(self.__class__.__name__)
+        if use_element_cache is None:
+            use_element_cache = config.is_element_cache_enabled()
+        self.element_cache = ElementCache() if use_element_cache else None
+        self.probe_stats = {"probes": 0, "negative": 0, "seconds": 0.0, "implicit_wait_avoided": 0.0}
+        self._implicit_wait_depth = 0
+        self._saved_implicit_wait = 0.0
         
     def find_element(self, locator: tuple, timeout: Optional[int] = None):
         """
@@ -42,15 +62,23 @@ class BasePage:
         Returns:
             WebElement: Elemento encontrado
         """
+        if self.element_cache is not None:
+            element = self.element_cache.get(locator)
+            if element is not None:
+                return element
         try:
             if timeout:
-                wait = WebDriverWait(self.driver, timeout)
-                return wait.until(EC.presence_of_element_located(locator))
-            return self.wait.until(EC.presence_of_element_located(locator))
-        except TimeoutException:
+                wait = AdaptiveWait(self.driver, timeout)
+                element = wait.until(EC.presence_of_element_located(locator))
+            else:
+                element = self.wait.until(EC.presence_of_element_located(locator))
+        except TimeoutException as e:
             self.logger.error(f"Elemento no encontrado: {locator}")
-            self.take_screenshot(f"element_not_found_{locator[1]}")
+            self.capture_failure(f"element_not_found_{locator[1]}", e)
             raise
+        if self.element_cache is not None:
+            self.element_cache.put(locator, element)
+        return element
     
     def find_elements(self, locator: tuple) -> List:
         """
@@ -77,12 +105,13 @@ class BasePage:
             timeout: Tiempo de espera personalizado
         """
         try:
-            element = self.wait_for_clickable(locator, timeout)
-            element.click()
-            self.logger.info(f"Clic realizado en elemento: {locator}")
+            with tracer.span("action", "click_element", locator=locator):
+                self._with_element(locator, lambda element: element.click(),
+                                   lambda loc: self.wait_for_clickable(loc, timeout))
+            self.logger.info("Clic realizado en elemento: %s", locator)
         except Exception as e:
             self.logger.error(f"Error al hacer clic en elemento {locator}: {str(e)}")
-            self.take_screenshot(f"click_error_{locator[1]}")
+            self.capture_failure(f"click_error_{locator[1]}", e)
             raise
     
     def send_keys_to_element(self, locator: tuple, text: str, clear_first: bool = True) -> None:
@@ -94,15 +123,18 @@ class BasePage:
             text: Texto a enviar
             clear_first: Si limpiar el campo antes de escribir
         """
-        try:
-            element = self.find_element(locator)
+        def type_text(element):
             if clear_first:
                 element.clear()
             element.send_keys(text)
-            self.logger.info(f"Texto enviado a elemento {locator}: {text}")
+        
+        try:
+            with tracer.span("action", "send_keys_to_element", locator=locator):
+                self._with_element(locator, type_text)
+            self.logger.info("Texto enviado a elemento %s: %s", locator, text)
         except Exception as e:
             self.logger.error(f"Error al enviar texto a elemento {locator}: {str(e)}")
-            self.take_screenshot(f"send_keys_error_{locator[1]}")
+            self.capture_failure(f"send_keys_error_{locator[1]}", e)
             raise
     
     def get_element_text(self, locator: tuple) -> str:
@@ -116,47 +148,129 @@ class BasePage:
             str: Texto del elemento
         """
         try:
-            element = self.find_element(locator)
-            text = element.text
-            self.logger.info(f"Texto obtenido de elemento {locator}: {text}")
+            with tracer.span("action", "get_element_text", locator=locator):
+                text = self._with_element(locator, lambda element: element.text)
+            self.logger.info("Texto obtenido de elemento %s: %s", locator, text)
             return text
         except Exception as e:
             self.logger.error(f"Error al obtener texto de elemento {locator}: {str(e)}")
             raise
     
-    def is_element_visible(self, locator: tuple, timeout: int = 5) -> bool:
+    def is_element_visible(self, locator: tuple, timeout: int = 5,
+                           skip_implicit_wait: bool = True) -> bool:
         """
         Verifica si un elemento es visible.
         
         Args:
             locator: Tupla con el tipo y valor del localizador
             timeout: Tiempo de espera
+            skip_implicit_wait: Si desactivar el wait implícito durante la
+                comprobación para que no se acumule sobre el explícito
         
         Returns:
             bool: True si el elemento es visible
         """
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
-            return True
-        except TimeoutException:
-            return False
+        def probe():
+            try:
+                wait = AdaptiveWait(self.driver, timeout)
+                wait.until(EC.visibility_of_element_located(locator))
+                return True
+            except TimeoutException:
+                return False
+        
+        return self._run_probe(probe, skip_implicit_wait)
     
-    def is_element_present(self, locator: tuple) -> bool:
+    def is_element_present(self, locator: tuple, skip_implicit_wait: bool = True) -> bool:
         """
         Verifica si un elemento está presente en el DOM.
         
         Args:
             locator: Tupla con el tipo y valor del localizador
+            skip_implicit_wait: Si desactivar el wait implícito para que la
+                ausencia se detecte de inmediato
         
         Returns:
             bool: True si el elemento está presente
         """
+        def probe():
+            try:
+                self.driver.find_element(*locator)
+                return True
+            except NoSuchElementException:
+                return False
+        
+        return self._run_probe(probe, skip_implicit_wait)
+    
+    @contextmanager
+    def implicit_wait_disabled(self) -> Iterator[None]:
+        """
+        Context manager que desactiva el wait implícito y lo restaura al salir.
+        
+        Las comprobaciones de ausencia o presencia que ya tienen su propia
+        espera explícita no deben pagar además el wait implícito en cada
+        sondeo. Admite anidamiento: solo el bloque más externo lee el timeout
+        actual de la sesión, lo cambia en WinAppDriver y lo restaura después,
+        de modo que se respeta el wait implícito fijado por la prueba o la
+        página.
+        """
+        self._implicit_wait_depth += 1
         try:
-            self.driver.find_element(*locator)
-            return True
-        except NoSuchElementException:
-            return False
+            if self._implicit_wait_depth == 1:
+                self._saved_implicit_wait = self._current_implicit_wait()
+                if self._saved_implicit_wait:
+                    self.driver.implicitly_wait(0)
+            yield
+        finally:
+            self._implicit_wait_depth -= 1
+            if self._implicit_wait_depth == 0 and self._saved_implicit_wait:
+                self.driver.implicitly_wait(self._saved_implicit_wait)
+    
+    def _current_implicit_wait(self) -> float:
+        """Obtiene el wait implícito de la sesión (IMPLICIT_WAIT si el servidor no lo informa)."""
+        try:
+            return self.driver.timeouts.implicit_wait
+        except (WebDriverException, KeyError, TypeError) as e:
+            self.logger.debug("No se pudo leer el wait implícito de la sesión: %s", e)
+            return config.get_implicit_wait()
+    
+    def get_probe_stats(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas de las comprobaciones de presencia/ausencia.
+        
+        Returns:
+            Dict: Número de comprobaciones, cuántas fueron negativas, tiempo
+            total invertido y tiempo de wait implícito evitado (estimado)
+        """
+        return dict(self.probe_stats)
+    
+    def _run_probe(self, probe: Callable[[], Any], skip_implicit_wait: bool = True) -> Any:
+        """
+        Ejecuta una comprobación registrando su duración.
+        
+        Args:
+            probe: Función que realiza la comprobación
+            skip_implicit_wait: Si desactivar el wait implícito durante la comprobación
+        
+        Returns:
+            Any: Resultado de la comprobación
+        """
+        start = time.monotonic()
+        if skip_implicit_wait:
+            with self.implicit_wait_disabled():
+                result = probe()
+        else:
+            result = probe()
+        elapsed = time.monotonic() - start
+        
+        self.probe_stats["probes"] += 1
+        self.probe_stats["seconds"] += elapsed
+        if not result:
+            self.probe_stats["negative"] += 1
+            if skip_implicit_wait:
+                # Sin desactivarlo, la última búsqueda fallida habría esperado el wait implícito completo
+                self.probe_stats["implicit_wait_avoided"] += self._saved_implicit_wait
+        self.logger.debug("Comprobación completada en %.3fs (resultado: %s)", elapsed, bool(result))
+        return result
     
     def wait_for_clickable(self, locator: tuple, timeout: Optional[int] = None):
         """
@@ -169,32 +283,381 @@ class BasePage:
         Returns:
             WebElement: Elemento clickeable
         """
-        if timeout:
-            wait = WebDriverWait(self.driver, timeout)
-            return wait.until(EC.element_to_be_clickable(locator))
-        return self.wait.until(EC.element_to_be_clickable(locator))
+        wait = AdaptiveWait(self.driver, timeout) if timeout else self.wait
+        if self.element_cache is not None:
+            cached = self.element_cache.get(locator)
+            if cached is not None:
+                try:
+                    return wait.until(EC.element_to_be_clickable(cached))
+                except StaleElementReferenceException:
+                    self.element_cache.invalidate(locator, stale=True)
+        element = wait.until(EC.element_to_be_clickable(locator))
+        if self.element_cache is not None:
+            self.element_cache.put(locator, element)
+        return element
     
-    def wait_for_element_to_disappear(self, locator: tuple, timeout: Optional[int] = None) -> bool:
+    def wait_for_element_to_disappear(self, locator: tuple, timeout: Optional[int] = None,
+                                      skip_implicit_wait: bool = True) -> bool:
         """
         Espera a que un elemento desaparezca.
         
         Args:
             locator: Tupla con el tipo y valor del localizador
             timeout: Tiempo de espera personalizado
+            skip_implicit_wait: Si desactivar el wait implícito durante la espera
         
         Returns:
             bool: True si el elemento desapareció
         """
+        def probe():
+            try:
+                if timeout:
+                    wait = AdaptiveWait(self.driver, timeout)
+                    wait.until_not(EC.presence_of_element_located(locator))
+                else:
+                    self.wait.until_not(EC.presence_of_element_located(locator))
+                return True
+            except TimeoutException:
+                return False
+        
+        # El resultado positivo es la ausencia: se registra como comprobación negativa
+        return not self._run_probe(lambda: not probe(), skip_implicit_wait)
+    
+    def take_snapshot(self) -> PageSnapshot:
+        """
+        Obtiene una instantánea del árbol de interfaz con una sola petición.
+        
+        Returns:
+            PageSnapshot: Árbol indexado por Name, AutomationId y ClassName
+        """
         try:
-            if timeout:
-                wait = WebDriverWait(self.driver, timeout)
-                wait.until_not(EC.presence_of_element_located(locator))
+            return PageSnapshot(self.driver.page_source)
+        except Exception as e:
+            self.logger.error(f"Error al obtener instantánea de la página: {str(e)}")
+            raise
+    
+    def resolve_locators(self, locators: List[tuple],
+                         snapshot: Optional[PageSnapshot] = None) -> Dict[tuple, Optional[SnapshotElement]]:
+        """
+        Resuelve varios localizadores sobre una instantánea de la página.
+        
+        Los elementos devueltos son de solo lectura; para interactuar con ellos
+        hay que usar find_element() o las acciones de la página.
+        
+        Args:
+            locators: Localizadores a resolver
+            snapshot: Instantánea a reutilizar (por defecto, se toma una nueva)
+        
+        Returns:
+            Dict: Elemento de la instantánea (o None) por localizador
+        """
+        snapshot = snapshot or self.take_snapshot()
+        return snapshot.resolve(locators)
+    
+    def are_elements_present(self, locators: List[tuple],
+                             snapshot: Optional[PageSnapshot] = None) -> Dict[tuple, bool]:
+        """
+        Verifica la presencia de varios elementos con una sola petición.
+        
+        Args:
+            locators: Localizadores a verificar
+            snapshot: Instantánea a reutilizar (por defecto, se toma una nueva)
+        
+        Returns:
+            Dict: True/False por localizador
+        """
+        resolved = self.resolve_locators(locators, snapshot)
+        return {locator: element is not None for locator, element in resolved.items()}
+    
+    def get_elements_text(self, locators: List[tuple],
+                          snapshot: Optional[PageSnapshot] = None) -> Dict[tuple, Optional[str]]:
+        """
+        Obtiene el texto de varios elementos con una sola petición.
+        
+        Args:
+            locators: Localizadores de los elementos
+            snapshot: Instantánea a reutilizar (por defecto, se toma una nueva)
+        
+        Returns:
+            Dict: Texto (o None si el elemento no existe) por localizador
+        """
+        resolved = self.resolve_locators(locators, snapshot)
+        return {locator: element.text if element else None
+                for locator, element in resolved.items()}
+    
+    def get_elements_attribute(self, locators: List[tuple], attribute: str,
+                               snapshot: Optional[PageSnapshot] = None) -> Dict[tuple, Optional[str]]:
+        """
+        Obtiene un atributo UIA de varios elementos con una sola petición.
+        
+        Args:
+            locators: Localizadores de los elementos
+            attribute: Nombre del atributo (p. ej. 'IsEnabled', 'AutomationId')
+            snapshot: Instantánea a reutilizar (por defecto, se toma una nueva)
+        
+        Returns:
+            Dict: Valor del atributo (o None) por localizador
+        """
+        resolved = self.resolve_locators(locators, snapshot)
+        return {locator: element.get_attribute(attribute) if element else None
+                for locator, element in resolved.items()}
+    
+    def invalidate_cache(self, locator: Optional[tuple] = None) -> None:
+        """
+        Invalida la caché de elementos (por ejemplo, tras navegar en la aplicación).
+        
+        Args:
+            locator: Localizador a invalidar (None para vaciar toda la caché)
+        """
+        if self.element_cache is not None:
+            self.element_cache.invalidate(locator)
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la caché de elementos.
+        
+        Returns:
+            Dict: Contadores de la caché (vacío si está desactivada)
+        """
+        if self.element_cache is None:
+            return {}
+        return self.element_cache.get_stats()
+    
+    def _with_element(self, locator: tuple, action: Callable[[Any], Any],
+                      finder: Optional[Callable[[tuple], Any]] = None) -> Any:
+        """
+        Ejecuta una acción sobre un elemento, reintentando una vez si la
+        referencia cacheada ha quedado obsoleta.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            action: Función que recibe el elemento
+            finder: Función para resolver el localizador (por defecto, find_element)
+        
+        Returns:
+            Any: Resultado de la acción
+        """
+        finder = finder or self.find_element
+        try:
+            return action(finder(locator))
+        except StaleElementReferenceException:
+            if self.element_cache is None:
+                raise
+            self.logger.info("Elemento obsoleto en caché, se vuelve a buscar: %s", locator)
+            self.element_cache.invalidate(locator, stale=True)
+            return action(finder(locator))
+    
+    def wait_until(self, condition: Callable[[], Any], timeout: Optional[float] = None,
+                   poll_interval: Optional[float] = None, message: str = "") -> Any:
+        """
+        Espera hasta que una condición devuelva un valor verdadero.
+        
+        Args:
+            condition: Función sin argumentos a evaluar en cada sondeo
+            timeout: Tiempo máximo de espera (por defecto, el explícito)
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+            message: Mensaje de la excepción si se agota el tiempo
+        
+        Returns:
+            Any: Primer valor verdadero devuelto por la condición
+        """
+        wait = AdaptiveWait(
+            self.driver, timeout or config.get_explicit_wait(),
+            policy=PollingPolicy.fixed(poll_interval) if poll_interval else None,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        )
+        return wait.until(lambda _: condition(), message)
+    
+    def wait_for_any(self, conditions: Dict[str, Union[tuple, Callable[[Any], Any]]],
+                     timeout: Optional[float] = None,
+                     poll_interval: Optional[float] = None) -> Tuple[str, Any]:
+        """
+        Espera varias condiciones a la vez y devuelve la primera que se cumple.
+        
+        Permite decidir entre resultados alternativos (por ejemplo, login
+        correcto o mensaje de error) en el tiempo que realmente tarda la
+        aplicación, en lugar de agotar la espera de cada uno por separado.
+        
+        Args:
+            conditions: Diccionario nombre -> localizador (se espera a que el
+                elemento sea visible) o función que recibe el driver
+            timeout: Tiempo máximo de espera (por defecto, el explícito)
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+        
+        Returns:
+            Tuple[str, Any]: Nombre de la condición cumplida y su valor
+                (el elemento visible en el caso de los localizadores)
+        """
+        def check(condition):
+            if callable(condition):
+                return condition(self.driver)
+            for element in self.driver.find_elements(*condition):
+                if element.is_displayed():
+                    return element
+            return None
+        
+        def first_match():
+            for name, condition in conditions.items():
+                try:
+                    value = check(condition)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    continue
+                if value:
+                    return name, value
+            return None
+        
+        with self.implicit_wait_disabled():
+            outcome = self.wait_until(
+                first_match, timeout, poll_interval,
+                message=f"Ninguna condición se cumplió: {', '.join(conditions)}",
+            )
+        self.logger.info("Condición cumplida: %s", outcome[0])
+        return outcome
+    
+    def wait_for_element_to_appear(self, locator: tuple, timeout: Optional[float] = None):
+        """
+        Espera a que un elemento aparezca y sea visible.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            WebElement: Elemento visible
+        """
+        wait = AdaptiveWait(self.driver, timeout) if timeout else self.wait
+        return wait.until(EC.visibility_of_element_located(locator))
+    
+    def wait_for_text_change(self, locator: tuple, old_text: Optional[str] = None,
+                             timeout: Optional[float] = None) -> str:
+        """
+        Espera a que cambie el texto de un elemento.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            old_text: Texto de referencia (por defecto, el texto actual)
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            str: Nuevo texto del elemento
+        """
+        if old_text is None:
+            old_text = self.driver.find_element(*locator).text
+        
+        def text_changed():
+            text = self.driver.find_element(*locator).text
+            # Se devuelve una tupla para que un texto vacío también cuente como cambio
+            return (text,) if text != old_text else None
+        
+        return self.wait_until(
+            text_changed, timeout, message=f"El texto de {locator} no cambió de '{old_text}'"
+        )[0]
+    
+    def wait_for_text(self, locator: tuple, expected: str, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que el texto de un elemento contenga un valor.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            expected: Texto esperado
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            bool: True si el texto apareció a tiempo
+        """
+        try:
+            wait = AdaptiveWait(self.driver, timeout) if timeout else self.wait
+            return wait.until(EC.text_to_be_present_in_element(locator, expected))
+        except TimeoutException:
+            return False
+    
+    def get_ui_signature(self) -> str:
+        """
+        Obtiene una huella del árbol de interfaz actual.
+        
+        Returns:
+            str: Hash del page source
+        """
+        return hashlib.sha1(self.driver.page_source.encode("utf-8")).hexdigest()
+    
+    def wait_for_ui_change(self, baseline: str, timeout: Optional[float] = None,
+                           poll_interval: Optional[float] = None) -> bool:
+        """
+        Espera a que el árbol de interfaz cambie respecto a una huella previa.
+        
+        Args:
+            baseline: Huella obtenida con get_ui_signature()
+            timeout: Tiempo de espera personalizado
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+        
+        Returns:
+            bool: True si la interfaz cambió antes del timeout
+        """
+        try:
+            self.wait_until(lambda: self.get_ui_signature() != baseline, timeout, poll_interval)
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_ui_stable(self, polls: int = 3, poll_interval: Optional[float] = None,
+                           timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que el árbol de interfaz no cambie durante varios sondeos seguidos.
+        
+        Args:
+            polls: Número de sondeos consecutivos con la misma huella
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+            timeout: Tiempo de espera personalizado
+        
+        Returns:
+            bool: True si la interfaz se estabilizó antes del timeout
+        """
+        state = {"signature": None, "count": 0}
+        
+        def is_stable():
+            signature = self.get_ui_signature()
+            if signature == state["signature"]:
+                state["count"] += 1
             else:
-                self.wait.until_not(EC.presence_of_element_located(locator))
+                state["signature"], state["count"] = signature, 1
+            return state["count"] >= polls
+        
+        try:
+            self.wait_until(is_stable, timeout, poll_interval)
             return True
         except TimeoutException:
+            self.logger.warning(f"La interfaz no se estabilizó tras {polls} sondeos")
             return False
     
+    def wait_for_ui_to_settle(self, baseline: Optional[str] = None, change_timeout: float = 2,
+                              polls: int = 3, poll_interval: Optional[float] = None,
+                              timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que la aplicación reaccione a una acción y la interfaz se asiente.
+        
+        Si se indica una huella previa, primero espera (como máximo
+        change_timeout) a que la interfaz cambie y después a que se estabilice.
+        Sustituye a las esperas fijas con time.sleep().
+        
+        Args:
+            baseline: Huella obtenida antes de la acción (opcional)
+            change_timeout: Tiempo máximo para que la interfaz reaccione
+            polls: Sondeos consecutivos sin cambios para considerarla estable
+            poll_interval: Segundos entre sondeos (por defecto, la política
+                de sondeo configurada)
+            timeout: Tiempo máximo para estabilizarse
+        
+        Returns:
+            bool: True si la interfaz quedó estable
+        """
+        if baseline is not None and not self.wait_for_ui_change(baseline, change_timeout, poll_interval):
+            self.logger.info("La interfaz no cambió tras la acción")
+        return self.wait_for_ui_stable(polls, poll_interval, timeout)
+    
     def scroll_to_element(self, locator: tuple) -> None:
         """
         Hace scroll hacia un elemento (si es aplicable en WPF).
@@ -203,9 +666,10 @@ class BasePage:
             locator: Tupla con el tipo y valor del localizador
         """
         try:
-            element = self.find_element(locator)
-            self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            self.logger.info(f"Scroll realizado hacia elemento: {locator}")
+            with tracer.span("action", "scroll_to_element", locator=locator):
+                element = self.find_element(locator)
+                self.driver.execute_script("arguments[0].scrollIntoView();", element)
+            self.logger.info("Scroll realizado hacia elemento: %s", locator)
         except Exception as e:
             self.logger.warning(f"No se pudo hacer scroll hacia elemento {locator}: {str(e)}")
     
@@ -222,6 +686,56 @@ class BasePage:
         test_name = self.__class__.__name__
         return take_screenshot(self.driver, test_name, step_name)
     
+    def save_screenshot(self, png: bytes, step_name: str) -> str:
+        """
+        Guarda una captura ya obtenida del driver.
+        
+        Args:
+            png: Contenido PNG
+            step_name: Nombre del paso actual
+        
+        Returns:
+            str: Ruta del archivo de screenshot
+        """
+        return save_screenshot_bytes(png, self.__class__.__name__, step_name)
+    
+    def capture_failure(self, step_name: str, error: Optional[BaseException] = None) -> str:
+        """
+        Toma una captura de fallo respetando la política de capturas.
+        
+        Se omite si la misma excepción ya se capturó más abajo en la cadena de
+        llamadas, si se agotó el presupuesto de la prueba o de la sesión o si
+        la pantalla no cambió desde la última captura de la prueba (se compara
+        el hash de la imagen; la captura repetida no se guarda).
+        
+        Args:
+            step_name: Nombre del paso actual
+            error: Excepción que provoca la captura
+        
+        Returns:
+            str: Ruta del archivo de screenshot (vacía si se omitió)
+        """
+        if not screenshot_policy.should_capture(error):
+            self.logger.info(f"Captura de fallo omitida por la política: {step_name}")
+            return ""
+        try:
+            with tracer.span("screenshot", step_name):
+                png = self.driver.get_screenshot_as_png()
+        except Exception as e:
+            self.logger.error(f"Error al tomar screenshot: {str(e)}")
+            return ""
+        screen_hash = None
+        if screenshot_policy.needs_screen_hash():
+            # La huella es el hash de la propia captura: sin pedir además el page source
+            screen_hash = hashlib.sha256(png).hexdigest()
+            if not screenshot_policy.should_capture(error, screen_hash):
+                self.logger.info(f"Captura de fallo omitida, la pantalla no cambió: {step_name}")
+                return ""
+        path = self.save_screenshot(png, step_name)
+        # El buffer queda asociado a la excepción para adjuntarlo a los reportes sin releerlo
+        screenshot_policy.record_capture(path, error, screen_hash, png)
+        return path
+    
     def get_window_title(self) -> str:
         """
         Obtiene el título de la ventana actual.
@@ -244,7 +758,8 @@ class BasePage:
         """
         try:
             self.driver.switch_to.window(window_handle)
-            self.logger.info(f"Cambiado a ventana: {window_handle}")
+            self.invalidate_cache()
+            self.logger.info("Cambiado a ventana: %s", window_handle)
         except Exception as e:
             self.logger.error(f"Error al cambiar a ventana {window_handle}: {str(e)}")
             raise
@@ -255,6 +770,7 @@ class BasePage:
         """
         try:
             self.driver.close()
+            self.invalidate_cache()
             self.logger.info("Ventana actual cerrada")
         except Exception as e:
             self.logger.error(f"Error al cerrar ventana: {str(e)}")
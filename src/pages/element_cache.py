@@ -0,0 +1,97 @@
+"""
+Caché de elementos por localizador para los Page Objects.
+
+Evita resolver de nuevo el mismo localizador contra WinAppDriver en cada
+acción. Las entradas obsoletas se invalidan cuando WinAppDriver devuelve
+StaleElementReferenceException o cuando la aplicación navega.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class ElementCache:
+    """
+    Caché de WebElements indexada por localizador con contadores de uso.
+    """
+    
+    def __init__(self):
+        """Inicializa la caché vacía."""
+        self._elements: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+    
+    def get(self, locator: tuple) -> Optional[Any]:
+        """
+        Obtiene el elemento cacheado para un localizador.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            WebElement: Elemento cacheado o None si no existe
+        """
+        key = tuple(locator)
+        with self._lock:
+            element = self._elements.get(key)
+            if element is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return element
+    
+    def put(self, locator: tuple, element: Any) -> None:
+        """
+        Guarda el elemento resuelto para un localizador.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+            element: Elemento encontrado
+        """
+        with self._lock:
+            self._elements[tuple(locator)] = element
+    
+    def invalidate(self, locator: Optional[tuple] = None, stale: bool = False) -> None:
+        """
+        Elimina una entrada o toda la caché.
+        
+        Args:
+            locator: Localizador a invalidar (None para vaciar la caché)
+            stale: Si la invalidación se debe a un elemento obsoleto
+        """
+        with self._lock:
+            if locator is None:
+                self._elements.clear()
+            else:
+                self._elements.pop(tuple(locator), None)
+            if stale:
+                self.stale += 1
+            else:
+                self.invalidations += 1
+    
+    def __contains__(self, locator: tuple) -> bool:
+        return tuple(locator) in self._elements
+    
+    def __len__(self) -> int:
+        return len(self._elements)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la caché.
+        
+        Returns:
+            Dict: Aciertos, fallos, refrescos por obsolescencia, invalidaciones
+            y peticiones a WinAppDriver ahorradas
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "invalidations": self.invalidations,
+                "size": len(self._elements),
+                "saved_round_trips": self.hits - self.stale,
+            }
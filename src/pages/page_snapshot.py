@@ -0,0 +1,169 @@
+"""
+Instantánea del árbol de interfaz obtenida de un único page source.
+
+Permite resolver muchos localizadores y leer textos o atributos con una sola
+petición a WinAppDriver, en lugar de una petición por elemento. Los elementos
+de la instantánea son de solo lectura: para interactuar con ellos hay que
+buscarlos en vivo con BasePage.find_element().
+"""
+
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional
+from selenium.webdriver.common.by import By
+
+
+# Atributo UIA que consulta cada estrategia de localización
+STRATEGY_ATTRIBUTES = {
+    By.NAME: "Name",
+    "accessibility id": "AutomationId",
+    By.CLASS_NAME: "ClassName",
+    By.ID: "RuntimeId",
+}
+
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+class SnapshotElement:
+    """
+    Elemento de solo lectura de una instantánea del árbol de interfaz.
+    """
+    
+    def __init__(self, node: ET.Element):
+        """
+        Inicializa el elemento a partir de su nodo XML.
+        
+        Args:
+            node: Nodo del page source
+        """
+        self.tag_name = node.tag
+        self.attributes = dict(node.attrib)
+    
+    @property
+    def name(self) -> str:
+        """Propiedad Name del elemento."""
+        return self.attributes.get("Name", "")
+    
+    @property
+    def automation_id(self) -> str:
+        """Propiedad AutomationId del elemento."""
+        return self.attributes.get("AutomationId", "")
+    
+    @property
+    def class_name(self) -> str:
+        """Propiedad ClassName del elemento."""
+        return self.attributes.get("ClassName", "")
+    
+    @property
+    def text(self) -> str:
+        """Texto del elemento (Value.Value si existe, si no Name)."""
+        return self.attributes.get("Value.Value", self.name)
+    
+    def is_enabled(self) -> bool:
+        """Verifica si el elemento está habilitado."""
+        return self.attributes.get("IsEnabled", "True").lower() == "true"
+    
+    def is_displayed(self) -> bool:
+        """Verifica si el elemento está en pantalla."""
+        return self.attributes.get("IsOffscreen", "False").lower() != "true"
+    
+    def get_attribute(self, name: str) -> Optional[str]:
+        """
+        Obtiene un atributo UIA del elemento.
+        
+        Args:
+            name: Nombre del atributo
+        
+        Returns:
+            str: Valor del atributo o None si no existe
+        """
+        return self.attributes.get(name)
+    
+    def __repr__(self) -> str:
+        return f"SnapshotElement({self.tag_name}, Name={self.name!r}, AutomationId={self.automation_id!r})"
+
+
+class PageSnapshot:
+    """
+    Árbol de interfaz indexado por Name, AutomationId y ClassName.
+    """
+    
+    def __init__(self, page_source: str):
+        """
+        Parsea el page source e indexa sus elementos.
+        
+        Args:
+            page_source: XML devuelto por driver.page_source
+        """
+        self.taken_at = time.time()
+        self.root = ET.fromstring(_XML_DECLARATION.sub("", page_source, count=1))
+        self.elements: List[SnapshotElement] = []
+        self._index: Dict[str, Dict[str, List[SnapshotElement]]] = {
+            attribute: {} for attribute in STRATEGY_ATTRIBUTES.values()
+        }
+        self._by_tag: Dict[str, List[SnapshotElement]] = {}
+        self._by_node: Dict[int, SnapshotElement] = {}
+        for node in self.root.iter():
+            element = SnapshotElement(node)
+            self.elements.append(element)
+            self._by_node[id(node)] = element
+            self._by_tag.setdefault(node.tag, []).append(element)
+            for attribute, index in self._index.items():
+                value = node.get(attribute)
+                if value:
+                    index.setdefault(value, []).append(element)
+    
+    def find_all(self, locator: tuple) -> List[SnapshotElement]:
+        """
+        Busca todos los elementos que coinciden con un localizador.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            List[SnapshotElement]: Elementos encontrados en orden de documento
+        """
+        by, value = locator
+        if by == By.TAG_NAME:
+            return list(self._by_tag.get(value, []))
+        if by == By.XPATH:
+            wrapper = ET.Element("Root")
+            wrapper.append(self.root)
+            expression = "." + value if value.startswith("/") else value
+            return [self._by_node[id(node)] for node in wrapper.findall(expression)]
+        attribute = STRATEGY_ATTRIBUTES.get(by)
+        if attribute is None:
+            raise ValueError(f"Estrategia de localización no soportada en instantáneas: {by}")
+        return list(self._index[attribute].get(value, []))
+    
+    def find(self, locator: tuple) -> Optional[SnapshotElement]:
+        """
+        Busca el primer elemento que coincide con un localizador.
+        
+        Args:
+            locator: Tupla con el tipo y valor del localizador
+        
+        Returns:
+            SnapshotElement: Elemento encontrado o None
+        """
+        matches = self.find_all(locator)
+        return matches[0] if matches else None
+    
+    def resolve(self, locators: Iterable[tuple]) -> Dict[tuple, Optional[SnapshotElement]]:
+        """
+        Resuelve varios localizadores en una sola pasada.
+        
+        Args:
+            locators: Localizadores a resolver
+        
+        Returns:
+            Dict: Elemento encontrado (o None) por localizador
+        """
+        return {tuple(locator): self.find(locator) for locator in locators}
+    
+    def __contains__(self, locator: tuple) -> bool:
+        return self.find(locator) is not None
+    
+    def __len__(self) -> int:
+        return len(self.elements)
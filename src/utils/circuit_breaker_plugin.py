@@ -0,0 +1,83 @@
+"""
+Plugin de pytest con los cambios de estado del circuit breaker de WinAppDriver.
+
+Lleva las transiciones de src.drivers.circuit_breaker al resumen del
+terminal, a pytest-html y a circuit_breaker.json en METRICS_DIR, también
+desde los workers de pytest-xdist. Vive fuera de src/drivers para que los
+drivers no dependan de pytest.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+import pytest
+from src.drivers.circuit_breaker import BreakerRegistry, session_breakers, write_report
+
+
+USER_PROPERTY = "circuit_breaker"
+
+
+class CircuitBreakerPlugin:
+    """
+    Plugin de pytest que lleva los cambios de estado del circuito al reporte.
+    
+    Los cambios viajan en report.user_properties, así que con pytest-xdist
+    los reúne el proceso principal.
+    """
+    
+    def __init__(self, breakers: Optional[BreakerRegistry] = None):
+        """
+        Inicializa el plugin.
+        
+        Args:
+            breakers: Circuitos a vigilar (por defecto, los del proceso)
+        """
+        self.breakers = breakers or session_breakers
+        self.transitions: List[Dict[str, Any]] = []
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Adjunta al reporte de cada fase los cambios de estado ocurridos en ella."""
+        outcome = yield
+        transitions = self.breakers.drain()
+        if transitions:
+            outcome.get_result().user_properties.append((USER_PROPERTY, transitions))
+    
+    def pytest_runtest_logreport(self, report):
+        """Recoge los cambios de estado (con pytest-xdist, también los de los workers)."""
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.transitions.extend(value)
+    
+    def pytest_sessionfinish(self, session):
+        """Escribe el historial del circuito en el proceso principal."""
+        if not hasattr(session.config, "workerinput"):
+            self.transitions.extend(self.breakers.drain())
+            self.transitions.sort(key=lambda transition: transition["ts"])
+            if self.transitions:
+                write_report(self.transitions)
+    
+    def summary_lines(self) -> List[str]:
+        """Líneas del resumen: un cambio de estado por línea."""
+        return [
+            f"{time.strftime('%H:%M:%S', time.localtime(transition['ts']))} {transition['worker']} "
+            f"{transition.get('endpoint', '')}: {transition['from']} -> {transition['to']} "
+            f"({transition['reason']})"
+            for transition in self.transitions
+        ]
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Muestra los cambios de estado del circuito."""
+        if not self.transitions:
+            return
+        terminalreporter.write_sep("-", "circuit breaker de WinAppDriver")
+        for line in self.summary_lines():
+            terminalreporter.write_line(line)
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix):
+        """Añade los cambios de estado del circuito al resumen de pytest-html."""
+        if not self.transitions:
+            return
+        from html import escape
+        items = "".join(f"<li>{escape(line)}</li>" for line in self.summary_lines())
+        prefix.append(f"<p>Circuit breaker de WinAppDriver:</p><ul>{items}</ul>")
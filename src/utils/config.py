@@ -6,7 +6,7 @@ ejecutar las pruebas automatizadas.
 """
 
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 from pathlib import Path
 
 
@@ -23,6 +23,22 @@ class Config:
         """Carga variables de entorno si existen."""
         # Configuración de WinAppDriver
         self.WINAPPDRIVER_URL = os.getenv('WINAPPDRIVER_URL', 'http://127.0.0.1:4723')
+        # Grid de varios WinAppDriver: 'url=capacidad,url=capacidad' (vacío: solo WINAPPDRIVER_URL)
+        self.WINAPPDRIVER_URLS = os.getenv('WINAPPDRIVER_URLS', '')
+        self.GRID_PROBE_INTERVAL = float(os.getenv('GRID_PROBE_INTERVAL', '10'))
+        self.GRID_PROBE_TIMEOUT = float(os.getenv('GRID_PROBE_TIMEOUT', '2'))
+        self.GRID_FAILURE_THRESHOLD = int(os.getenv('GRID_FAILURE_THRESHOLD', '2'))
+        self.GRID_QUARANTINE_SECONDS = float(os.getenv('GRID_QUARANTINE_SECONDS', '60'))
+        # Circuit breaker: tras N fallos de conexión seguidos, las sesiones fallan al instante
+        self.CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'True').lower() == 'true'
+        self.CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '3'))
+        self.CIRCUIT_BREAKER_COOLDOWN = float(os.getenv('CIRCUIT_BREAKER_COOLDOWN', '30'))
+        
+        # Validación del entorno al iniciar la sesión (pre-flight)
+        self.PREFLIGHT_ENABLED = os.getenv('PREFLIGHT_ENABLED', 'False').lower() == 'true'
+        self.PREFLIGHT_TIMEOUT = float(os.getenv('PREFLIGHT_TIMEOUT', '2'))
+        self.PREFLIGHT_SAMPLES = int(os.getenv('PREFLIGHT_SAMPLES', '3'))
+        self.PREFLIGHT_MIN_FREE_MB = int(os.getenv('PREFLIGHT_MIN_FREE_MB', '500'))
         
         # Configuración de la aplicación
         self.APP_PATH = os.getenv('APP_PATH', r'C:\Path\To\Your\WPF\Application.exe')
@@ -36,18 +52,156 @@ class Config:
         self.REPORTS_DIR = os.getenv('REPORTS_DIR', str(Path(__file__).parent.parent.parent / 'reports'))
         self.SCREENSHOTS_DIR = os.getenv('SCREENSHOTS_DIR', os.path.join(self.REPORTS_DIR, 'screenshots'))
         
+        # Configuración de la escritura de capturas en segundo plano
+        self.SCREENSHOT_ASYNC = os.getenv('SCREENSHOT_ASYNC', 'False').lower() == 'true'
+        self.SCREENSHOT_QUEUE_SIZE = int(os.getenv('SCREENSHOT_QUEUE_SIZE', '32'))
+        self.SCREENSHOT_DEDUP = os.getenv('SCREENSHOT_DEDUP', 'False').lower() == 'true'
+        self.REPORT_THUMBNAIL_SIZE = int(os.getenv('REPORT_THUMBNAIL_SIZE', '480'))
+        
+        # Política de capturas de fallo
+        self.SCREENSHOT_TEST_BUDGET = int(os.getenv('SCREENSHOT_TEST_BUDGET', '3'))
+        self.SCREENSHOT_SESSION_BUDGET = int(os.getenv('SCREENSHOT_SESSION_BUDGET', '200'))
+        self.SCREENSHOT_SKIP_UNCHANGED = os.getenv('SCREENSHOT_SKIP_UNCHANGED', 'True').lower() == 'true'
+        
         # Configuración de logs
         self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
         self.LOG_FILE = os.getenv('LOG_FILE', os.path.join(self.REPORTS_DIR, 'automation.log'))
+        self.LOG_ASYNC = os.getenv('LOG_ASYNC', 'True').lower() == 'true'
+        
+        # Traza estructurada (JSONL junto a LOG_FILE, rotada y comprimida con gzip)
+        self.TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'False').lower() == 'true'
+        self.TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', str(50 * 1024 * 1024)))
+        self.TRACE_BACKUP_COUNT = int(os.getenv('TRACE_BACKUP_COUNT', '10'))
+        
+        # Histogramas de latencia de los comandos del driver
+        self.METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+        self.METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(self.REPORTS_DIR, 'metrics'))
+        
+        # Desglose del tiempo de cada prueba (driver, comandos, esperas, sleep, capturas)
+        self.TIME_BREAKDOWN_ENABLED = os.getenv('TIME_BREAKDOWN_ENABLED', 'False').lower() == 'true'
+        self.TIME_BREAKDOWN_TOP = int(os.getenv('TIME_BREAKDOWN_TOP', '10'))
+        
+        # Línea de tiempo de Chrome/Perfetto generada a partir de la traza
+        self.TIMELINE_ENABLED = os.getenv('TIMELINE_ENABLED', 'False').lower() == 'true'
+        self.TIMELINE_FILE = os.getenv('TIMELINE_FILE', os.path.join(self.REPORTS_DIR, 'timeline.json'))
+        
+        # Logs y capturas separados por worker de pytest-xdist
+        self.WORKER_SHARDING = os.getenv('WORKER_SHARDING', 'True').lower() == 'true'
+        
+        # Reparto de las pruebas entre workers según su duración histórica
+        self.DURATION_SCHEDULING = os.getenv('DURATION_SCHEDULING', 'False').lower() == 'true'
+        self.DURATIONS_FILE = os.getenv('DURATIONS_FILE', '.test_durations.json')
+        self.SHARD_MANIFEST_DIR = os.getenv('SHARD_MANIFEST_DIR', os.path.join(self.REPORTS_DIR, 'shards'))
+        self.SHARD_SPLIT_FIXTURES = os.getenv('SHARD_SPLIT_FIXTURES', 'app_config,test_data,worker_id')
         
         # Configuración de pruebas
         self.HEADLESS = os.getenv('HEADLESS', 'False').lower() == 'true'
         self.RETRY_COUNT = int(os.getenv('RETRY_COUNT', '3'))
         
+        # Configuración del sondeo de las esperas explícitas
+        self.POLL_STRATEGY = os.getenv('POLL_STRATEGY', 'fixed').lower()
+        self.POLL_INTERVAL = float(os.getenv('POLL_INTERVAL', '0.5'))
+        self.POLL_INITIAL_INTERVAL = float(os.getenv('POLL_INITIAL_INTERVAL', '0.05'))
+        self.POLL_BACKOFF_FACTOR = float(os.getenv('POLL_BACKOFF_FACTOR', '2'))
+        self.POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '1'))
+        self.POLL_BURST_COUNT = int(os.getenv('POLL_BURST_COUNT', '5'))
+        
+        # Configuración de la caché de elementos de los Page Objects
+        self.ELEMENT_CACHE_ENABLED = os.getenv('ELEMENT_CACHE_ENABLED', 'False').lower() == 'true'
+        
+        # Configuración del WinAppDriver simulado (ejecución sin Windows)
+        self.FAKE_WINAPPDRIVER = os.getenv('FAKE_WINAPPDRIVER', 'False').lower() == 'true'
+        self.FAKE_WINAPPDRIVER_FIXTURE = os.getenv('FAKE_WINAPPDRIVER_FIXTURE', '')
+        self.FAKE_WINAPPDRIVER_LATENCY = float(os.getenv('FAKE_WINAPPDRIVER_LATENCY', '0'))
+        self.FAKE_WINAPPDRIVER_JITTER = float(os.getenv('FAKE_WINAPPDRIVER_JITTER', '0'))
+        
+        # Configuración del pool de sesiones
+        self.SESSION_POOL_ENABLED = os.getenv('SESSION_POOL_ENABLED', 'False').lower() == 'true'
+        self.SESSION_POOL_SIZE = int(os.getenv('SESSION_POOL_SIZE', '1'))
+        self.SESSION_POOL_MAX_USES = int(os.getenv('SESSION_POOL_MAX_USES', '20'))
+        
+        # Configuración del transporte HTTP con WinAppDriver
+        self.TRANSPORT_POOL_SIZE = int(os.getenv('TRANSPORT_POOL_SIZE', '4'))
+        self.TRANSPORT_KEEP_ALIVE = os.getenv('TRANSPORT_KEEP_ALIVE', 'True').lower() == 'true'
+        self.TRANSPORT_CONNECT_TIMEOUT = float(os.getenv('TRANSPORT_CONNECT_TIMEOUT', '5'))
+        self.TRANSPORT_CONNECT_RETRIES = int(os.getenv('TRANSPORT_CONNECT_RETRIES', '2'))
+        self.TRANSPORT_READ_TIMEOUT = float(os.getenv('TRANSPORT_READ_TIMEOUT', '30'))
+        self.TRANSPORT_SESSION_TIMEOUT = float(os.getenv('TRANSPORT_SESSION_TIMEOUT', '120'))
+        self.TRANSPORT_FIND_TIMEOUT = float(os.getenv('TRANSPORT_FIND_TIMEOUT', '30'))
+        self.TRANSPORT_SOURCE_TIMEOUT = float(os.getenv('TRANSPORT_SOURCE_TIMEOUT', '60'))
+        self.TRANSPORT_GZIP = os.getenv('TRANSPORT_GZIP', 'False').lower() == 'true'
+        
+        # Configuración del cliente asíncrono
+        self.ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_MAX_CONNECTIONS', '10'))
+    
     def get_winappdriver_url(self) -> str:
         """Obtiene la URL de WinAppDriver."""
         return self.WINAPPDRIVER_URL
     
+    def get_winappdriver_urls(self) -> List[Tuple[str, int]]:
+        """
+        Obtiene los nodos del grid de WinAppDriver.
+        
+        Returns:
+            List[Tuple[str, int]]: Pares (URL, capacidad) de WINAPPDRIVER_URLS
+            (capacidad 1 si no se indica); vacía si no hay grid
+        """
+        nodes = []
+        for entry in self.WINAPPDRIVER_URLS.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            url, _, capacity = entry.rpartition("=")
+            if url and capacity.strip().isdigit():
+                nodes.append((url.strip(), int(capacity)))
+            else:
+                nodes.append((entry, 1))
+        return nodes
+    
+    def get_grid_probe_interval(self) -> float:
+        """Obtiene los segundos entre sondeos de salud de los nodos del grid."""
+        return self.GRID_PROBE_INTERVAL
+    
+    def get_grid_probe_timeout(self) -> float:
+        """Obtiene el timeout de cada sondeo de salud del grid."""
+        return self.GRID_PROBE_TIMEOUT
+    
+    def get_grid_failure_threshold(self) -> int:
+        """Obtiene los fallos seguidos que ponen un nodo del grid en cuarentena."""
+        return self.GRID_FAILURE_THRESHOLD
+    
+    def get_grid_quarantine_seconds(self) -> float:
+        """Obtiene la duración de la cuarentena de un nodo del grid."""
+        return self.GRID_QUARANTINE_SECONDS
+    
+    def is_circuit_breaker_enabled(self) -> bool:
+        """Verifica si el circuit breaker de la creación de sesiones está activo."""
+        return self.CIRCUIT_BREAKER_ENABLED
+    
+    def get_circuit_breaker_threshold(self) -> int:
+        """Obtiene los fallos de conexión seguidos que abren el circuito."""
+        return self.CIRCUIT_BREAKER_THRESHOLD
+    
+    def get_circuit_breaker_cooldown(self) -> float:
+        """Obtiene los segundos que el circuito permanece abierto antes de sondear."""
+        return self.CIRCUIT_BREAKER_COOLDOWN
+    
+    def is_preflight_enabled(self) -> bool:
+        """Verifica si se valida el entorno al iniciar la sesión de pruebas."""
+        return self.PREFLIGHT_ENABLED
+    
+    def get_preflight_timeout(self) -> float:
+        """Obtiene el tiempo máximo de la validación del entorno."""
+        return self.PREFLIGHT_TIMEOUT
+    
+    def get_preflight_samples(self) -> int:
+        """Obtiene las peticiones a /status con las que se mide la latencia de referencia."""
+        return self.PREFLIGHT_SAMPLES
+    
+    def get_preflight_min_free_mb(self) -> int:
+        """Obtiene el espacio libre mínimo en disco (MB) para los reportes."""
+        return self.PREFLIGHT_MIN_FREE_MB
+    
     def get_app_path(self) -> str:
         """Obtiene la ruta de la aplicación WPF."""
         return self.APP_PATH
@@ -72,17 +226,155 @@ class Config:
         """Obtiene el directorio de reportes."""
         return self.REPORTS_DIR
     
-    def get_screenshots_dir(self) -> str:
-        """Obtiene el directorio de screenshots."""
-        return self.SCREENSHOTS_DIR
+    def get_screenshots_dir(self, worker_id: Optional[str] = None) -> str:
+        """
+        Obtiene el directorio de screenshots.
+        
+        En los workers de pytest-xdist es un subdirectorio por worker
+        (SCREENSHOTS_DIR/gw0, ...) para las capturas sin deduplicar; el
+        almacén deduplicado usa siempre el directorio base.
+        
+        Args:
+            worker_id: Worker cuyo directorio obtener (por defecto, el del
+                proceso actual; '' para el directorio base)
+        """
+        worker_id = self.get_worker_id() if worker_id is None else worker_id
+        return os.path.join(self.SCREENSHOTS_DIR, worker_id) if worker_id else self.SCREENSHOTS_DIR
+    
+    def is_screenshot_async_enabled(self) -> bool:
+        """Verifica si las capturas se escriben en segundo plano."""
+        return self.SCREENSHOT_ASYNC
+    
+    def get_screenshot_queue_size(self) -> int:
+        """Obtiene el número máximo de capturas pendientes de escribir."""
+        return self.SCREENSHOT_QUEUE_SIZE
+    
+    def is_screenshot_dedup_enabled(self) -> bool:
+        """Verifica si las capturas se guardan deduplicadas por contenido."""
+        return self.SCREENSHOT_DEDUP
+    
+    def get_report_thumbnail_size(self) -> int:
+        """Obtiene el lado máximo de las miniaturas del reporte HTML (0 para desactivarlas)."""
+        return self.REPORT_THUMBNAIL_SIZE
+    
+    def get_screenshot_test_budget(self) -> int:
+        """Obtiene el máximo de capturas de fallo por prueba (0 sin límite)."""
+        return self.SCREENSHOT_TEST_BUDGET
+    
+    def get_screenshot_session_budget(self) -> int:
+        """Obtiene el máximo de capturas de fallo por sesión (0 sin límite)."""
+        return self.SCREENSHOT_SESSION_BUDGET
+    
+    def is_screenshot_skip_unchanged_enabled(self) -> bool:
+        """Verifica si se omiten las capturas de fallo de una pantalla sin cambios."""
+        return self.SCREENSHOT_SKIP_UNCHANGED
     
     def get_log_level(self) -> str:
         """Obtiene el nivel de log."""
         return self.LOG_LEVEL
     
-    def get_log_file(self) -> str:
-        """Obtiene el archivo de log."""
-        return self.LOG_FILE
+    def get_log_file(self, worker_id: Optional[str] = None) -> str:
+        """
+        Obtiene el archivo de log.
+        
+        En los workers de pytest-xdist cada worker escribe en su propio
+        archivo (automation.gw0.log, ...).
+        
+        Args:
+            worker_id: Worker cuyo archivo obtener (por defecto, el del proceso
+                actual; '' para el archivo base)
+        """
+        worker_id = self.get_worker_id() if worker_id is None else worker_id
+        if not worker_id:
+            return self.LOG_FILE
+        root, extension = os.path.splitext(self.LOG_FILE)
+        return f"{root}.{worker_id}{extension}"
+    
+    def is_log_async_enabled(self) -> bool:
+        """Verifica si los logs se escriben desde un hilo en segundo plano."""
+        return self.LOG_ASYNC
+    
+    def is_trace_enabled(self) -> bool:
+        """Verifica si se escribe la traza estructurada."""
+        return self.TRACE_ENABLED
+    
+    def get_trace_file(self, worker_id: Optional[str] = None) -> str:
+        """
+        Obtiene el archivo de la traza estructurada (junto al archivo de log).
+        
+        Args:
+            worker_id: Worker cuyo archivo obtener (por defecto, el del proceso actual)
+        """
+        root, _ = os.path.splitext(self.get_log_file(worker_id))
+        return f"{root}.trace.jsonl"
+    
+    def get_trace_max_bytes(self) -> int:
+        """Obtiene el tamaño a partir del cual rota la traza."""
+        return self.TRACE_MAX_BYTES
+    
+    def get_trace_backup_count(self) -> int:
+        """Obtiene el número de rotaciones comprimidas de la traza a conservar."""
+        return self.TRACE_BACKUP_COUNT
+    
+    def is_metrics_enabled(self) -> bool:
+        """Verifica si se registran los histogramas de latencia de los comandos."""
+        return self.METRICS_ENABLED
+    
+    def get_metrics_dir(self) -> str:
+        """Obtiene el directorio donde se vuelcan las métricas."""
+        return self.METRICS_DIR
+    
+    def is_time_breakdown_enabled(self) -> bool:
+        """Verifica si se calcula el desglose de tiempo de cada prueba."""
+        return self.TIME_BREAKDOWN_ENABLED
+    
+    def get_time_breakdown_top(self) -> int:
+        """Obtiene cuántas pruebas se muestran en el resumen de tiempo perdido."""
+        return self.TIME_BREAKDOWN_TOP
+    
+    def is_timeline_enabled(self) -> bool:
+        """Verifica si se exporta la línea de tiempo al terminar la ejecución."""
+        return self.TIMELINE_ENABLED and self.TRACE_ENABLED
+    
+    def get_timeline_file(self) -> str:
+        """Obtiene el archivo de la línea de tiempo de Chrome/Perfetto."""
+        return self.TIMELINE_FILE
+    
+    def is_duration_scheduling_enabled(self) -> bool:
+        """Verifica si pytest-xdist reparte las pruebas según su duración histórica."""
+        return self.DURATION_SCHEDULING
+    
+    def get_durations_file(self, root: Optional[str] = None) -> str:
+        """
+        Obtiene el archivo con el historial de duración de las pruebas.
+        
+        Args:
+            root: Directorio respecto al que se resuelve una ruta relativa (el
+                rootdir de pytest, para que no dependa del directorio de trabajo)
+        """
+        if root and not os.path.isabs(self.DURATIONS_FILE):
+            return os.path.join(root, self.DURATIONS_FILE)
+        return self.DURATIONS_FILE
+    
+    def get_shard_manifest_dir(self) -> str:
+        """Obtiene el directorio de los manifiestos de --shard."""
+        return self.SHARD_MANIFEST_DIR
+    
+    def get_shard_split_fixtures(self) -> List[str]:
+        """Obtiene los fixtures de sesión que no obligan a ejecutar sus pruebas en el mismo fragmento."""
+        return [name.strip() for name in self.SHARD_SPLIT_FIXTURES.split(",") if name.strip()]
+    
+    def get_worker_id(self) -> str:
+        """
+        Obtiene el id del worker de pytest-xdist del proceso actual.
+        
+        Returns:
+            str: Id del worker (gw0, gw1, ...), o '' en el proceso principal o
+            con WORKER_SHARDING desactivado
+        """
+        if not self.WORKER_SHARDING:
+            return ''
+        return os.getenv('PYTEST_XDIST_WORKER', '')
     
     def is_headless(self) -> bool:
         """Verifica si se ejecuta en modo headless."""
@@ -92,6 +384,102 @@ class Config:
         """Obtiene el número de reintentos."""
         return self.RETRY_COUNT
     
+    def get_poll_strategy(self) -> str:
+        """Obtiene la estrategia de sondeo de las esperas (fixed, exponential o burst)."""
+        return self.POLL_STRATEGY
+    
+    def get_poll_interval(self) -> float:
+        """Obtiene el intervalo de sondeo fijo en segundos."""
+        return self.POLL_INTERVAL
+    
+    def get_poll_initial_interval(self) -> float:
+        """Obtiene el primer intervalo de sondeo de las estrategias exponential y burst."""
+        return self.POLL_INITIAL_INTERVAL
+    
+    def get_poll_backoff_factor(self) -> float:
+        """Obtiene el multiplicador del intervalo en la estrategia exponential."""
+        return self.POLL_BACKOFF_FACTOR
+    
+    def get_poll_max_interval(self) -> float:
+        """Obtiene el intervalo máximo de la estrategia exponential."""
+        return self.POLL_MAX_INTERVAL
+    
+    def get_poll_burst_count(self) -> int:
+        """Obtiene el número de sondeos rápidos de la estrategia burst."""
+        return self.POLL_BURST_COUNT
+    
+    def is_element_cache_enabled(self) -> bool:
+        """Verifica si los Page Objects cachean los elementos por localizador."""
+        return self.ELEMENT_CACHE_ENABLED
+    
+    def is_fake_winappdriver_enabled(self) -> bool:
+        """Verifica si las pruebas usan el WinAppDriver simulado."""
+        return self.FAKE_WINAPPDRIVER
+    
+    def get_fake_winappdriver_fixture(self) -> Optional[str]:
+        """Obtiene el fixture del árbol de interfaz simulado (None para el de ejemplo)."""
+        return self.FAKE_WINAPPDRIVER_FIXTURE or None
+    
+    def get_fake_winappdriver_latency(self) -> float:
+        """Obtiene la latencia simulada por comando en segundos."""
+        return self.FAKE_WINAPPDRIVER_LATENCY
+    
+    def get_fake_winappdriver_jitter(self) -> float:
+        """Obtiene la variación máxima de latencia simulada en segundos."""
+        return self.FAKE_WINAPPDRIVER_JITTER
+    
+    def is_session_pool_enabled(self) -> bool:
+        """Verifica si el fixture driver usa el pool de sesiones."""
+        return self.SESSION_POOL_ENABLED
+    
+    def get_session_pool_size(self) -> int:
+        """Obtiene el número máximo de sesiones del pool."""
+        return self.SESSION_POOL_SIZE
+    
+    def get_session_pool_max_uses(self) -> int:
+        """Obtiene el número máximo de usos de una sesión antes de reciclarla."""
+        return self.SESSION_POOL_MAX_USES
+    
+    def get_transport_pool_size(self) -> int:
+        """Obtiene el número de conexiones keep-alive por endpoint."""
+        return self.TRANSPORT_POOL_SIZE
+    
+    def is_transport_keep_alive_enabled(self) -> bool:
+        """Verifica si se reutilizan las conexiones HTTP entre comandos."""
+        return self.TRANSPORT_KEEP_ALIVE
+    
+    def get_transport_connect_timeout(self) -> float:
+        """Obtiene el timeout de conexión con WinAppDriver en segundos."""
+        return self.TRANSPORT_CONNECT_TIMEOUT
+    
+    def get_transport_connect_retries(self) -> int:
+        """Obtiene los reintentos ante fallos de conexión."""
+        return self.TRANSPORT_CONNECT_RETRIES
+    
+    def get_transport_read_timeout(self) -> float:
+        """Obtiene el timeout de lectura por defecto de los comandos."""
+        return self.TRANSPORT_READ_TIMEOUT
+    
+    def get_transport_session_timeout(self) -> float:
+        """Obtiene el timeout de lectura de creación/cierre de sesión y reinicio de la app."""
+        return self.TRANSPORT_SESSION_TIMEOUT
+    
+    def get_transport_find_timeout(self) -> float:
+        """Obtiene el timeout de lectura de las búsquedas (se suma al wait implícito)."""
+        return self.TRANSPORT_FIND_TIMEOUT
+    
+    def get_transport_source_timeout(self) -> float:
+        """Obtiene el timeout de lectura de page_source y capturas de pantalla."""
+        return self.TRANSPORT_SOURCE_TIMEOUT
+    
+    def is_transport_gzip_enabled(self) -> bool:
+        """Verifica si se piden page_source y capturas comprimidas con gzip."""
+        return self.TRANSPORT_GZIP
+    
+    def get_async_max_connections(self) -> int:
+        """Obtiene el número máximo de conexiones del pool del cliente asíncrono."""
+        return self.ASYNC_MAX_CONNECTIONS
+    
     def create_directories(self) -> None:
         """Crea los directorios necesarios si no existen."""
         os.makedirs(self.REPORTS_DIR, exist_ok=True)
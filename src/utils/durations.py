@@ -0,0 +1,395 @@
+"""
+Reparto de las pruebas entre workers de pytest-xdist según su duración.
+
+El reparto por defecto de xdist ignora el coste de cada prueba: unas pocas
+pruebas lentas (las que lanzan la aplicación) pueden acabar en el mismo
+worker y marcar la duración total. Este módulo guarda un historial local de
+la duración de cada prueba (DURATIONS_FILE) y reparte la colección con
+LPT (la prueba más larga primero, al worker menos cargado). Las pruebas sin
+historial se estiman con la mediana de su módulo o de todo el historial.
+
+El planificador parte del de robo de trabajo de xdist, así que si una
+predicción falla los workers que se quedan sin pruebas siguen robando las
+más cortas del final de las colas. Al terminar se muestra el makespan
+(tiempo de ejecución del worker más cargado) predicho frente al real.
+
+Con el mismo historial se reparte la suite entre varias máquinas de CI
+(--shard=i/n): plan_shards() agrupa las pruebas que comparten un fixture de
+sesión y reparte los grupos con LPT de forma determinista, y cada máquina
+escribe el manifiesto de su fragmento. Las ejecuciones con --shard solo leen
+el historial: si cada agente guardara el suyo, los historiales divergirían
+y cada agente calcularía un plan distinto (pruebas repetidas u omitidas).
+"""
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import pytest
+from xdist.scheduler import WorkStealingScheduling
+from src.utils.config import config
+
+
+# Duración estimada de una prueba sin historial ni referencias
+DEFAULT_DURATION = 1.0
+
+# Peso de la última ejecución en la media móvil de cada prueba
+HISTORY_WEIGHT = 0.5
+
+
+class DurationHistory:
+    """
+    Historial de la duración (setup + call + teardown) de cada prueba.
+    """
+    
+    def __init__(self, durations: Optional[Dict[str, float]] = None, path: Optional[str] = None):
+        """
+        Inicializa el historial.
+        
+        Args:
+            durations: Segundos por nodeid de prueba
+            path: Archivo del historial (por defecto, DURATIONS_FILE)
+        """
+        self.durations: Dict[str, float] = dict(durations or {})
+        self.path = path or config.get_durations_file()
+    
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "DurationHistory":
+        """
+        Carga el historial desde disco (vacío si no existe o está dañado).
+        
+        Args:
+            path: Archivo del historial (por defecto, DURATIONS_FILE)
+        
+        Returns:
+            DurationHistory: Historial cargado
+        """
+        path = path or config.get_durations_file()
+        try:
+            with open(path, encoding="utf-8") as history_file:
+                durations = json.load(history_file)
+        except (OSError, ValueError):
+            durations = {}
+        return cls(durations if isinstance(durations, dict) else {}, path)
+    
+    def record(self, nodeid: str, seconds: float) -> None:
+        """
+        Registra la duración de una ejecución (media móvil exponencial).
+        
+        Args:
+            nodeid: Id de la prueba
+            seconds: Duración total de la prueba
+        """
+        previous = self.durations.get(nodeid)
+        if previous is not None:
+            seconds = HISTORY_WEIGHT * seconds + (1 - HISTORY_WEIGHT) * previous
+        self.durations[nodeid] = round(seconds, 4)
+    
+    def predict(self, nodeids: Iterable[str]) -> Tuple[Dict[str, float], int]:
+        """
+        Estima la duración de cada prueba.
+        
+        Args:
+            nodeids: Ids de las pruebas
+        
+        Returns:
+            Tuple: Segundos estimados por nodeid y número de pruebas sin historial
+        """
+        by_module: Dict[str, List[float]] = defaultdict(list)
+        for nodeid, seconds in self.durations.items():
+            by_module[_module(nodeid)].append(seconds)
+        fallback = statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+        
+        predictions: Dict[str, float] = {}
+        unseen = 0
+        for nodeid in nodeids:
+            seconds = self.durations.get(nodeid)
+            if seconds is None:
+                unseen += 1
+                module = by_module.get(_module(nodeid))
+                seconds = statistics.median(module) if module else fallback
+            predictions[nodeid] = seconds
+        return predictions, unseen
+    
+    def save(self) -> None:
+        """Escribe el historial (de forma atómica)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as history_file:
+            json.dump(dict(sorted(self.durations.items())), history_file, indent=1)
+        os.replace(temp_path, self.path)
+
+
+def _module(nodeid: str) -> str:
+    """Archivo de una prueba a partir de su nodeid."""
+    return nodeid.split("::", 1)[0]
+
+
+def lpt_assign(costs: Sequence[float], bins: int) -> Tuple[List[List[int]], List[float]]:
+    """
+    Reparte tareas entre contenedores con LPT (la más larga primero).
+    
+    Args:
+        costs: Coste de cada tarea
+        bins: Número de contenedores
+    
+    Returns:
+        Tuple: Índices de las tareas de cada contenedor (de la más larga a la
+        más corta) y carga total de cada contenedor
+    """
+    assignments: List[List[int]] = [[] for _ in range(bins)]
+    loads = [0.0] * bins
+    heap = [(0.0, index) for index in range(bins)]
+    for task in sorted(range(len(costs)), key=lambda task: costs[task], reverse=True):
+        load, index = heapq.heappop(heap)
+        assignments[index].append(task)
+        loads[index] = load + costs[task]
+        heapq.heappush(heap, (loads[index], index))
+    return assignments, loads
+
+
+class DurationScheduling(WorkStealingScheduling):
+    """
+    Planificador de xdist que reparte la colección con LPT.
+    
+    Solo cambia el reparto inicial del planificador de robo de trabajo: cada
+    worker recibe su cola ordenada de la prueba más larga a la más corta, de
+    modo que los robos (que se llevan el final de la cola) mueven pruebas
+    cortas.
+    """
+    
+    def __init__(self, config: pytest.Config, log=None, history: Optional[DurationHistory] = None):
+        """
+        Inicializa el planificador.
+        
+        Args:
+            config: Configuración de pytest
+            log: Logger de xdist
+            history: Historial de duraciones (por defecto, el de DURATIONS_FILE)
+        """
+        super().__init__(config, log)
+        self.history = history or DurationHistory.load()
+        self.predicted: Dict[str, float] = {}
+        self.unseen = 0
+    
+    def schedule(self) -> None:
+        """Reparte la colección entre los workers según la duración estimada."""
+        assert self.collection_is_completed
+        if self.collection is not None:
+            self.check_schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        predictions, self.unseen = self.history.predict(self.collection)
+        nodes = [node for node in self.nodes if not node.shutting_down]
+        assignments, loads = lpt_assign([predictions[nodeid] for nodeid in self.collection], len(nodes))
+        for node, indices, load in zip(nodes, assignments, loads):
+            self.predicted[node.gateway.id] = load
+            if indices:
+                self.node2pending[node].extend(indices)
+                node.send_runtest_some(indices)
+        self.check_schedule()
+
+
+class DurationSchedulingPlugin:
+    """
+    Plugin de pytest que mantiene el historial y planifica xdist por duración.
+    
+    Se registra en el proceso principal desde tests/conftest.py si
+    DURATION_SCHEDULING está activo; solo sustituye el reparto de '--dist load'
+    (el modo por defecto de '-n').
+    """
+    
+    def __init__(self, history: Optional[DurationHistory] = None, save_history: bool = True):
+        """
+        Inicializa el plugin.
+        
+        Args:
+            history: Historial de duraciones (por defecto, el de DURATIONS_FILE)
+            save_history: Si guardar el historial actualizado al terminar (no
+                con --shard, que debe usar el mismo historial en todos los agentes)
+        """
+        self.history = history or DurationHistory.load()
+        self.save_history = save_history
+        self.scheduler: Optional[DurationScheduling] = None
+        self.busy: Dict[str, float] = defaultdict(float)
+        self._elapsed: Dict[str, float] = defaultdict(float)
+    
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """Sustituye el planificador de '--dist load'."""
+        if config.getvalue("dist") != "load":
+            return None
+        self.scheduler = DurationScheduling(config, log, self.history)
+        return self.scheduler
+    
+    def pytest_runtest_logreport(self, report):
+        """Acumula la duración de cada prueba y el tiempo ocupado de cada worker."""
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "master"
+        self.busy[worker] += report.duration
+        self._elapsed[report.nodeid] += report.duration
+        if report.when == "teardown":
+            self.history.record(report.nodeid, self._elapsed.pop(report.nodeid))
+    
+    def pytest_sessionfinish(self, session):
+        """Guarda el historial actualizado."""
+        if not self.save_history:
+            return
+        try:
+            self.history.save()
+        except OSError as e:
+            session.config.get_terminal_writer().line(
+                f"No se pudo guardar el historial de duraciones: {str(e)}"
+            )
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Muestra el makespan predicho frente al real de cada worker."""
+        if self.scheduler is None or not self.scheduler.predicted:
+            return
+        predicted = self.scheduler.predicted
+        terminalreporter.write_sep("-", "planificación por duración")
+        for worker in sorted(predicted):
+            terminalreporter.write_line(
+                f"{worker:<8} predicho {predicted[worker]:>8.2f}s  real {self.busy.get(worker, 0.0):>8.2f}s"
+            )
+        actual = max((self.busy[worker] for worker in predicted), default=0.0)
+        terminalreporter.write_line(
+            f"makespan predicho {max(predicted.values()):.2f}s, real {actual:.2f}s "
+            f"({self.scheduler.unseen} pruebas sin historial)"
+        )
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Interpreta el valor de --shard.
+    
+    Args:
+        value: Fragmento 'i/n', con i entre 1 y n
+    
+    Returns:
+        Tuple[int, int]: Índice (desde 1) y número de fragmentos
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"formato de fragmento inválido: '{value}' (se espera i/n)")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"fragmento fuera de rango: '{value}' (1 <= i <= n)")
+    return index, count
+
+
+def shard_groups(items: Sequence[pytest.Item], split_fixtures: Iterable[str] = ()) -> List[List[pytest.Item]]:
+    """
+    Agrupa las pruebas que comparten un fixture de sesión del proyecto.
+    
+    Dos pruebas que usan (directa o indirectamente) el mismo fixture con
+    scope='session' definido en un conftest o módulo de pruebas quedan en el
+    mismo grupo, y los grupos se unen de forma transitiva. Los fixtures de
+    plugins y los de split_fixtures (baratos de preparar en cada máquina) no
+    agrupan. Los fixtures pedidos con request.getfixturevalue() no se ven.
+    
+    Args:
+        items: Pruebas recogidas, en orden de colección
+        split_fixtures: Fixtures de sesión que no obligan a agrupar
+    
+    Returns:
+        List[List[pytest.Item]]: Grupos en orden de colección
+    """
+    split = set(split_fixtures)
+    parent = list(range(len(items)))
+    
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+    
+    owner: Dict[str, int] = {}
+    for position, item in enumerate(items):
+        fixture_info = getattr(item, "_fixtureinfo", None)
+        for name, fixturedefs in (fixture_info.name2fixturedefs.items() if fixture_info else ()):
+            fixturedef = fixturedefs[-1]
+            if fixturedef.scope != "session" or not fixturedef.baseid or name in split:
+                continue
+            if name in owner:
+                parent[find(position)] = find(owner[name])
+            else:
+                owner[name] = position
+    
+    groups: Dict[int, List[pytest.Item]] = {}
+    for position, item in enumerate(items):
+        groups.setdefault(find(position), []).append(item)
+    return list(groups.values())
+
+
+def plan_shards(items: Sequence[pytest.Item], count: int, history: Optional[DurationHistory] = None,
+                split_fixtures: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Reparte las pruebas entre n fragmentos equilibrados por duración.
+    
+    El reparto es determinista: con la misma colección y el mismo historial
+    todas las máquinas calculan el mismo plan (los empates se resuelven por
+    orden de colección).
+    
+    Args:
+        items: Pruebas recogidas
+        count: Número de fragmentos
+        history: Historial de duraciones (por defecto, el de DURATIONS_FILE)
+        split_fixtures: Fixtures de sesión que no obligan a agrupar
+    
+    Returns:
+        Dict: 'shards' (pruebas de cada fragmento, en orden de colección),
+        'loads' (duración estimada de cada fragmento) y 'unseen' (pruebas
+        sin historial)
+    """
+    history = history or DurationHistory.load()
+    predictions, unseen = history.predict(item.nodeid for item in items)
+    groups = shard_groups(items, split_fixtures)
+    costs = [sum(predictions[item.nodeid] for item in group) for group in groups]
+    assignments, loads = lpt_assign(costs, count)
+    order = {id(item): position for position, item in enumerate(items)}
+    shards = [sorted((item for group in indices for item in groups[group]), key=lambda item: order[id(item)])
+              for indices in assignments]
+    return {"shards": shards, "loads": loads, "unseen": unseen,
+            "predictions": predictions, "groups": len(groups)}
+
+
+def write_shard_manifest(plan: Dict[str, Any], index: int, directory: Optional[str] = None) -> str:
+    """
+    Escribe el manifiesto de un fragmento.
+    
+    Args:
+        plan: Plan devuelto por plan_shards()
+        index: Fragmento (desde 1)
+        directory: Directorio de salida (por defecto, SHARD_MANIFEST_DIR)
+    
+    Returns:
+        str: Ruta del manifiesto
+    """
+    directory = directory or config.get_shard_manifest_dir()
+    count = len(plan["shards"])
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"shard-{index}-of-{count}.json")
+    tests = plan["shards"][index - 1]
+    manifest = {
+        "shard": index,
+        "shards": count,
+        "predicted_seconds": round(plan["loads"][index - 1], 3),
+        "predicted_seconds_by_shard": [round(load, 3) for load in plan["loads"]],
+        "groups": plan["groups"],
+        "unseen": plan["unseen"],
+        "tests": [{"nodeid": item.nodeid, "predicted_seconds": plan["predictions"][item.nodeid]}
+                  for item in tests],
+    }
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return path
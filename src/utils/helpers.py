@@ -5,47 +5,186 @@ Este módulo contiene utilidades comunes que se usan en las pruebas
 automatizadas como captura de pantallas, logs, etc.
 """
 
+import atexit
+import glob
+import heapq
 import os
 import logging
+import queue
+import re
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from src.utils.config import config
+from src.utils.tracing import create_trace_handler, is_trace_record, tracer
 
 
 def setup_logging() -> logging.Logger:
     """
     Configura el sistema de logging.
     
+    Con LOG_ASYNC activado el logger raíz solo encola los registros
+    (QueueHandler) y un QueueListener los formatea y escribe en el archivo y
+    la consola desde un hilo en segundo plano, para que los logs no añadan
+    latencia a las interacciones con la interfaz.
+    
+    Con TRACE_ENABLED activado configura también la traza estructurada JSONL
+    (ver src.utils.tracing) junto al archivo de log.
+    
+    Es idempotente: las llamadas repetidas (p. ej. before_spec_hook de Gauge
+    en cada especificación) no añaden handlers duplicados.
+    
     Returns:
         logging.Logger: Logger configurado
     """
+    global _log_listener
+    
+    logger = logging.getLogger(__name__)
+    if _log_handlers and all(handler in target.handlers for target, handler in _log_handlers):
+        return logger
+    stop_logging()
+    
     # Crear directorio de logs si no existe
     os.makedirs(os.path.dirname(config.get_log_file()), exist_ok=True)
     
     # Configurar formato de log
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    log_format = '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
+    formatter = logging.Formatter(log_format, date_format)
+    
+    handlers = [
+        logging.FileHandler(config.get_log_file(), encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(lambda record: not is_trace_record(record))
+    # La traza estructurada comparte la cola pero tiene su propio logger y archivo
+    trace_handler = create_trace_handler() if config.is_trace_enabled() else None
+    
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, config.get_log_level()))
+    tracer.logger.setLevel(logging.INFO)
+    if config.is_log_async_enabled():
+        log_queue = queue.SimpleQueue()
+        listener_handlers = handlers + ([trace_handler] if trace_handler else [])
+        _log_listener = QueueListener(log_queue, *listener_handlers, respect_handler_level=True)
+        _log_listener.start()
+        queue_handler = QueueHandler(log_queue)
+        handlers = [queue_handler]
+        trace_handler = queue_handler if trace_handler else None
+    for handler in handlers:
+        root.addHandler(handler)
+        _log_handlers.append((root, handler))
+    if trace_handler:
+        tracer.logger.addHandler(trace_handler)
+        _log_handlers.append((tracer.logger, trace_handler))
+    
+    return logger
+
+
+def stop_logging() -> None:
+    """
+    Retira los handlers de setup_logging y vacía la cola de logs pendientes.
+    
+    Se registra con atexit para no perder registros al terminar el proceso.
+    """
+    global _log_listener
+    
+    for target, handler in _log_handlers:
+        target.removeHandler(handler)
+        handler.close()
+    _log_handlers.clear()
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+def flush_logging() -> None:
+    """
+    Escribe los registros pendientes en la cola de logs sin retirar los handlers.
     
-    # Configurar logging
-    logging.basicConfig(
-        level=getattr(logging, config.get_log_level()),
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(config.get_log_file(), encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    El listener se detiene (vaciando la cola) y se vuelve a arrancar.
+    """
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener.start()
+    for _, handler in _log_handlers:
+        handler.flush()
+
+
+def merge_worker_logs(output_file: Optional[str] = None) -> Optional[str]:
+    """
+    Une en orden temporal el log principal y los logs de los workers de xdist.
+    
+    Cada archivo ya está ordenado, así que se mezclan en streaming; cada
+    registro (incluidas sus líneas de continuación, como las trazas) se
+    etiqueta con el worker que lo escribió.
     
-    return logging.getLogger(__name__)
+    Args:
+        output_file: Archivo de salida (por defecto, automation.merged.log)
+    
+    Returns:
+        Optional[str]: Ruta del log unido, None si no hay logs de workers
+    """
+    worker_files = sorted(glob.glob(config.get_log_file("gw*")))
+    if not worker_files:
+        return None
+    sources = [("master", config.get_log_file(""))] if os.path.exists(config.get_log_file("")) else []
+    for worker_file in worker_files:
+        worker_id = os.path.splitext(worker_file)[0].rsplit(".", 1)[-1]
+        sources.append((worker_id, worker_file))
+    
+    output_file = output_file or config.get_log_file("merged")
+    with open(output_file, "w", encoding="utf-8") as output:
+        for timestamp, _, worker_id, lines in heapq.merge(
+                *(_read_log_records(worker_id, path) for worker_id, path in sources)):
+            output.write(f"{timestamp} [{worker_id}]{lines[0][len(timestamp):]}")
+            output.writelines(lines[1:])
+    return output_file
+
+
+def _read_log_records(worker_id: str, path: str):
+    """Lee un log como registros (timestamp, orden, worker, líneas)."""
+    record = None
+    with open(path, encoding="utf-8", errors="replace") as log_file:
+        for number, line in enumerate(log_file):
+            if not line.endswith("\n"):
+                line += "\n"
+            match = _LOG_TIMESTAMP.match(line)
+            if match or record is None:
+                if record is not None:
+                    yield record
+                record = (match.group(0) if match else "", number, worker_id, [line])
+            else:
+                record[3].append(line)
+    if record is not None:
+        yield record
+
+
+# Inicio de cada registro del log ('2024-01-31 10:00:00.123')
+_LOG_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:[.,]\d{3})?")
+
+# Handlers añadidos por setup_logging (logger, handler) y su listener en segundo plano
+_log_handlers: List[Tuple[logging.Logger, logging.Handler]] = []
+_log_listener: Optional[QueueListener] = None
+atexit.register(stop_logging)
 
 
 def take_screenshot(driver, test_name: str, step_name: Optional[str] = None) -> str:
     """
     Toma una captura de pantalla.
     
+    Con SCREENSHOT_ASYNC activado solo se pide la captura a WinAppDriver en
+    el hilo actual; la decodificación y la escritura las hace el escritor en
+    segundo plano (la ruta devuelta existe tras screenshot_writer.flush()).
+    Con SCREENSHOT_DEDUP activado la ruta devuelta es una referencia que se
+    resuelve con resolve_screenshot().
+    
     Args:
         driver: Instancia del driver
         test_name: Nombre de la prueba
@@ -55,21 +194,9 @@ def take_screenshot(driver, test_name: str, step_name: Optional[str] = None) ->
         str: Ruta del archivo de screenshot
     """
     try:
-        # Crear directorio de screenshots si no existe
-        os.makedirs(config.get_screenshots_dir(), exist_ok=True)
-        
-        # Generar nombre del archivo
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        step_suffix = f"_{step_name}" if step_name else ""
-        filename = f"{test_name}{step_suffix}_{timestamp}.png"
-        filepath = os.path.join(config.get_screenshots_dir(), filename)
-        
-        # Tomar screenshot
-        driver.save_screenshot(filepath)
-        
-        logger = logging.getLogger(__name__)
-        logger.info(f"Screenshot guardado: {filepath}")
-        
+        filepath = _screenshot_filepath(test_name, step_name)
+        with tracer.span("screenshot", os.path.basename(filepath)):
+            _capture_screenshot(driver, filepath)
         return filepath
         
     except Exception as e:
@@ -78,6 +205,82 @@ def take_screenshot(driver, test_name: str, step_name: Optional[str] = None) ->
         return ""
 
 
+def _capture_screenshot(driver, filepath: str) -> None:
+    """Pide la captura al driver y la guarda (o la encola) en filepath."""
+    logger = logging.getLogger(__name__)
+    dedupe = config.is_screenshot_dedup_enabled()
+    if config.is_screenshot_async_enabled():
+        from src.utils.screenshots import screenshot_writer
+        screenshot_writer.submit(driver.get_screenshot_as_base64(), filepath, dedupe=dedupe)
+        logger.info(f"Screenshot encolado: {filepath}")
+        return
+    
+    # Tomar screenshot
+    if dedupe:
+        from src.utils.screenshots import screenshot_store
+        screenshot_store.put(driver.get_screenshot_as_png(), filepath)
+    else:
+        os.makedirs(config.get_screenshots_dir(), exist_ok=True)
+        driver.save_screenshot(filepath)
+    logger.info(f"Screenshot guardado: {filepath}")
+
+
+def save_screenshot_bytes(png: bytes, test_name: str, step_name: Optional[str] = None) -> str:
+    """
+    Guarda una captura ya obtenida como bytes, sin volver a pedirla al driver.
+    
+    Sigue las mismas reglas que take_screenshot (escritura en segundo plano
+    y deduplicación según la configuración).
+    
+    Args:
+        png: Contenido PNG
+        test_name: Nombre de la prueba
+        step_name: Nombre del paso (opcional)
+    
+    Returns:
+        str: Ruta o referencia de la captura
+    """
+    from src.utils.screenshots import screenshot_store, screenshot_writer
+    
+    filepath = _screenshot_filepath(test_name, step_name)
+    dedupe = config.is_screenshot_dedup_enabled()
+    if config.is_screenshot_async_enabled():
+        screenshot_writer.submit(png, filepath, dedupe=dedupe)
+    elif dedupe:
+        screenshot_store.put(png, filepath)
+    else:
+        os.makedirs(config.get_screenshots_dir(), exist_ok=True)
+        with open(filepath, "wb") as image_file:
+            image_file.write(png)
+    return filepath
+
+
+def _screenshot_filepath(test_name: str, step_name: Optional[str] = None) -> str:
+    """Genera la ruta {prueba}_{paso}_{timestamp}.png de una captura."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    step_suffix = f"_{step_name}" if step_name else ""
+    filename = f"{test_name}{step_suffix}_{timestamp}.png"
+    return os.path.join(config.get_screenshots_dir(), filename)
+
+
+def resolve_screenshot(screenshot_path: str) -> Optional[str]:
+    """
+    Obtiene el archivo real de una captura devuelta por take_screenshot.
+    
+    Args:
+        screenshot_path: Ruta o referencia devuelta por take_screenshot
+    
+    Returns:
+        Optional[str]: Ruta del PNG, None si no existe
+    """
+    if not screenshot_path:
+        return None
+    if config.is_screenshot_dedup_enabled():
+        from src.utils.screenshots import screenshot_store
+        return screenshot_store.resolve(screenshot_path)
+    return screenshot_path if os.path.isfile(screenshot_path) else None
+
+
 def wait_for_element_to_be_clickable(driver, locator, timeout: int = None):
     """
     Espera a que un elemento sea clickeable.
@@ -90,11 +293,11 @@ def wait_for_element_to_be_clickable(driver, locator, timeout: int = None):
     Returns:
         WebElement: Elemento clickeable
     """
-    from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from src.utils.waits import AdaptiveWait
     
     timeout = timeout or config.get_explicit_wait()
-    wait = WebDriverWait(driver, timeout)
+    wait = AdaptiveWait(driver, timeout)
     return wait.until(EC.element_to_be_clickable(locator))
 
 
@@ -110,11 +313,11 @@ def wait_for_element_to_be_visible(driver, locator, timeout: int = None):
     Returns:
         WebElement: Elemento visible
     """
-    from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from src.utils.waits import AdaptiveWait
     
     timeout = timeout or config.get_explicit_wait()
-    wait = WebDriverWait(driver, timeout)
+    wait = AdaptiveWait(driver, timeout)
     return wait.until(EC.visibility_of_element_located(locator))
 
 
@@ -0,0 +1,300 @@
+"""
+Histogramas de latencia de los comandos de WinAppDriver.
+
+El transporte del driver (y el cliente asíncrono) registra la duración de
+cada comando W3C en histogramas acumulativos por comando y, en las búsquedas,
+por estrategia de localización. Al terminar la sesión se vuelcan como JSON y
+en formato de texto de Prometheus (reports/metrics/), de modo que se puede
+ver qué comandos y qué localizadores son lentos sin guardar cada muestra.
+"""
+
+import bisect
+import glob
+import json
+import math
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.config import config
+
+
+# Límites superiores de los buckets en segundos (el último bucket es +Inf)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con buckets fijos.
+    
+    Usa memoria constante sea cual sea el número de muestras; los percentiles
+    se estiman interpolando dentro del bucket.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Inicializa el histograma vacío.
+        
+        Args:
+            buckets: Límites superiores de los buckets, en orden creciente
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """
+        Registra una muestra.
+        
+        Args:
+            seconds: Duración en segundos
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Suma las muestras de otro histograma con los mismos buckets.
+        
+        Args:
+            other: Histograma a sumar
+        """
+        if other.buckets != self.buckets:
+            raise ValueError("Los histogramas tienen buckets distintos")
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estima un percentil.
+        
+        Args:
+            q: Percentil entre 0 y 1
+        
+        Returns:
+            float: Latencia estimada en segundos (0 sin muestras)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa el histograma.
+        
+        Returns:
+            Dict: Recuento, suma, extremos, percentiles y buckets
+        """
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": round(self.min, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """
+        Reconstruye un histograma serializado con to_dict().
+        
+        Args:
+            data: Histograma serializado
+        
+        Returns:
+            LatencyHistogram: Histograma equivalente
+        """
+        histogram = cls(tuple(data["buckets"]))
+        histogram.counts = list(data["counts"])
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.min = data["min"] if data["count"] else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+class CommandMetrics:
+    """
+    Histogramas de latencia por comando y por estrategia de localización.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Inicializa los histogramas vacíos.
+        
+        Args:
+            buckets: Límites de los buckets de todos los histogramas
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.commands: Dict[str, LatencyHistogram] = {}
+        self.strategies: Dict[str, LatencyHistogram] = {}
+    
+    def observe(self, command: str, seconds: float, strategy: Optional[str] = None) -> None:
+        """
+        Registra la duración de un comando (nada si METRICS_ENABLED está desactivado).
+        
+        Args:
+            command: Nombre del comando (findElement, clickElement, ...)
+            seconds: Duración en segundos
+            strategy: Estrategia de localización, en las búsquedas
+        """
+        if not config.is_metrics_enabled():
+            return
+        with self._lock:
+            self._histogram(self.commands, command).observe(seconds)
+            if strategy:
+                self._histogram(self.strategies, strategy).observe(seconds)
+    
+    def reset(self) -> None:
+        """Descarta todas las muestras."""
+        with self._lock:
+            self.commands.clear()
+            self.strategies.clear()
+    
+    def merge(self, data: Dict[str, Any]) -> None:
+        """
+        Suma los histogramas serializados por to_dict() (p. ej. de otro worker).
+        
+        Args:
+            data: Métricas serializadas
+        """
+        with self._lock:
+            for target, key in ((self.commands, "commands"), (self.strategies, "strategies")):
+                for name, histogram in data.get(key, {}).items():
+                    self._histogram(target, name).merge(LatencyHistogram.from_dict(histogram))
+    
+    def slowest(self, count: int = 5, quantile: float = 0.9) -> List[Tuple[str, float, int]]:
+        """
+        Obtiene los comandos más lentos.
+        
+        Args:
+            count: Número de comandos a devolver
+            quantile: Percentil por el que ordenar
+        
+        Returns:
+            List: Tuplas (comando, latencia del percentil, muestras)
+        """
+        with self._lock:
+            ranking = [(name, histogram.quantile(quantile), histogram.count)
+                       for name, histogram in self.commands.items()]
+        return sorted(ranking, key=lambda entry: entry[1], reverse=True)[:count]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa las métricas.
+        
+        Returns:
+            Dict: Histogramas por comando ('commands') y por estrategia ('strategies')
+        """
+        with self._lock:
+            return {
+                "commands": {name: h.to_dict() for name, h in sorted(self.commands.items())},
+                "strategies": {name: h.to_dict() for name, h in sorted(self.strategies.items())},
+            }
+    
+    def to_prometheus(self) -> str:
+        """
+        Genera las métricas en formato de texto de Prometheus.
+        
+        Returns:
+            str: Histogramas winappdriver_command_duration_seconds (por comando) y
+            winappdriver_find_duration_seconds (por estrategia)
+        """
+        lines: List[str] = []
+        with self._lock:
+            for metric, label, histograms, description in (
+                    ("winappdriver_command_duration_seconds", "command", self.commands,
+                     "Latencia de los comandos de WinAppDriver"),
+                    ("winappdriver_find_duration_seconds", "strategy", self.strategies,
+                     "Latencia de las búsquedas de elementos por estrategia de localización")):
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, histogram in sorted(histograms.items()):
+                    labels = f'{label}="{_escape_label(name)}"'
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == math.inf else repr(bound)
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def dump(self, directory: Optional[str] = None, worker_id: Optional[str] = None) -> str:
+        """
+        Escribe las métricas como JSON y como texto de Prometheus.
+        
+        Args:
+            directory: Directorio de salida (por defecto, METRICS_DIR)
+            worker_id: Worker de xdist (por defecto, el del proceso actual)
+        
+        Returns:
+            str: Ruta del archivo JSON (el .prom queda junto a él)
+        """
+        directory = directory or config.get_metrics_dir()
+        worker_id = config.get_worker_id() if worker_id is None else worker_id
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"command_latency.{worker_id}" if worker_id else "command_latency")
+        with open(f"{base}.json", "w", encoding="utf-8") as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+        with open(f"{base}.prom", "w", encoding="utf-8") as prom_file:
+            prom_file.write(self.to_prometheus())
+        return f"{base}.json"
+    
+    def merge_worker_dumps(self, directory: Optional[str] = None) -> int:
+        """
+        Suma las métricas volcadas por los workers de xdist y elimina sus volcados.
+        
+        Args:
+            directory: Directorio de las métricas (por defecto, METRICS_DIR)
+        
+        Returns:
+            int: Número de volcados sumados
+        """
+        paths = sorted(glob.glob(os.path.join(directory or config.get_metrics_dir(),
+                                              "command_latency.gw*.json")))
+        for path in paths:
+            with open(path, encoding="utf-8") as json_file:
+                self.merge(json.load(json_file))
+            os.remove(path)
+            os.remove(os.path.splitext(path)[0] + ".prom")
+        return len(paths)
+    
+    def _histogram(self, histograms: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        """Obtiene (o crea) el histograma de un nombre."""
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram(self.buckets)
+        return histogram
+
+
+def _escape_label(value: str) -> str:
+    """Escapa un valor de etiqueta de Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Métricas globales alimentadas por el transporte del driver
+command_metrics = CommandMetrics()
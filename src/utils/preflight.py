@@ -0,0 +1,256 @@
+"""
+Validación del entorno antes de empezar la ejecución (pre-flight).
+
+Comprueba en paralelo, con un timeout corto, que cada WinAppDriver
+configurado (WINAPPDRIVER_URL o los nodos de WINAPPDRIVER_URLS) responde a
+/status, que APP_PATH existe, que los directorios de reportes admiten
+escritura y que queda espacio libre en disco. Así un agente mal configurado
+falla en un par de segundos con un resumen, en lugar de hacerlo en el
+timeout de la primera prueba.
+
+La latencia medida de cada endpoint se publica como referencia en
+preflight.json (METRICS_DIR) para compararla con la de los comandos.
+"""
+
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import urllib3
+from src.utils.config import Config, config
+
+
+# Hosts en los que WinAppDriver corre en esta máquina (APP_PATH se puede comprobar)
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def result(name: str, ok: bool, detail: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Construye el resultado de una comprobación.
+    
+    Args:
+        name: Nombre de la comprobación
+        ok: Si se superó (las comprobaciones omitidas cuentan como superadas)
+        detail: Explicación para el resumen
+        **fields: Datos adicionales (p. ej. latencias)
+    
+    Returns:
+        Dict: Resultado con 'name', 'ok' y 'detail'
+    """
+    return {"name": name, "ok": ok, "detail": detail, **fields}
+
+
+def check_endpoint(url: str, timeout: float, samples: int = 3,
+                   http: Optional[urllib3.PoolManager] = None) -> Dict[str, Any]:
+    """
+    Comprueba que un WinAppDriver responde a /status y mide su latencia.
+    
+    Args:
+        url: URL base del servidor
+        timeout: Tiempo máximo total de la comprobación
+        samples: Peticiones a medir (la latencia de referencia es la mediana)
+        http: Pool de conexiones a usar (por defecto, uno propio)
+    
+    Returns:
+        Dict: Resultado con las latencias en milisegundos
+    """
+    http = http or urllib3.PoolManager(retries=False)
+    name = f"WinAppDriver {url}"
+    deadline = time.monotonic() + timeout
+    latencies: List[float] = []
+    for _ in range(max(samples, 1)):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        started = time.perf_counter()
+        try:
+            response = http.request("GET", f"{url.rstrip('/')}/status",
+                                    timeout=urllib3.Timeout(total=remaining))
+        except Exception as e:
+            if latencies:
+                break  # Ya hay una medida: basta para la referencia
+            return result(name, False, f"no responde: {type(e).__name__}: {str(e)[:160]}", url=url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status != 200:
+            return result(name, False, f"/status devolvió HTTP {response.status}", url=url)
+        value = json.loads(response.data or b"{}").get("value", {})
+        if isinstance(value, dict) and value.get("ready") is False:
+            return result(name, False, "el servidor no está listo", url=url)
+    latency = statistics.median(latencies)
+    return result(name, True, f"{latency:.1f} ms", url=url, latency_ms=round(latency, 3),
+                  samples_ms=[round(sample, 3) for sample in latencies])
+
+
+def check_app_path(app_path: str, urls: List[str], simulated: bool = False) -> Dict[str, Any]:
+    """
+    Comprueba que la aplicación existe, si WinAppDriver corre en esta máquina.
+    
+    Con el WinAppDriver simulado, con endpoints remotos o si APP_PATH no es
+    una ruta (p. ej. el id de una aplicación UWP), la comprobación se omite.
+    
+    Args:
+        app_path: Valor de APP_PATH
+        urls: Endpoints de WinAppDriver configurados
+        simulated: Si se usa el WinAppDriver simulado (no lanza la aplicación)
+    
+    Returns:
+        Dict: Resultado de la comprobación
+    """
+    name = "APP_PATH"
+    if simulated:
+        return result(name, True, "omitida: WinAppDriver simulado", skipped=True)
+    if not any(urlsplit(url).hostname in LOCAL_HOSTS for url in urls):
+        return result(name, True, "omitida: WinAppDriver remoto", skipped=True)
+    if not ("\\" in app_path or "/" in app_path or app_path.lower().endswith(".exe")):
+        return result(name, True, f"omitida: '{app_path}' no es una ruta", skipped=True)
+    if not os.path.isfile(app_path):
+        return result(name, False, f"no existe: {app_path}")
+    return result(name, True, app_path)
+
+
+def check_writable(directory: str) -> Dict[str, Any]:
+    """
+    Comprueba que se puede escribir en un directorio (creándolo si hace falta).
+    
+    Args:
+        directory: Directorio de reportes
+    
+    Returns:
+        Dict: Resultado de la comprobación
+    """
+    name = f"Escritura en {directory}"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".preflight-"):
+            pass
+    except OSError as e:
+        return result(name, False, f"{type(e).__name__}: {str(e)}")
+    return result(name, True, "ok")
+
+
+def check_disk_space(directory: str, min_free_mb: int) -> Dict[str, Any]:
+    """
+    Comprueba el espacio libre del disco de los reportes.
+    
+    Args:
+        directory: Directorio de reportes
+        min_free_mb: Espacio libre mínimo en MB
+    
+    Returns:
+        Dict: Resultado con el espacio libre en MB
+    """
+    name = "Espacio en disco"
+    try:
+        free_mb = shutil.disk_usage(directory).free / (1024 * 1024)
+    except OSError as e:
+        return result(name, False, f"{type(e).__name__}: {str(e)}")
+    detail = f"{free_mb:.0f} MB libres (mínimo {min_free_mb} MB)"
+    return result(name, free_mb >= min_free_mb, detail, free_mb=round(free_mb))
+
+
+def run_preflight(app_config: Optional[Config] = None,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Ejecuta todas las comprobaciones en paralelo.
+    
+    Una comprobación que no termina en el timeout se da por fallida, de modo
+    que la validación completa nunca tarda mucho más que PREFLIGHT_TIMEOUT.
+    
+    Args:
+        app_config: Configuración a validar (por defecto, la global)
+        timeout: Tiempo máximo (por defecto, PREFLIGHT_TIMEOUT)
+    
+    Returns:
+        List[Dict]: Resultados, en el orden de las comprobaciones
+    """
+    app_config = app_config or config
+    timeout = app_config.get_preflight_timeout() if timeout is None else timeout
+    urls = [url for url, _ in app_config.get_winappdriver_urls()] or [app_config.get_winappdriver_url()]
+    directories = [app_config.get_reports_dir(), app_config.get_screenshots_dir(),
+                   app_config.get_metrics_dir(), os.path.dirname(app_config.get_log_file()) or "."]
+    http = urllib3.PoolManager(num_pools=len(urls), retries=False)
+    checks: List[Tuple[str, Callable[[], Dict[str, Any]]]] = [
+        (f"WinAppDriver {url}", lambda url=url: check_endpoint(
+            url, timeout, app_config.get_preflight_samples(), http)) for url in urls
+    ]
+    checks.append(("APP_PATH", lambda: check_app_path(
+        app_config.get_app_path(), urls, app_config.is_fake_winappdriver_enabled())))
+    checks.extend((f"Escritura en {directory}", lambda directory=directory: check_writable(directory))
+                  for directory in dict.fromkeys(directories))
+    checks.append(("Espacio en disco", lambda: check_disk_space(
+        app_config.get_reports_dir(), app_config.get_preflight_min_free_mb())))
+    
+    executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="preflight")
+    futures: List[Future] = []
+    try:
+        futures = [executor.submit(_safe, name, check) for name, check in checks]
+        wait(futures, timeout=timeout + 0.5)
+        return [future.result() if future.done() else
+                result(name, False, f"sin respuesta en {timeout:.1f}s")
+                for (name, _), future in zip(checks, futures)]
+    finally:
+        # shutdown(cancel_futures=True) requiere Python 3.9
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _safe(name: str, check: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Ejecuta una comprobación convirtiendo cualquier excepción en un fallo."""
+    try:
+        return check()
+    except Exception as e:
+        return result(name, False, f"{type(e).__name__}: {str(e)}")
+
+
+def format_summary(results: List[Dict[str, Any]]) -> str:
+    """
+    Resume los resultados, una comprobación por línea.
+    
+    Args:
+        results: Resultados de run_preflight()
+    
+    Returns:
+        str: Resumen legible
+    """
+    return "\n".join(
+        f"  [{'OK' if item['ok'] else 'FALLO'}] {item['name']}: {item['detail']}" for item in results
+    )
+
+
+def baseline_latencies(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Obtiene la latencia de referencia de cada endpoint que respondió.
+    
+    Args:
+        results: Resultados de run_preflight()
+    
+    Returns:
+        Dict[str, float]: Mediana de /status en milisegundos por URL
+    """
+    return {item["url"]: item["latency_ms"] for item in results if "latency_ms" in item}
+
+
+def write_baseline(results: List[Dict[str, Any]], path: Optional[str] = None) -> str:
+    """
+    Escribe los resultados y las latencias de referencia como JSON.
+    
+    Args:
+        results: Resultados de run_preflight()
+        path: Archivo de salida (por defecto, preflight.json en METRICS_DIR)
+    
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    path = path or os.path.join(config.get_metrics_dir(), "preflight.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump({"ts": round(time.time(), 3), "ok": all(item["ok"] for item in results),
+                   "latency_ms": baseline_latencies(results), "checks": results},
+                  baseline_file, indent=2, ensure_ascii=False)
+    return path
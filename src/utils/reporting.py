@@ -0,0 +1,181 @@
+"""
+Adjuntos de capturas de pantalla para los reportes de Allure y pytest-html.
+
+La captura se pide al driver una sola vez como bytes; el mismo buffer se
+adjunta a Allure y se guarda en disco en segundo plano, y pytest-html la
+recibe por referencia al archivo o desde el buffer (opcionalmente reducida
+a una miniatura si Pillow está instalado).
+"""
+
+import base64
+import io
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from src.utils.config import config
+from src.utils.helpers import resolve_screenshot, save_screenshot_bytes
+from src.utils.tracing import tracer
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional: sin él no se generan miniaturas
+    Image = None
+
+
+def make_thumbnail(png: bytes, max_size: int) -> Optional[bytes]:
+    """
+    Reduce una captura para incrustarla en el reporte HTML.
+    
+    Args:
+        png: Contenido PNG
+        max_size: Lado máximo de la miniatura en píxeles
+    
+    Returns:
+        Optional[bytes]: PNG reducido, o None si Pillow no está disponible o
+        la imagen ya es más pequeña
+    """
+    if Image is None or max_size <= 0:
+        return None
+    try:
+        with Image.open(io.BytesIO(png)) as image:
+            if max(image.size) <= max_size:
+                return None
+            image.thumbnail((max_size, max_size))
+            output = io.BytesIO()
+            image.save(output, format="PNG", optimize=True)
+            return output.getvalue()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"No se pudo generar la miniatura: {str(e)}")
+        return None
+
+
+def attach_to_allure(png: bytes, name: str) -> bool:
+    """
+    Adjunta una captura a Allure directamente desde el buffer.
+    
+    Args:
+        png: Contenido PNG
+        name: Nombre del adjunto
+    
+    Returns:
+        bool: True si Allure está disponible y se adjuntó
+    """
+    try:
+        import allure
+    except ImportError:
+        return False  # Allure no está instalado
+    allure.attach(png, name=name, attachment_type=allure.attachment_type.PNG)
+    return True
+
+
+def html_extras(png: bytes, name: str, file_path: Optional[str] = None,
+                report_dir: Optional[str] = None, self_contained: bool = True,
+                thumbnail_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Construye los extras de pytest-html para una captura.
+    
+    En reportes no autocontenidos se referencia el archivo guardado; en los
+    autocontenidos se incrusta el buffer (o su miniatura, con enlace a la
+    imagen completa).
+    
+    Args:
+        png: Contenido PNG
+        name: Nombre del adjunto
+        file_path: Ruta donde queda guardada la captura
+        report_dir: Directorio del reporte HTML (para rutas relativas)
+        self_contained: Si el reporte incrusta los recursos
+        thumbnail_size: Lado máximo de la miniatura (por defecto,
+            REPORT_THUMBNAIL_SIZE; 0 la desactiva)
+    
+    Returns:
+        List[Dict]: Extras para report.extras (vacía sin pytest-html)
+    """
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return []
+    
+    reference = None
+    if file_path:
+        reference = os.path.relpath(file_path, report_dir) if report_dir else file_path
+    if reference and not self_contained:
+        return [extras.png(reference, name)]
+    
+    if thumbnail_size is None:
+        thumbnail_size = config.get_report_thumbnail_size()
+    thumbnail = make_thumbnail(png, thumbnail_size)
+    result = [extras.png(base64.b64encode(thumbnail or png).decode("ascii"), name)]
+    if thumbnail and reference:
+        result.append(extras.url(reference, f"{name} (completa)"))
+    return result
+
+
+def attach_failure_screenshot(item, driver, test_name: str,
+                              error: Optional[BaseException] = None) -> Optional[str]:
+    """
+    Captura la pantalla una vez y la adjunta a todos los reportes.
+    
+    Si la excepción del fallo ya tiene captura (tomada por BasePage en la
+    misma cadena de fallo) se adjunta esa en lugar de pedir otra al driver,
+    desde el buffer que se conservó (o por referencia al archivo si no hay
+    buffer); si la política de capturas la descarta, no se adjunta nada.
+    
+    Los extras de pytest-html quedan en item.screenshot_extras para que el
+    hook pytest_runtest_makereport los añada al reporte del teardown.
+    
+    Args:
+        item: Item de pytest de la prueba fallida
+        driver: Instancia del driver
+        test_name: Nombre de la prueba
+        error: Excepción del fallo (opcional)
+    
+    Returns:
+        Optional[str]: Ruta o referencia de la captura, None si se omitió
+    """
+    from src.utils.screenshots import screenshot_policy
+    
+    screenshot_path = screenshot_policy.captured_path(error)
+    if screenshot_path:
+        # Captura ya tomada en la cadena de fallo: se adjunta su buffer, sin
+        # esperar al escritor en segundo plano ni releer el archivo
+        png = screenshot_policy.captured_png(error)
+    elif not screenshot_policy.should_capture(error):
+        return None
+    else:
+        with tracer.span("screenshot", f"{test_name}_failure"):
+            png = driver.get_screenshot_as_png()
+            screenshot_path = save_screenshot_bytes(png, test_name, "failure")
+        screenshot_policy.record_capture(screenshot_path, error, png=png)
+    file_path = _stored_path(screenshot_path, png)
+    
+    name = f"Screenshot - {test_name}"
+    if png is not None:
+        attach_to_allure(png, name)
+    
+    html_path = getattr(item.config.option, "htmlpath", None)
+    item.screenshot_extras = getattr(item, "screenshot_extras", []) + html_extras(
+        png or b"", name, file_path,
+        report_dir=os.path.dirname(os.path.abspath(html_path)) if html_path else None,
+        # Sin el buffer solo se puede referenciar el archivo
+        self_contained=png is not None and bool(getattr(item.config.option, "self_contained_html", False)),
+    )
+    return screenshot_path
+
+
+def _stored_path(screenshot_path: str, png: Optional[bytes] = None) -> str:
+    """
+    Obtiene el archivo donde queda (o quedará, si se escribe en segundo plano) una captura.
+    
+    Args:
+        screenshot_path: Ruta o referencia devuelta al guardar la captura
+        png: Contenido de la captura, si se conserva
+    
+    Returns:
+        str: Ruta del archivo (con deduplicación, el objeto de su digest)
+    """
+    if not config.is_screenshot_dedup_enabled():
+        return screenshot_path
+    from src.utils.screenshots import screenshot_store
+    if png is not None:
+        return screenshot_store.path_for(png)
+    return resolve_screenshot(screenshot_path) or screenshot_path
@@ -0,0 +1,556 @@
+"""
+Escritura de capturas de pantalla en segundo plano.
+
+El hilo de la prueba solo pide la captura a WinAppDriver (una petición que
+devuelve el PNG en base64); la decodificación y la escritura en disco las
+hace un hilo de fondo alimentado por una cola acotada. Así los fallos dejan
+de pagar la E/S de disco en su camino crítico.
+
+Con SCREENSHOT_DEDUP activado las capturas se guardan una sola vez por
+contenido (SCREENSHOTS_DIR/objects/<sha256>.png) y el nombre de cada captura
+({prueba}_{paso}_{timestamp}.png) pasa a ser una referencia en index.jsonl
+que se resuelve con ScreenshotStore.resolve(). Con pytest-xdist el almacén es
+uno solo para todos los workers (una captura idéntica se guarda una vez en
+toda la ejecución); cada worker tiene su propio escritor y su cola.
+"""
+
+import atexit
+import base64
+import glob
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional, Set, Union
+from src.utils.config import config
+
+
+class ScreenshotStore:
+    """
+    Almacén de capturas direccionado por contenido.
+    
+    Cada PNG se guarda una vez bajo su digest SHA-256; los nombres por prueba
+    son referencias registradas en un índice JSONL (una línea por captura,
+    con el worker que la tomó). Lo comparten el proceso principal y los
+    workers de xdist: los objetos se escriben de forma atómica y al índice
+    solo se añaden líneas.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            root: Directorio raíz (por defecto, SCREENSHOTS_DIR en cada uso,
+                sin el subdirectorio del worker)
+        """
+        self._root = root
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._known: Set[str] = set()
+        self._index: Dict[str, str] = {}
+        self.stats = {"stored": 0, "deduplicated": 0, "bytes_written": 0, "bytes_saved": 0}
+    
+    @property
+    def root(self) -> str:
+        """Directorio raíz del almacén."""
+        return self._root or config.get_screenshots_dir("")
+    
+    @property
+    def index_path(self) -> str:
+        """Ruta del índice de referencias."""
+        return os.path.join(self.root, "index.jsonl")
+    
+    def object_path(self, digest: str) -> str:
+        """Ruta del PNG con el digest indicado."""
+        return os.path.join(self.root, "objects", f"{digest}.png")
+    
+    def path_for(self, png: bytes) -> str:
+        """
+        Calcula la ruta donde se guarda (o se guardará) un contenido PNG.
+        
+        Args:
+            png: Contenido PNG
+        
+        Returns:
+            str: Ruta del objeto correspondiente a su digest
+        """
+        return self.object_path(hashlib.sha256(png).hexdigest())
+    
+    def put(self, png: bytes, reference: str) -> str:
+        """
+        Guarda una captura (si su contenido es nuevo) y registra la referencia.
+        
+        Args:
+            png: Contenido PNG
+            reference: Nombre o ruta de la captura por prueba
+        
+        Returns:
+            str: Ruta del PNG almacenado
+        """
+        digest = hashlib.sha256(png).hexdigest()
+        path = self.object_path(digest)
+        name = os.path.basename(reference)
+        with self._lock:
+            is_new = path not in self._known and not os.path.exists(path)
+            if not is_new and path not in self._known:
+                # Guardado en una ejecución anterior: se renueva para clean_old_reports()
+                os.utime(path)
+            if is_new:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Escritura atómica: otro proceso puede guardar el mismo digest a la vez
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as image_file:
+                    image_file.write(png)
+                os.replace(temp_path, path)
+                self.stats["stored"] += 1
+                self.stats["bytes_written"] += len(png)
+            else:
+                self.stats["deduplicated"] += 1
+                self.stats["bytes_saved"] += len(png)
+            self._known.add(path)
+            self._index[name] = digest
+            entry = {"name": name, "digest": digest, "size": len(png), "time": time.time(),
+                     "worker": config.get_worker_id() or "master"}
+            with open(self.index_path, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(entry) + "\n")
+        return path
+    
+    def resolve(self, reference: str) -> Optional[str]:
+        """
+        Obtiene la ruta del PNG de una referencia.
+        
+        Args:
+            reference: Nombre o ruta devuelta por take_screenshot
+        
+        Returns:
+            Optional[str]: Ruta del PNG almacenado, None si no está en el índice
+        """
+        if reference and os.path.isfile(reference):
+            return reference
+        name = os.path.basename(reference or "")
+        with self._lock:
+            digest = self._index.get(name)
+        if digest is None:
+            digest = self.load_index().get(name)
+        return self.object_path(digest) if digest else None
+    
+    def load_index(self) -> Dict[str, str]:
+        """
+        Lee el índice completo del disco (incluye capturas de otros procesos).
+        
+        Returns:
+            Dict[str, str]: Nombre de la captura -> digest
+        """
+        index: Dict[str, str] = {}
+        if not os.path.exists(self.index_path):
+            return index
+        with open(self.index_path, encoding="utf-8") as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                index[entry["name"]] = entry["digest"]
+        with self._lock:
+            self._index.update(index)
+        return index
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtiene las métricas del almacén.
+        
+        Returns:
+            Dict: PNG guardados, capturas deduplicadas y bytes escritos/ahorrados
+        """
+        with self._lock:
+            return dict(self.stats)
+
+
+class ScreenshotWriter:
+    """
+    Escritor de capturas con un hilo de fondo y una cola acotada.
+    
+    Si la cola está llena, submit() bloquea hasta que haya hueco (las capturas
+    de fallos no se descartan) y lo registra en las métricas.
+    """
+    
+    def __init__(self, max_queue_size: Optional[int] = None,
+                 store: Optional[ScreenshotStore] = None):
+        """
+        Inicializa el escritor.
+        
+        Args:
+            max_queue_size: Capturas pendientes máximas (por defecto,
+                SCREENSHOT_QUEUE_SIZE)
+            store: Almacén para las capturas deduplicadas
+        """
+        self.store = store
+        self.max_queue_size = max_queue_size or config.get_screenshot_queue_size()
+        self.logger = logging.getLogger(__name__)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._created_dirs: Set[str] = set()
+        self._closed = False
+        self.reset_stats()
+    
+    def reset_stats(self) -> None:
+        """Reinicia las métricas."""
+        with self._lock:
+            self.stats = {
+                "submitted": 0, "written": 0, "failed": 0, "blocked": 0,
+                "max_queue_depth": 0, "latency_total": 0.0, "max_latency": 0.0,
+                "write_seconds": 0.0,
+            }
+    
+    def submit(self, data: Union[bytes, str], filepath: str, dedupe: bool = False) -> str:
+        """
+        Encola una captura para escribirla en segundo plano.
+        
+        Args:
+            data: PNG en bytes o en base64 (tal como lo devuelve WinAppDriver)
+            filepath: Ruta de destino (o referencia, si se deduplica)
+            dedupe: Si guardarla en el almacén direccionado por contenido
+        
+        Returns:
+            str: La ruta de destino
+        """
+        if self._closed:
+            raise RuntimeError("El escritor de capturas está cerrado")
+        if dedupe and self.store is None:
+            raise ValueError("El escritor no tiene almacén para deduplicar")
+        self._ensure_worker()
+        item = (data, filepath, time.monotonic(), dedupe)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.stats["blocked"] += 1
+            self.logger.warning("Cola de capturas llena: se espera a que haya hueco")
+            self._queue.put(item)
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queue.qsize())
+        return filepath
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que se escriban todas las capturas pendientes.
+        
+        Args:
+            timeout: Tiempo máximo de espera (None para esperar sin límite)
+        
+        Returns:
+            bool: True si la cola quedó vacía
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        end_time = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= end_time:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Escribe las capturas pendientes y detiene el hilo de fondo.
+        
+        Args:
+            timeout: Tiempo máximo para vaciar la cola
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def get_queue_depth(self) -> int:
+        """Obtiene el número de capturas pendientes de escribir."""
+        return self._queue.qsize()
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas del escritor.
+        
+        Returns:
+            Dict: Capturas encoladas, escritas y fallidas, veces que la cola
+            estaba llena, profundidad actual y máxima, latencia media y máxima
+            (de submit() a la escritura) y tiempo total de escritura
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        done = stats["written"] + stats["failed"]
+        stats["queue_depth"] = self.get_queue_depth()
+        stats["avg_latency"] = stats.pop("latency_total") / done if done else 0.0
+        return stats
+    
+    def _ensure_worker(self) -> None:
+        """Arranca el hilo de fondo la primera vez que se necesita."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="screenshot-writer", daemon=True
+                )
+                self._thread.start()
+    
+    def _run(self) -> None:
+        """Bucle del hilo de fondo."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, data: Union[bytes, str], filepath: str, submitted_at: float,
+               dedupe: bool = False) -> None:
+        """Decodifica y escribe una captura."""
+        start = time.monotonic()
+        try:
+            png = base64.b64decode(data) if isinstance(data, str) else data
+            if dedupe:
+                self.store.put(png, filepath)
+            else:
+                directory = os.path.dirname(filepath)
+                if directory and directory not in self._created_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    self._created_dirs.add(directory)
+                with open(filepath, "wb") as image_file:
+                    image_file.write(png)
+            outcome = "written"
+        except Exception as e:
+            self.logger.error(f"Error al escribir screenshot {filepath}: {str(e)}")
+            outcome = "failed"
+        finished = time.monotonic()
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["write_seconds"] += finished - start
+            self.stats["latency_total"] += finished - submitted_at
+            self.stats["max_latency"] = max(self.stats["max_latency"], finished - submitted_at)
+
+
+class ScreenshotPolicy:
+    """
+    Política de capturas de fallo por prueba y por sesión.
+    
+    Evita capturas redundantes: una sola por cadena de fallo (la misma
+    excepción propagándose por varios métodos de BasePage y el fixture de
+    fallo), un presupuesto máximo por prueba y por sesión, y ninguna si la
+    pantalla no cambió desde la última captura de la prueba.
+    """
+    
+    def __init__(self, test_budget: Optional[int] = None, session_budget: Optional[int] = None,
+                 skip_unchanged: Optional[bool] = None):
+        """
+        Inicializa la política.
+        
+        Args:
+            test_budget: Capturas de fallo máximas por prueba (por defecto,
+                SCREENSHOT_TEST_BUDGET; 0 sin límite)
+            session_budget: Capturas de fallo máximas por sesión (por defecto,
+                SCREENSHOT_SESSION_BUDGET; 0 sin límite)
+            skip_unchanged: Si omitir la captura cuando la huella de la
+                pantalla (hash de la imagen) coincide con la de la anterior
+                captura de la prueba
+        """
+        self.test_budget = config.get_screenshot_test_budget() if test_budget is None else test_budget
+        self.session_budget = (config.get_screenshot_session_budget()
+                               if session_budget is None else session_budget)
+        self.skip_unchanged = (config.is_screenshot_skip_unchanged_enabled()
+                               if skip_unchanged is None else skip_unchanged)
+        self._lock = threading.Lock()
+        self.test_id: Optional[str] = None
+        self.stats = {"captured": 0, "skipped_chain": 0, "skipped_test_budget": 0,
+                      "skipped_session_budget": 0, "skipped_unchanged": 0}
+        self._test_count = 0
+        self._last_hash: Optional[str] = None
+        self._last_path = ""
+        self._last_png: Optional[bytes] = None
+    
+    def start_test(self, test_id: str) -> None:
+        """
+        Reinicia los contadores de la prueba que empieza.
+        
+        Args:
+            test_id: Identificador de la prueba o escenario
+        """
+        with self._lock:
+            self.test_id = test_id
+            self._test_count = 0
+            self._last_hash = None
+            self._last_path = ""
+            self._last_png = None
+    
+    def needs_screen_hash(self) -> bool:
+        """
+        Indica si hay que calcular la huella de la pantalla antes de guardar.
+        
+        La huella es el hash de la imagen capturada (no requiere otra petición
+        al driver). Se necesita también en la primera captura de la prueba, para
+        compararla con las siguientes; no se calcula si el presupuesto ya está
+        agotado y la captura se va a omitir de todos modos.
+        """
+        with self._lock:
+            return self.skip_unchanged and not self._budget_exhausted()
+    
+    def captured_path(self, error: Optional[BaseException]) -> Optional[str]:
+        """
+        Obtiene la captura ya tomada para una cadena de fallo.
+        
+        Args:
+            error: Excepción del fallo
+        
+        Returns:
+            Optional[str]: Ruta o referencia de la captura, None si no se tomó
+        """
+        return getattr(error, "_screenshot_path", None) if error is not None else None
+    
+    def captured_png(self, error: Optional[BaseException]) -> Optional[bytes]:
+        """
+        Obtiene el contenido de la captura ya tomada para una cadena de fallo.
+        
+        Args:
+            error: Excepción del fallo
+        
+        Returns:
+            Optional[bytes]: PNG capturado, None si no se conservó el buffer
+        """
+        return getattr(error, "_screenshot_png", None) if error is not None else None
+    
+    def should_capture(self, error: Optional[BaseException] = None,
+                       screen_hash: Optional[str] = None) -> bool:
+        """
+        Decide si tomar una captura de fallo.
+        
+        Args:
+            error: Excepción que provoca la captura
+            screen_hash: Huella de la pantalla actual (opcional)
+        
+        Returns:
+            bool: True si se debe capturar
+        """
+        with self._lock:
+            if self.captured_path(error) is not None:
+                reason = "skipped_chain"
+            elif self._budget_exhausted():
+                reason = ("skipped_test_budget" if self.test_budget and self._test_count >= self.test_budget
+                          else "skipped_session_budget")
+            elif self.skip_unchanged and screen_hash and screen_hash == self._last_hash:
+                reason = "skipped_unchanged"
+                # La captura anterior ya muestra esta pantalla
+                self._mark(error, self._last_path, self._last_png)
+            else:
+                return True
+            self.stats[reason] += 1
+            return False
+    
+    def record_capture(self, path: str, error: Optional[BaseException] = None,
+                       screen_hash: Optional[str] = None, png: Optional[bytes] = None) -> None:
+        """
+        Registra una captura de fallo tomada.
+        
+        Args:
+            path: Ruta o referencia de la captura
+            error: Excepción que la provocó (se marca para el resto de la cadena)
+            screen_hash: Huella de la pantalla capturada
+            png: Contenido de la captura (se conserva para los reportes)
+        """
+        with self._lock:
+            self.stats["captured"] += 1
+            self._test_count += 1
+            self._last_path = path
+            self._last_png = png
+            if screen_hash:
+                self._last_hash = screen_hash
+            self._mark(error, path, png)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtiene las métricas de la política.
+        
+        Returns:
+            Dict: Capturas tomadas y omitidas por cada motivo
+        """
+        with self._lock:
+            return dict(self.stats)
+    
+    def _budget_exhausted(self) -> bool:
+        """Indica si se agotó el presupuesto de la prueba o de la sesión."""
+        return bool((self.test_budget and self._test_count >= self.test_budget)
+                    or (self.session_budget and self.stats["captured"] >= self.session_budget))
+    
+    @staticmethod
+    def _mark(error: Optional[BaseException], path: str, png: Optional[bytes] = None) -> None:
+        """Asocia la captura (y su contenido) a la excepción para el resto de la cadena."""
+        if error is not None:
+            try:
+                error._screenshot_path = path
+                error._screenshot_png = png
+            except AttributeError:
+                pass
+
+
+def merge_worker_artifacts(output_path: Optional[str] = None) -> Optional[str]:
+    """
+    Une las capturas del proceso principal y de los workers de xdist en un índice.
+    
+    Las capturas deduplicadas ya están en el almacén compartido (su índice
+    indica el worker); las que se guardan sin deduplicar están en el
+    subdirectorio de cada worker. Cada línea del índice unificado (JSONL,
+    ordenado por tiempo) indica el worker, el nombre de la captura, la ruta
+    del PNG relativa al directorio de reportes y, si está deduplicada, su
+    digest.
+    
+    Args:
+        output_path: Archivo de salida (por defecto, SCREENSHOTS_DIR/artifacts.jsonl)
+    
+    Returns:
+        Optional[str]: Ruta del índice unificado, None si no hay capturas de workers
+    """
+    reports_dir = config.get_reports_dir()
+    store = ScreenshotStore(config.get_screenshots_dir(""))
+    entries = []
+    if os.path.exists(store.index_path):
+        with open(store.index_path, encoding="utf-8") as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entry["path"] = os.path.relpath(store.object_path(entry["digest"]), reports_dir)
+                entries.append(dict(entry, worker=entry.get("worker", "master")))
+    for worker_id, root in [("master", store.root)] + [
+            (os.path.basename(path), path) for path in glob.glob(config.get_screenshots_dir("gw*"))]:
+        for path in glob.glob(os.path.join(root, "*.png")):
+            stat = os.stat(path)
+            entries.append({"name": os.path.basename(path), "size": stat.st_size,
+                            "time": stat.st_mtime, "path": os.path.relpath(path, reports_dir),
+                            "worker": worker_id})
+    if all(entry["worker"] == "master" for entry in entries):
+        return None
+    
+    entries.sort(key=lambda entry: entry["time"])
+    output_path = output_path or os.path.join(store.root, "artifacts.jsonl")
+    with open(output_path, "w", encoding="utf-8") as output:
+        for entry in entries:
+            output.write(json.dumps(entry) + "\n")
+    return output_path
+
+
+# Almacén y escritor globales compartidos por helpers.take_screenshot
+screenshot_store = ScreenshotStore()
+screenshot_writer = ScreenshotWriter(store=screenshot_store)
+# Política de capturas de fallo compartida por BasePage y los fixtures
+screenshot_policy = ScreenshotPolicy()
+atexit.register(screenshot_writer.close, 5)
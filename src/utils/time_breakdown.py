@@ -0,0 +1,260 @@
+"""
+Desglose del tiempo de cada prueba por categoría.
+
+El plugin de pytest reparte el tiempo de reloj de cada prueba (setup, call y
+teardown) entre arranque y cierre del driver, comandos del driver, esperas,
+time.sleep explícitos, capturas y el resto (Python puro). Las categorías se
+obtienen de los eventos de la traza (ver tracing.Tracer.subscribe) y de
+time.sleep, que se intercepta solo en el hilo de la prueba mientras corre.
+
+Los eventos anidados (el comando que lanza una espera, la sesión que crea el
+arranque del driver) se atribuyen al evento exterior, de modo que la suma de
+las categorías nunca supera el tiempo de la prueba. El desglose viaja en
+report.user_properties, así que con pytest-xdist lo agrega el proceso
+principal: al terminar se escribe time_breakdown.json en METRICS_DIR y se
+muestra un resumen con las pruebas que más tiempo pierden esperando.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pytest
+from src.utils.config import config
+from src.utils.tracing import tracer
+
+
+# Categorías del desglose, en el orden del reporte
+CATEGORIES = ("driver_start", "driver_teardown", "commands", "waits", "sleep", "screenshots", "python")
+
+# Categorías que se consideran tiempo perdido (no ejercitan la aplicación)
+WASTED_CATEGORIES = ("driver_start", "driver_teardown", "waits", "sleep")
+
+# Categoría de cada evento de la traza (los eventos 'test' y 'step' no se atribuyen)
+_EVENT_CATEGORIES = {
+    ("driver", "start"): "driver_start",
+    ("driver", "stop"): "driver_teardown",
+    ("driver", "reset"): "driver_teardown",
+    "command": "commands",
+    "wait": "waits",
+    "sleep": "sleep",
+    "screenshot": "screenshots",
+}
+
+USER_PROPERTY = "time_breakdown"
+
+
+def categorize(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Obtiene la categoría del desglose de un evento.
+    
+    Args:
+        event: Evento de la traza
+    
+    Returns:
+        Optional[str]: Categoría, o None si el evento no se atribuye
+    """
+    return _EVENT_CATEGORIES.get((event.get("type"), event.get("name"))) or \
+        _EVENT_CATEGORIES.get(event.get("type"))
+
+
+def summarize(events: Iterable[Dict[str, Any]], start: float, stop: float) -> Dict[str, float]:
+    """
+    Reparte el tiempo de una prueba entre las categorías.
+    
+    Cada instante se atribuye al evento más exterior que lo cubre; lo que no
+    cubre ningún evento es tiempo de Python.
+    
+    Args:
+        events: Eventos con 'ts' (inicio, epoch), 'duration' y 'type'
+        start: Inicio de la prueba (epoch)
+        stop: Fin de la prueba (epoch)
+    
+    Returns:
+        Dict[str, float]: Segundos por categoría y tiempo total ('wall')
+    """
+    intervals: List[Tuple[float, float, str]] = []
+    for event in events:
+        category = categorize(event)
+        if category is None:
+            continue
+        begin = max(event["ts"], start)
+        end = min(event["ts"] + event["duration"], stop)
+        if end > begin:
+            intervals.append((begin, end, category))
+    
+    breakdown = dict.fromkeys(CATEGORIES, 0.0)
+    covered_until = start
+    for begin, end, category in sorted(intervals, key=lambda item: (item[0], -item[1])):
+        if end <= covered_until:
+            continue  # Anidado en un evento anterior
+        breakdown[category] += end - max(begin, covered_until)
+        covered_until = end
+    
+    wall = max(stop - start, 0.0)
+    breakdown["python"] = max(wall - sum(breakdown.values()), 0.0)
+    breakdown = {category: round(seconds, 6) for category, seconds in breakdown.items()}
+    breakdown["wall"] = round(wall, 6)
+    return breakdown
+
+
+def wasted(breakdown: Dict[str, float]) -> float:
+    """Segundos de una prueba en categorías de tiempo perdido."""
+    return sum(breakdown.get(category, 0.0) for category in WASTED_CATEGORIES)
+
+
+class TimeBreakdownPlugin:
+    """
+    Plugin de pytest que calcula el desglose de tiempo de cada prueba.
+    
+    Se registra desde tests/conftest.py si TIME_BREAKDOWN_ENABLED está activo.
+    """
+    
+    def __init__(self, top: Optional[int] = None):
+        """
+        Inicializa el plugin.
+        
+        Args:
+            top: Pruebas a mostrar en el resumen (por defecto, TIME_BREAKDOWN_TOP)
+        """
+        self.top = config.get_time_breakdown_top() if top is None else top
+        self.events: List[Dict[str, Any]] = []
+        self.results: Dict[str, Dict[str, float]] = {}
+        self._phases: Dict[str, Tuple[float, float]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def record(self, event: Dict[str, Any]) -> None:
+        """
+        Guarda un evento de la prueba en curso (suscriptor del tracer).
+        
+        Args:
+            event: Evento de la traza
+        """
+        with self._lock:
+            self.events.append(event)
+    
+    def _patched_sleep(self, original):
+        """Envuelve time.sleep para registrar las pausas del hilo de la prueba."""
+        def sleep(seconds):
+            if threading.current_thread() is not self._thread:
+                return original(seconds)
+            start = time.time()
+            started = time.perf_counter()
+            try:
+                return original(seconds)
+            finally:
+                self.record({"ts": start, "type": "sleep", "name": "time.sleep",
+                             "duration": time.perf_counter() - started})
+        return sleep
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        """Escucha los eventos y time.sleep mientras corre la prueba."""
+        self.events = []
+        self._phases = {}
+        self._thread = threading.current_thread()
+        original_sleep = time.sleep
+        time.sleep = self._patched_sleep(original_sleep)
+        tracer.subscribe(self.record)
+        try:
+            yield
+        finally:
+            tracer.unsubscribe(self.record)
+            time.sleep = original_sleep
+            self._thread = None
+            self.events = []
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Adjunta el desglose al reporte del teardown."""
+        outcome = yield
+        rep = outcome.get_result()
+        self._phases[call.when] = (call.start, call.stop)
+        if call.when != "teardown":
+            return
+        start = min(begin for begin, _ in self._phases.values())
+        stop = max(end for _, end in self._phases.values())
+        with self._lock:
+            events = list(self.events)
+        rep.user_properties.append((USER_PROPERTY, summarize(events, start, stop)))
+    
+    def pytest_runtest_logreport(self, report):
+        """Recoge los desgloses (con pytest-xdist, también los de los workers)."""
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == USER_PROPERTY:
+                self.results[report.nodeid] = value
+    
+    def totals(self) -> Dict[str, float]:
+        """
+        Suma los desgloses de todas las pruebas.
+        
+        Returns:
+            Dict[str, float]: Segundos por categoría y total
+        """
+        totals = dict.fromkeys(CATEGORIES + ("wall",), 0.0)
+        for breakdown in self.results.values():
+            for category in totals:
+                totals[category] += breakdown.get(category, 0.0)
+        return {category: round(seconds, 6) for category, seconds in totals.items()}
+    
+    def top_wasted(self, count: Optional[int] = None) -> List[Tuple[str, Dict[str, float]]]:
+        """
+        Obtiene las pruebas que más tiempo pierden.
+        
+        Args:
+            count: Número de pruebas (por defecto, el configurado)
+        
+        Returns:
+            List: Tuplas (nodeid, desglose) ordenadas por tiempo perdido
+        """
+        ranking = sorted(self.results.items(), key=lambda item: wasted(item[1]), reverse=True)
+        return ranking[:self.top if count is None else count]
+    
+    def write_report(self, path: Optional[str] = None) -> str:
+        """
+        Escribe el desglose de la ejecución como JSON.
+        
+        Args:
+            path: Archivo de salida (por defecto, time_breakdown.json en METRICS_DIR)
+        
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        path = path or os.path.join(config.get_metrics_dir(), "time_breakdown.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tests = sorted(self.results.items(), key=lambda item: item[1]["wall"], reverse=True)
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump({"totals": self.totals(), "tests": dict(tests)}, report_file, indent=2)
+        return path
+    
+    def pytest_sessionfinish(self, session):
+        """Escribe el reporte en el proceso principal."""
+        if self.results and not hasattr(session.config, "workerinput"):
+            self.write_report()
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """Muestra los totales por categoría y las pruebas con más tiempo perdido."""
+        if not self.results:
+            return
+        totals = self.totals()
+        wall = totals["wall"] or 1.0
+        terminalreporter.write_sep("-", "desglose de tiempo")
+        for category in CATEGORIES:
+            terminalreporter.write_line(
+                f"{category:<16} {totals[category]:>10.2f}s {100 * totals[category] / wall:>6.1f}%"
+            )
+        ranking = [(nodeid, breakdown) for nodeid, breakdown in self.top_wasted() if wasted(breakdown) > 0]
+        if not ranking:
+            return
+        terminalreporter.write_line("")
+        terminalreporter.write_line("Pruebas con más tiempo perdido (driver, esperas y sleep):")
+        for nodeid, breakdown in ranking:
+            detail = ", ".join(f"{category} {breakdown[category]:.2f}s"
+                               for category in WASTED_CATEGORIES if breakdown[category] > 0)
+            terminalreporter.write_line(
+                f"{wasted(breakdown):>8.2f}s de {breakdown['wall']:.2f}s  {nodeid}  ({detail})"
+            )
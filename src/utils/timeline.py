@@ -0,0 +1,148 @@
+"""
+Exportación de la traza a una línea de tiempo de Chrome/Perfetto.
+
+Convierte los eventos de la traza JSONL (ver tracing.py) de todos los
+workers en el formato Trace Event de Chrome, que se abre en
+https://ui.perfetto.dev o en chrome://tracing. Cada worker de pytest-xdist
+(o proceso de Gauge) es un proceso de la línea de tiempo y cada hilo una
+pista; fixtures, fases de prueba, pasos de Gauge, acciones de BasePage,
+esperas, capturas y comandos del driver aparecen como spans anidados, de
+modo que los solapamientos y los huecos entre workers se ven de un vistazo.
+
+Uso desde la línea de comandos (exporta toda la traza conservada):
+    
+    python -m src.utils.timeline [reports/timeline.json]
+"""
+
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.utils.config import config
+from src.utils.tracing import read_trace, trace_files
+
+# Campos del evento que no se copian a los argumentos del span
+_BASE_FIELDS = ("ts", "type", "name", "duration", "worker", "thread", "pid")
+
+
+def run_trace_files() -> List[str]:
+    """
+    Obtiene los archivos de traza del proceso principal y de todos los workers.
+    
+    Returns:
+        List[str]: Rutas existentes, cada archivo precedido de sus rotaciones
+    """
+    files = trace_files(config.get_trace_file(worker_id=""))
+    for path in sorted(glob.glob(config.get_trace_file(worker_id="gw*"))):
+        files.extend(trace_files(path))
+    return files
+
+
+def span_name(event: Dict[str, Any]) -> str:
+    """
+    Obtiene el nombre con el que se muestra un evento.
+    
+    Args:
+        event: Evento de la traza
+    
+    Returns:
+        str: Nombre del span (las fases de prueba llevan el id de la prueba)
+    """
+    if event.get("type") == "test":
+        return f"{event.get('test')} ({event['name']})"
+    return str(event["name"])
+
+
+def to_trace_events(events: Iterable[Dict[str, Any]],
+                    processes: Optional[Dict[Tuple[str, Any], int]] = None,
+                    threads: Optional[Dict[Tuple[int, str], int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Convierte eventos de la traza en eventos de Chrome.
+    
+    Cada evento pasa a un span completo (ph 'X'); la primera vez que aparece
+    un worker o un hilo se emiten los metadatos con su nombre.
+    
+    Args:
+        events: Eventos de la traza
+        processes: Ids ya asignados a cada worker (se amplía al convertir
+            varios archivos)
+        threads: Ids ya asignados a cada hilo
+    
+    Yields:
+        Dict: Evento en formato Trace Event
+    """
+    processes = {} if processes is None else processes
+    threads = {} if threads is None else threads
+    for event in events:
+        worker = event.get("worker") or "master"
+        process_key = (worker, event.get("pid"))
+        pid = processes.get(process_key)
+        if pid is None:
+            pid = processes[process_key] = len(processes) + 1
+            label = worker if event.get("pid") is None else f"{worker} (pid {event['pid']})"
+            yield {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": label}}
+            yield {"ph": "M", "name": "process_sort_index", "pid": pid, "tid": 0,
+                   "args": {"sort_index": pid}}
+        thread = event.get("thread") or "MainThread"
+        tid = threads.get((pid, thread))
+        if tid is None:
+            tid = threads[(pid, thread)] = len(threads) + 1
+            yield {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": thread}}
+        yield {
+            "ph": "X",
+            "name": span_name(event),
+            "cat": event.get("type", ""),
+            "ts": round(event["ts"] * 1e6),
+            "dur": max(round(event.get("duration", 0) * 1e6), 1),
+            "pid": pid,
+            "tid": tid,
+            "args": {key: value for key, value in event.items() if key not in _BASE_FIELDS},
+        }
+
+
+def export_timeline(output: Optional[str] = None, paths: Optional[Iterable[str]] = None,
+                    since: Optional[float] = None) -> Tuple[str, int]:
+    """
+    Escribe la línea de tiempo de una ejecución.
+    
+    La traza se lee archivo a archivo (como mucho TRACE_MAX_BYTES en
+    memoria) y se escribe en streaming. Los eventos de cada archivo se
+    ordenan por inicio y, a igual inicio, el más largo primero, para que el
+    visor anide los spans.
+    
+    Args:
+        output: Archivo de salida (por defecto, TIMELINE_FILE)
+        paths: Archivos de traza (por defecto, los de todos los workers)
+        since: Omitir los eventos que empiezan antes de este instante (epoch),
+            p. ej. los de ejecuciones anteriores
+    
+    Returns:
+        Tuple[str, int]: Ruta escrita y número de spans
+    """
+    output = output or config.get_timeline_file()
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    files = run_trace_files() if paths is None else list(paths)
+    spans = 0
+    processes: Dict[Tuple[str, Any], int] = {}
+    threads: Dict[Tuple[int, str], int] = {}
+    with open(output, "w", encoding="utf-8") as timeline_file:
+        timeline_file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        first = True
+        for path in files:
+            # Un archivo por worker: se ordena solo dentro de cada archivo
+            events = [event for event in read_trace([path])
+                      if "ts" in event and (since is None or event["ts"] >= since)]
+            events.sort(key=lambda event: (event["ts"], -event.get("duration", 0)))
+            for trace_event in to_trace_events(events, processes, threads):
+                separator = "" if first else ",\n"
+                timeline_file.write(separator + json.dumps(trace_event, ensure_ascii=False, default=str))
+                first = False
+                spans += trace_event["ph"] == "X"
+        timeline_file.write("\n]}\n")
+    return output, spans
+
+
+if __name__ == "__main__":
+    path, count = export_timeline(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Línea de tiempo con {count} spans: {path}")
@@ -0,0 +1,250 @@
+"""
+Traza estructurada de la ejecución en formato JSONL.
+
+Cada comando del driver, espera, captura y paso se registra como una línea
+JSON con la prueba en curso, la duración y el resultado. El archivo sigue a
+LOG_FILE (automation.trace.jsonl, o automation.gw0.trace.jsonl en cada worker
+de pytest-xdist), rota por tamaño y comprime con gzip las rotaciones.
+read_trace() recorre el archivo y sus rotaciones en streaming, sin cargarlos
+en memoria.
+
+Los eventos pasan por la misma cola que el resto de logs (ver
+helpers.setup_logging), así que serializarlos y escribirlos no añade
+latencia a las interacciones con la interfaz.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from src.utils.config import config
+
+
+TRACE_LOGGER = "automation.trace"
+
+# Tipos de evento de la traza
+EVENT_TYPES = ("command", "wait", "screenshot", "step", "test", "driver", "fixture", "action",
+               "breaker")
+
+
+class Tracer:
+    """
+    Emisor de eventos de la traza.
+    
+    Los eventos se emiten como registros del logger TRACE_LOGGER (sin
+    propagarse al logger raíz) y se entregan a los suscriptores en el mismo
+    hilo; si la traza no está configurada y no hay suscriptores, emitir no
+    hace nada.
+    """
+    
+    def __init__(self):
+        """Inicializa el emisor sin prueba en curso."""
+        self.logger = logging.getLogger(TRACE_LOGGER)
+        self.logger.propagate = False
+        self.test_id: Optional[str] = None
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+    
+    @property
+    def logging_enabled(self) -> bool:
+        """Indica si hay algún handler que escriba los eventos."""
+        return bool(self.logger.handlers) and self.logger.isEnabledFor(logging.INFO)
+    
+    @property
+    def enabled(self) -> bool:
+        """Indica si algún handler o suscriptor recibe los eventos."""
+        return bool(self._listeners) or self.logging_enabled
+    
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registra una función que recibe cada evento emitido.
+        
+        Args:
+            listener: Función llamada con el dict del evento
+        """
+        self._listeners = self._listeners + [listener]
+    
+    def unsubscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Elimina un suscriptor registrado con subscribe().
+        
+        Args:
+            listener: Función a eliminar
+        """
+        self._listeners = [item for item in self._listeners if item is not listener]
+    
+    def start_test(self, test_id: Optional[str]) -> None:
+        """
+        Asocia los eventos siguientes a una prueba.
+        
+        Args:
+            test_id: Identificador de la prueba o escenario
+        """
+        self.test_id = test_id
+    
+    def emit(self, event_type: str, name: str, duration: float, outcome: str = "ok",
+             start: Optional[float] = None, **fields: Any) -> None:
+        """
+        Registra un evento terminado.
+        
+        Args:
+            event_type: Tipo de evento (ver EVENT_TYPES)
+            name: Nombre del comando, espera, captura o paso
+            duration: Duración en segundos
+            outcome: Resultado ('ok', 'timeout', 'error' o el nombre de la excepción)
+            start: Instante de inicio (epoch); por defecto, ahora menos la duración
+            **fields: Datos adicionales del evento
+        """
+        if not self.enabled:
+            return
+        event = {
+            "ts": round(start if start is not None else time.time() - duration, 6),
+            "type": event_type,
+            "name": name,
+            "test": self.test_id,
+            "duration": round(duration, 6),
+            "outcome": outcome,
+            "worker": config.get_worker_id() or "master",
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        }
+        event.update(fields)
+        for listener in self._listeners:
+            listener(event)
+        if self.logging_enabled:
+            self.logger.info("%s %s", event_type, name, extra={"trace": event})
+    
+    @contextmanager
+    def span(self, event_type: str, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Mide un bloque y lo registra como evento al salir.
+        
+        Si el bloque lanza una excepción, el resultado es su nombre de clase.
+        
+        Args:
+            event_type: Tipo de evento
+            name: Nombre del evento
+            **fields: Datos adicionales (el bloque puede añadir más al dict devuelto)
+        
+        Yields:
+            Dict: Campos adicionales del evento
+        """
+        start = time.time()
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield fields
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            self.emit(event_type, name, time.perf_counter() - started, outcome, start=start, **fields)
+
+
+class TraceFormatter(logging.Formatter):
+    """Formatea los eventos de la traza como una línea JSON."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.trace, ensure_ascii=False, default=str)
+
+
+def create_trace_handler(path: Optional[str] = None) -> RotatingFileHandler:
+    """
+    Crea el handler que escribe la traza con rotación por tamaño y gzip.
+    
+    Args:
+        path: Archivo de la traza (por defecto, el de la configuración)
+    
+    Returns:
+        RotatingFileHandler: Handler que solo acepta eventos de la traza
+    """
+    path = path or config.get_trace_file()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=config.get_trace_max_bytes(),
+        backupCount=config.get_trace_backup_count(), encoding="utf-8",
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(TraceFormatter())
+    handler.addFilter(is_trace_record)
+    return handler
+
+
+def is_trace_record(record: logging.LogRecord) -> bool:
+    """Indica si un registro es un evento de la traza."""
+    return hasattr(record, "trace")
+
+
+def trace_files(path: Optional[str] = None) -> List[str]:
+    """
+    Obtiene el archivo de la traza y sus rotaciones, de la más antigua a la actual.
+    
+    Args:
+        path: Archivo de la traza (por defecto, el de la configuración)
+    
+    Returns:
+        List[str]: Rutas existentes en orden cronológico
+    """
+    path = path or config.get_trace_file()
+    directory = os.path.dirname(path) or "."
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.(\d+)\.gz$")
+    backups = []
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            match = pattern.match(filename)
+            if match:
+                backups.append((int(match.group(1)), os.path.join(directory, filename)))
+    files = [backup for _, backup in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def read_trace(paths: Optional[Iterable[str]] = None,
+               event_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los eventos de la traza en streaming.
+    
+    Lee línea a línea archivos .jsonl y .jsonl.gz; las líneas incompletas o
+    corruptas (p. ej. por un proceso interrumpido) se omiten.
+    
+    Args:
+        paths: Archivos a leer (por defecto, la traza configurada y sus rotaciones)
+        event_type: Tipo de evento a devolver (por defecto, todos)
+    
+    Yields:
+        Dict: Evento de la traza
+    """
+    for path in (trace_files() if paths is None else paths):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as trace_file:
+            for line in trace_file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event_type is None or event.get("type") == event_type:
+                    yield event
+
+
+def _gzip_namer(name: str) -> str:
+    """Nombre de una rotación comprimida."""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Comprime el archivo rotado y elimina el original."""
+    with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+# Emisor global usado por el transporte, las esperas, las capturas y los hooks
+tracer = Tracer()
@@ -0,0 +1,297 @@
+"""
+Esperas explícitas con política de sondeo configurable.
+
+Este módulo sustituye el sondeo fijo de 0.5 s de WebDriverWait por una
+política configurable (intervalo fijo, backoff exponencial con tope o ráfaga
+inicial rápida) y registra cuántos sondeos necesita cada espera.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple, Type
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from src.utils.config import config as global_config
+from src.utils.tracing import tracer
+
+
+POLL_STRATEGIES = ("fixed", "exponential", "burst")
+
+
+class PollingPolicy:
+    """
+    Política que genera los intervalos entre sondeos de una espera.
+    """
+    
+    def __init__(self, strategy: str = "fixed", interval: float = 0.5,
+                 initial_interval: float = 0.05, backoff_factor: float = 2.0,
+                 max_interval: float = 1.0, burst_count: int = 5):
+        """
+        Inicializa la política de sondeo.
+        
+        Args:
+            strategy: 'fixed', 'exponential' o 'burst'
+            interval: Intervalo fijo (y el posterior a la ráfaga en 'burst')
+            initial_interval: Primer intervalo en 'exponential' y 'burst'
+            backoff_factor: Multiplicador del intervalo en 'exponential'
+            max_interval: Tope del intervalo en 'exponential'
+            burst_count: Número de sondeos rápidos en 'burst'
+        """
+        if strategy not in POLL_STRATEGIES:
+            raise ValueError(f"Estrategia de sondeo no válida: {strategy}")
+        self.strategy = strategy
+        self.interval = interval
+        self.initial_interval = initial_interval
+        self.backoff_factor = backoff_factor
+        self.max_interval = max_interval
+        self.burst_count = burst_count
+    
+    @classmethod
+    def from_config(cls, config=None) -> "PollingPolicy":
+        """
+        Crea la política a partir de la configuración.
+        
+        Args:
+            config: Instancia de Config (por defecto, la global)
+        
+        Returns:
+            PollingPolicy: Política configurada
+        """
+        config = config or global_config
+        return cls(
+            strategy=config.get_poll_strategy(),
+            interval=config.get_poll_interval(),
+            initial_interval=config.get_poll_initial_interval(),
+            backoff_factor=config.get_poll_backoff_factor(),
+            max_interval=config.get_poll_max_interval(),
+            burst_count=config.get_poll_burst_count(),
+        )
+    
+    @classmethod
+    def fixed(cls, interval: float) -> "PollingPolicy":
+        """Crea una política de intervalo fijo."""
+        return cls(strategy="fixed", interval=interval)
+    
+    def intervals(self) -> Iterator[float]:
+        """
+        Genera los intervalos de espera entre sondeos consecutivos.
+        
+        Yields:
+            float: Segundos a esperar antes del siguiente sondeo
+        """
+        if self.strategy == "exponential":
+            current = self.initial_interval
+            while True:
+                yield min(current, self.max_interval)
+                current *= self.backoff_factor
+        elif self.strategy == "burst":
+            for _ in range(self.burst_count):
+                yield self.initial_interval
+            while True:
+                yield self.interval
+        else:
+            while True:
+                yield self.interval
+
+
+class WaitStats:
+    """
+    Acumulador de métricas de las esperas explícitas.
+    """
+    
+    def __init__(self):
+        """Inicializa las métricas a cero."""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reinicia las métricas."""
+        with self._lock:
+            self.waits = 0
+            self.polls = 0
+            self.timeouts = 0
+            self.seconds = 0.0
+            self.max_polls = 0
+    
+    def record(self, polls: int, seconds: float, timed_out: bool) -> None:
+        """
+        Registra una espera terminada.
+        
+        Args:
+            polls: Sondeos realizados
+            seconds: Duración de la espera
+            timed_out: Si la espera agotó el tiempo
+        """
+        with self._lock:
+            self.waits += 1
+            self.polls += polls
+            self.seconds += seconds
+            self.max_polls = max(self.max_polls, polls)
+            if timed_out:
+                self.timeouts += 1
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas acumuladas.
+        
+        Returns:
+            Dict: Esperas, sondeos totales y medios, máximo, timeouts y segundos
+        """
+        with self._lock:
+            return {
+                "waits": self.waits,
+                "polls": self.polls,
+                "avg_polls": self.polls / self.waits if self.waits else 0.0,
+                "max_polls": self.max_polls,
+                "timeouts": self.timeouts,
+                "seconds": self.seconds,
+            }
+
+
+# Métricas globales de todas las esperas del proceso
+wait_stats = WaitStats()
+
+
+class AdaptiveWait(WebDriverWait):
+    """
+    WebDriverWait con política de sondeo configurable y conteo de sondeos.
+    """
+    
+    def __init__(self, driver, timeout: float, policy: Optional[PollingPolicy] = None,
+                 ignored_exceptions=None):
+        """
+        Inicializa la espera.
+        
+        Args:
+            driver: Instancia del driver
+            timeout: Tiempo máximo de espera en segundos
+            policy: Política de sondeo (por defecto, la de la configuración global)
+            ignored_exceptions: Excepciones a ignorar durante el sondeo
+        """
+        super().__init__(driver, timeout, ignored_exceptions=ignored_exceptions)
+        self.policy = policy or PollingPolicy.from_config()
+        self.last_polls = 0
+        self.last_duration = 0.0
+        self.logger = logging.getLogger(__name__)
+    
+    def until(self, method: Callable[[Any], Any], message: str = "") -> Any:
+        """
+        Espera hasta que el método devuelva un valor verdadero.
+        
+        Args:
+            method: Condición que recibe el driver
+            message: Mensaje de la excepción si se agota el tiempo
+        
+        Returns:
+            Any: Valor devuelto por la condición
+        """
+        return self._poll_until(method, message, negate=False)
+    
+    def until_not(self, method: Callable[[Any], Any], message: str = "") -> Any:
+        """
+        Espera hasta que el método devuelva un valor falso.
+        
+        Args:
+            method: Condición que recibe el driver
+            message: Mensaje de la excepción si se agota el tiempo
+        
+        Returns:
+            Any: Valor devuelto por la condición (o True si lanzó una excepción ignorada)
+        """
+        return self._poll_until(method, message, negate=True)
+    
+    def _poll_until(self, method: Callable[[Any], Any], message: str, negate: bool) -> Any:
+        """Bucle de sondeo común a until() y until_not()."""
+        screen = stacktrace = None
+        start = time.monotonic()
+        end_time = start + self._timeout
+        intervals = self.policy.intervals()
+        polls = 0
+        # Una excepción no ignorada de la condición termina la espera como "error"
+        outcome = "error"
+        try:
+            while True:
+                polls += 1
+                try:
+                    value = method(self._driver)
+                    if bool(value) != negate:
+                        outcome = "ok"
+                        return value
+                except self._ignored_exceptions as exc:
+                    if negate:
+                        outcome = "ok"
+                        return True
+                    screen = getattr(exc, "screen", None)
+                    stacktrace = getattr(exc, "stacktrace", None)
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(next(intervals), remaining))
+            outcome = "timeout"
+            raise TimeoutException(message, screen, stacktrace)
+        finally:
+            self._record(polls, start, outcome, message)
+    
+    def _record(self, polls: int, start: float, outcome: str, message: str = "") -> None:
+        """Guarda las métricas de la espera terminada ("ok", "timeout" o "error")."""
+        self.last_polls = polls
+        self.last_duration = time.monotonic() - start
+        wait_stats.record(polls, self.last_duration, timed_out=outcome == "timeout")
+        tracer.emit("wait", message or "wait", self.last_duration, outcome,
+                    polls=polls, strategy=self.policy.strategy)
+        endings = {"ok": "completada", "timeout": "agotada", "error": "interrumpida por un error"}
+        self.logger.debug(
+            f"Espera {endings[outcome]} en {polls} sondeos "
+            f"({self.last_duration:.3f}s, estrategia {self.policy.strategy})"
+        )
+
+
+async def async_wait_until(condition: Callable[[], Awaitable[Any]], timeout: float,
+                           policy: Optional[PollingPolicy] = None,
+                           ignored_exceptions: Tuple[Type[BaseException], ...] = (NoSuchElementException,),
+                           message: str = "") -> Any:
+    """
+    Versión asíncrona de AdaptiveWait.until() para el cliente asyncio.
+    
+    Cede el event loop entre sondeos, así que muchas esperas pueden
+    avanzar a la vez en un único hilo.
+    
+    Args:
+        condition: Corrutina sin argumentos a evaluar en cada sondeo
+        timeout: Tiempo máximo de espera en segundos
+        policy: Política de sondeo (por defecto, la de la configuración global)
+        ignored_exceptions: Excepciones a ignorar durante el sondeo
+        message: Mensaje de la excepción si se agota el tiempo
+    
+    Returns:
+        Any: Primer valor verdadero devuelto por la condición
+    """
+    loop = asyncio.get_running_loop()
+    policy = policy or PollingPolicy.from_config()
+    intervals = policy.intervals()
+    start = loop.time()
+    end_time = start + timeout
+    polls = 0
+    outcome = "error"
+    try:
+        while True:
+            polls += 1
+            try:
+                value = await condition()
+                if value:
+                    outcome = "ok"
+                    return value
+            except ignored_exceptions:
+                pass
+            remaining = end_time - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(next(intervals), remaining))
+        outcome = "timeout"
+        raise TimeoutException(message)
+    finally:
+        duration = loop.time() - start
+        wait_stats.record(polls, duration, timed_out=outcome == "timeout")
+        tracer.emit("wait", message or "wait", duration, outcome, polls=polls, strategy=policy.strategy)
@@ -13,13 +13,21 @@ from pathlib import Path
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from getgauge.python import step, before_scenario, after_scenario, before_spec, after_spec
+from getgauge.python import (
+    step, before_scenario, after_scenario, before_spec, after_spec, before_step, after_step,
+    after_suite
+)
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
+from src.drivers.circuit_breaker import session_breakers, write_report as write_breaker_report
 from src.drivers.winapp_driver import WinAppDriver
 from src.pages.base_page import BasePage
 from src.data.test_data import TestData
 from src.utils.helpers import setup_logging, take_screenshot
+from src.utils.metrics import command_metrics
+from src.utils.screenshots import screenshot_policy, screenshot_writer
+from src.utils.tracing import tracer
 
 
 class WPFApplicationSteps:
@@ -32,6 +40,7 @@ class WPFApplicationSteps:
         self.main_page = None
         self.logger = logging.getLogger(__name__)
         self.test_data = TestData()
+        self.step_started = (time.time(), time.perf_counter())
 
 
 # Instancia global para mantener estado entre pasos
@@ -48,12 +57,25 @@ def before_spec_hook():
 @after_spec
 def after_spec_hook():
     """Se ejecuta después de cada especificación."""
+    screenshot_writer.flush()
     app_steps.logger.info("=== Finalizando especificación Gauge ===")
 
 
+@after_suite
+def after_suite_hook():
+    """Vuelca los histogramas de latencia y los cambios de estado del circuit breaker."""
+    command_metrics.dump()
+    transitions = session_breakers.transitions
+    if transitions:
+        write_breaker_report(transitions)
+
+
 @before_scenario
-def before_scenario_hook():
+def before_scenario_hook(context):
     """Se ejecuta antes de cada escenario."""
+    scenario_id = f"{context.specification.name} :: {context.scenario.name}"
+    screenshot_policy.start_test(scenario_id)
+    tracer.start_test(scenario_id)
     app_steps.logger.info("--- Iniciando escenario ---")
 
 
@@ -68,6 +90,20 @@ def after_scenario_hook():
     app_steps.logger.info("--- Finalizando escenario ---")
 
 
+@before_step
+def before_step_hook():
+    """Marca el inicio del paso para la traza."""
+    app_steps.step_started = (time.time(), time.perf_counter())
+
+
+@after_step
+def after_step_hook(context):
+    """Registra el paso en la traza."""
+    start, started = app_steps.step_started
+    tracer.emit("step", context.step.text, time.perf_counter() - started,
+                "failed" if context.step.is_failing else "passed", start=start)
+
+
 # Pasos de configuración inicial
 
 @step("Abrir la aplicación WPF")
@@ -194,12 +230,31 @@ def hacer_clic_boton(texto_boton):
     app_steps.logger.info(f"Clic realizado en botón: {texto_boton}")
 
 
+def esperar_resultado_login(timeout):
+    """
+    Espera a que el login termine con el menú principal o con un error.
+    
+    Args:
+        timeout: Tiempo máximo de espera
+    
+    Returns:
+        str: 'exito', 'error' o None si no aparece ninguno a tiempo
+    """
+    try:
+        resultado, _ = app_steps.main_page.wait_for_any(
+            {"exito": (By.NAME, "MainMenu"), "error": (By.NAME, "lblError")}, timeout
+        )
+        return resultado
+    except TimeoutException:
+        return None
+
+
 @step("Verificar que el login fue exitoso")
 def verificar_login_exitoso():
     """Verifica que el login fue exitoso."""
-    main_menu = (By.NAME, "MainMenu")
-    assert app_steps.main_page.is_element_visible(main_menu, timeout=10), \
-        "Menú principal debe ser visible después del login exitoso"
+    resultado = esperar_resultado_login(timeout=10)
+    assert resultado == "exito", \
+        f"Menú principal debe ser visible después del login exitoso (resultado: {resultado})"
     app_steps.logger.info("Login exitoso verificado")
 
 
@@ -226,9 +281,8 @@ def verificar_opciones_administrador():
 @step("Verificar que aparece un mensaje de error")
 def verificar_mensaje_error():
     """Verifica que aparece un mensaje de error."""
-    error_message = (By.NAME, "lblError")
-    assert app_steps.main_page.is_element_visible(error_message, timeout=5), \
-        "Debe aparecer un mensaje de error"
+    resultado = esperar_resultado_login(timeout=5)
+    assert resultado == "error", f"Debe aparecer un mensaje de error (resultado: {resultado})"
     app_steps.logger.info("Mensaje de error verificado")
 
 
@@ -256,8 +310,7 @@ def verificar_mensaje_validacion():
 @step("Verificar que no se permite el acceso al sistema")
 def verificar_acceso_denegado():
     """Verifica que no se permite el acceso al sistema."""
-    main_menu = (By.NAME, "MainMenu")
-    assert not app_steps.main_page.is_element_visible(main_menu, timeout=3), \
+    assert esperar_resultado_login(timeout=3) != "exito", \
         "No debe mostrarse el menú principal"
     app_steps.logger.info("Acceso denegado verificado")
 
@@ -367,6 +420,8 @@ def seleccionar_opcion(opcion):
     """
     opcion_locator = (By.NAME, opcion.replace(" ", ""))
     app_steps.main_page.click_element(opcion_locator)
+    # La opción abre otra vista: los elementos cacheados dejan de ser válidos
+    app_steps.main_page.invalidate_cache()
     app_steps.logger.info(f"Opción seleccionada: {opcion}")
 
 
@@ -9,43 +9,309 @@ import pytest
 import logging
 import os
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 # Agregar el directorio src al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from src.drivers.winapp_driver import WinAppDriver
+from src.drivers.circuit_breaker import session_breakers
+from src.drivers.winapp_driver import SessionPool, WinAppDriver
 from src.utils.config import config
-from src.utils.helpers import setup_logging, clean_old_reports
+from src.utils.durations import DurationHistory, parse_shard, plan_shards, write_shard_manifest
+from src.utils.helpers import setup_logging, clean_old_reports, flush_logging, merge_worker_logs
 
 
-def pytest_configure(config_obj):
+def pytest_addoption(parser):
+    """Opciones de línea de comandos del proyecto."""
+    parser.addoption(
+        "--shard", type=parse_shard, default=None, metavar="i/n",
+        help="Ejecutar solo el fragmento i de n, equilibrado por la duración histórica de las pruebas",
+    )
+
+
+def pytest_configure(config):
     """Configuración inicial de pytest."""
-    # Configurar logging
+    from src.utils.config import config as automation_config
+    
+    # Configurar logging (con pytest-xdist, un archivo por worker)
     setup_logging()
     
     # Crear directorios necesarios
-    config.create_directories()
+    automation_config.create_directories()
+    
+    # Limpiar reportes antiguos (solo el proceso principal: los workers comparten reports/)
+    if not hasattr(config, "workerinput"):
+        clean_old_reports()
+    
+    # Desglose del tiempo de cada prueba
+    if automation_config.is_time_breakdown_enabled():
+        from src.utils.time_breakdown import TimeBreakdownPlugin
+        config.pluginmanager.register(TimeBreakdownPlugin(), "time_breakdown")
     
-    # Limpiar reportes antiguos
-    clean_old_reports()
+    # Cambios de estado del circuit breaker de WinAppDriver en el reporte
+    if automation_config.is_circuit_breaker_enabled():
+        from src.utils.circuit_breaker_plugin import CircuitBreakerPlugin
+        config.pluginmanager.register(CircuitBreakerPlugin(), "circuit_breaker")
+    
+    # Reparto de pruebas por duración con pytest-xdist (el historial lo lleva el proceso principal)
+    if automation_config.is_duration_scheduling_enabled() and not hasattr(config, "workerinput"):
+        from src.utils.durations import DurationSchedulingPlugin
+        history = DurationHistory.load(automation_config.get_durations_file(str(config.rootpath)))
+        # Con --shard el historial solo se lee: todos los agentes deben calcular el mismo plan
+        config.pluginmanager.register(
+            DurationSchedulingPlugin(history, save_history=not config.getoption("shard")), "duration_scheduling"
+        )
+    
+    register_markers(config)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Con --shard=i/n, deja solo las pruebas del fragmento i."""
+    from src.utils.config import config as automation_config
+    shard = config.getoption("shard")
+    if not shard:
+        return
+    index, count = shard
+    history = DurationHistory.load(automation_config.get_durations_file(str(config.rootpath)))
+    plan = plan_shards(items, count, history, automation_config.get_shard_split_fixtures())
+    selected = plan["shards"][index - 1]
+    selected_ids = {id(item) for item in selected}
+    deselected = [item for item in items if id(item) not in selected_ids]
+    # Con pytest-xdist todos los workers calculan el mismo plan: el manifiesto lo escribe uno
+    if getattr(config, "workerinput", {}).get("workerid", "gw0") == "gw0":
+        config._shard_summary = (index, count, plan["loads"], write_shard_manifest(plan, index))
+    items[:] = selected
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_report_collectionfinish(config, items):
+    """Resume el fragmento seleccionado con --shard."""
+    summary = getattr(config, "_shard_summary", None)
+    if summary is None:
+        return None
+    index, count, loads, manifest = summary
+    others = ", ".join(f"{load:.1f}s" for load in loads)
+    return (f"fragmento {index}/{count}: {len(items)} pruebas, estimado {loads[index - 1]:.1f}s "
+            f"(fragmentos: {others}); manifiesto: {manifest}")
 
 
 def pytest_sessionstart(session):
     """Se ejecuta al inicio de la sesión de pruebas."""
     logger = logging.getLogger(__name__)
+    session.config._session_started = time.time()
+    if config.is_fake_winappdriver_enabled():
+        start_fake_winappdriver(session)
     logger.info("=== Iniciando sesión de pruebas automatizadas ===")
     logger.info(f"Configuración de WinAppDriver: {config.get_winappdriver_url()}")
     logger.info(f"Aplicación objetivo: {config.get_app_path()}")
+    # Antes de arrancar los workers de xdist (su pytest_sessionstart es trylast)
+    if config.is_preflight_enabled() and not hasattr(session.config, "workerinput"):
+        run_preflight_checks(session, logger)
+
+
+def pytest_report_header(config):
+    """Muestra la latencia de referencia medida en la validación del entorno."""
+    results = getattr(config, "_preflight", None)
+    if not results:
+        return None
+    from src.utils.preflight import baseline_latencies
+    latencies = baseline_latencies(results)
+    return "pre-flight: " + (", ".join(f"{url} {latency:.1f} ms" for url, latency in latencies.items())
+                             or "sin endpoints medidos")
 
 
 def pytest_sessionfinish(session, exitstatus):
     """Se ejecuta al final de la sesión de pruebas."""
     logger = logging.getLogger(__name__)
+    stop_grid(logger)
+    for fake_server in getattr(session.config, "_fake_winappdrivers", []):
+        fake_server.stop()
+    flush_screenshots(logger)
     if exitstatus == 0:
         logger.info("=== Todas las pruebas completadas exitosamente ===")
     else:
         logger.error(f"=== Sesión de pruebas terminada con errores (código: {exitstatus}) ===")
+    if hasattr(session.config, "workerinput"):
+        # El proceso principal une los logs y las métricas en cuanto terminan los workers
+        dump_command_metrics(logger, is_worker=True, merge_workers=False)
+        flush_logging()
+    else:
+        # Solo si la sesión se repartió entre workers (evita unir restos de ejecuciones anteriores)
+        distributed = session.config.pluginmanager.hasplugin("dsession")
+        dump_command_metrics(logger, is_worker=False, merge_workers=distributed)
+        if distributed:
+            merge_worker_outputs(logger)
+        export_timeline(logger, getattr(session.config, "_session_started", None))
+
+
+def run_preflight_checks(session, logger: logging.Logger) -> None:
+    """
+    Valida el entorno en paralelo y aborta la sesión si algo falla.
+    
+    Args:
+        session: Sesión de pytest
+        logger: Logger donde registrar el resultado
+    """
+    from src.utils.preflight import format_summary, run_preflight, write_baseline
+    
+    started = time.perf_counter()
+    results = run_preflight()
+    elapsed = time.perf_counter() - started
+    session.config._preflight = results
+    summary = format_summary(results)
+    try:
+        logger.info(f"Latencias de referencia: {write_baseline(results)}")
+    except OSError as e:
+        logger.warning(f"No se pudo escribir la validación del entorno: {str(e)}")
+    if all(item["ok"] for item in results):
+        logger.info(f"Validación del entorno superada en {elapsed:.2f}s:\n{summary}")
+        return
+    logger.error(f"Validación del entorno fallida en {elapsed:.2f}s:\n{summary}")
+    pytest.exit(f"validación del entorno fallida (PREFLIGHT_ENABLED):\n{summary}",
+                returncode=pytest.ExitCode.USAGE_ERROR)
+
+
+def dump_command_metrics(logger: logging.Logger, is_worker: bool, merge_workers: bool) -> None:
+    """
+    Vuelca los histogramas de latencia de los comandos del driver.
+    
+    El proceso principal registra además los comandos más lentos.
+    
+    Args:
+        logger: Logger donde registrar el resumen
+        is_worker: Si el proceso es un worker de xdist
+        merge_workers: Si sumar antes los volcados de los workers de xdist
+    """
+    from src.utils.metrics import command_metrics
+    
+    if not config.is_metrics_enabled():
+        return
+    try:
+        if merge_workers:
+            command_metrics.merge_worker_dumps()
+        path = command_metrics.dump()
+    except (OSError, ValueError) as e:
+        logger.error(f"Error al volcar las métricas de los comandos: {str(e)}")
+        return
+    if not is_worker:
+        slowest = command_metrics.slowest()
+        if slowest:
+            logger.info("Comandos más lentos (p90): " + ", ".join(
+                f"{name} {p90:.3f}s ({count})" for name, p90, count in slowest))
+        logger.info(f"Latencias de los comandos: {path}")
+
+
+def export_timeline(logger: logging.Logger, since: Optional[float]) -> None:
+    """Exporta la línea de tiempo de Chrome/Perfetto de la ejecución (todos los workers)."""
+    if not config.is_timeline_enabled():
+        return
+    from src.utils.timeline import export_timeline as write_timeline
+    try:
+        flush_logging()  # Vuelca la traza pendiente del proceso principal
+        path, spans = write_timeline(since=since)
+        logger.info(f"Línea de tiempo ({spans} spans): {path}")
+    except Exception as e:
+        logger.warning(f"No se pudo exportar la línea de tiempo: {str(e)}")
+
+
+def merge_worker_outputs(logger: logging.Logger) -> None:
+    """
+    Une los logs y las capturas de los workers de pytest-xdist.
+    
+    Args:
+        logger: Logger donde registrar el resultado
+    """
+    from src.utils.screenshots import merge_worker_artifacts
+    
+    flush_logging()
+    try:
+        merged_log = merge_worker_logs()
+        artifact_index = merge_worker_artifacts()
+    except OSError as e:
+        logger.error(f"Error al unir los resultados de los workers: {str(e)}")
+        return
+    if merged_log:
+        logger.info(f"Logs de los workers unidos en {merged_log}")
+    if artifact_index:
+        logger.info(f"Índice de capturas de los workers: {artifact_index}")
+
+
+def stop_grid(logger: logging.Logger) -> None:
+    """
+    Detiene el sondeo del grid de WinAppDriver y registra el uso de cada nodo.
+    
+    Args:
+        logger: Logger donde registrar el estado de los nodos
+    """
+    from src.drivers.grid import reset_grid
+    
+    for node in reset_grid() or []:
+        logger.info(
+            f"Nodo {node['url']}: {node['sessions']} sesiones, {node['failures']} fallos, "
+            f"{node['quarantines']} cuarentenas"
+        )
+
+
+def flush_screenshots(logger: logging.Logger) -> None:
+    """
+    Escribe las capturas pendientes y registra las métricas del escritor.
+    
+    Args:
+        logger: Logger donde registrar las métricas
+    """
+    from src.utils.screenshots import screenshot_policy, screenshot_store, screenshot_writer
+    
+    screenshot_writer.flush()
+    stats = screenshot_writer.get_stats()
+    if stats["submitted"]:
+        logger.info(
+            f"Capturas escritas en segundo plano: {stats['written']} "
+            f"(fallidas: {stats['failed']}, cola máxima: {stats['max_queue_depth']}, "
+            f"latencia media: {stats['avg_latency']:.3f}s, máxima: {stats['max_latency']:.3f}s)"
+        )
+    policy_stats = screenshot_policy.get_stats()
+    skipped = sum(value for key, value in policy_stats.items() if key.startswith("skipped_"))
+    if skipped:
+        logger.info(f"Capturas de fallo omitidas por la política: {skipped} ({policy_stats})")
+    store_stats = screenshot_store.get_stats()
+    if store_stats["deduplicated"]:
+        logger.info(
+            f"Capturas deduplicadas: {store_stats['deduplicated']} "
+            f"({store_stats['bytes_saved']} bytes ahorrados)"
+        )
+
+
+def start_fake_winappdriver(session):
+    """
+    Arranca el WinAppDriver simulado en la URL configurada.
+    
+    Si WINAPPDRIVER_URLS define un grid, arranca un servidor simulado por
+    nodo. Con pytest-xdist solo los arranca el proceso principal; los
+    workers comparten los mismos servidores a través de la configuración.
+    
+    Args:
+        session: Sesión de pytest
+    """
+    if hasattr(session.config, "workerinput"):
+        return
+    
+    from urllib.parse import urlparse
+    from src.drivers.fake_winappdriver import FakeWinAppDriver
+    
+    urls = [url for url, _ in config.get_winappdriver_urls()] or [config.get_winappdriver_url()]
+    session.config._fake_winappdrivers = []
+    for address in urls:
+        url = urlparse(address)
+        session.config._fake_winappdrivers.append(FakeWinAppDriver(
+            fixture=config.get_fake_winappdriver_fixture(),
+            host=url.hostname,
+            port=url.port or 4723,
+            latency=config.get_fake_winappdriver_latency(),
+            jitter=config.get_fake_winappdriver_jitter(),
+        ).start())
 
 
 @pytest.fixture(scope="session")
@@ -59,14 +325,58 @@ def app_config():
     return config
 
 
+@pytest.fixture(scope="session")
+def session_pool():
+    """
+    Fixture que proporciona el pool de sesiones WinAppDriver de la sesión.
+    
+    Las sesiones se crean por adelantado para que la primera prueba no
+    espere al arranque de la aplicación.
+    
+    Yields:
+        SessionPool: Pool de sesiones reutilizables
+    """
+    # Un circuito abierto por una ejecución anterior no debe bloquear el pool
+    session_breakers.reset()
+    pool = SessionPool()
+    try:
+        pool.warm_up()
+    except Exception:
+        pool.close()
+        raise
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def pooled_driver(session_pool):
+    """
+    Fixture que proporciona un driver tomado del pool de sesiones.
+    
+    La aplicación se reinicia al devolver la sesión al pool, por lo que cada
+    prueba comienza desde el estado inicial sin relanzar WinAppDriver.
+    
+    Yields:
+        webdriver.Remote: Instancia del driver configurado
+    """
+    with session_pool.session() as win_driver:
+        yield win_driver.get_driver()
+
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request):
     """
     Fixture que proporciona una instancia de WinAppDriver.
     
+    Si SESSION_POOL_ENABLED está activo, la sesión se toma del pool.
+    
     Yields:
         webdriver.Remote: Instancia del driver configurado
     """
+    if config.is_session_pool_enabled():
+        yield request.getfixturevalue("pooled_driver")
+        return
+    
     win_driver = None
     try:
         # Inicializar driver
@@ -118,6 +428,41 @@ def driver_with_app(request):
             win_driver.stop_driver()
 
 
+@pytest.fixture(scope="function")
+def fake_winappdriver():
+    """
+    Fixture que arranca un WinAppDriver simulado en un puerto libre.
+    
+    Apunta WINAPPDRIVER_URL al servidor durante la prueba y desactiva el
+    wait implícito para que las búsquedas fallidas sean inmediatas.
+    
+    Yields:
+        FakeWinAppDriver: Servidor simulado en ejecución
+    """
+    from unittest.mock import patch
+    from src.drivers.fake_winappdriver import FakeWinAppDriver
+    
+    session_breakers.reset()
+    with FakeWinAppDriver() as server:
+        with patch.dict(os.environ, {'WINAPPDRIVER_URL': server.url, 'IMPLICIT_WAIT': '0'}), \
+                patch.object(config, 'IMPLICIT_WAIT', 0):
+            yield server
+
+
+@pytest.fixture(scope="function")
+def fake_win_driver(fake_winappdriver):
+    """
+    Fixture que proporciona un WinAppDriver conectado al servidor simulado.
+    
+    Yields:
+        WinAppDriver: Driver con la sesión iniciada
+    """
+    win_driver = WinAppDriver("app.exe")
+    win_driver.start_driver()
+    yield win_driver
+    win_driver.stop_driver()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def test_logger(request):
     """
@@ -149,27 +494,31 @@ def screenshot_on_failure(request, driver):
     
     if request.node.rep_call.failed:
         try:
-            from src.utils.helpers import take_screenshot
-            test_name = request.node.name
-            screenshot_path = take_screenshot(driver, test_name, "failure")
-            
-            # Agregar screenshot al reporte de Allure si está disponible
-            try:
-                import allure
-                with open(screenshot_path, "rb") as image_file:
-                    allure.attach(
-                        image_file.read(),
-                        name=f"Screenshot - {test_name}",
-                        attachment_type=allure.attachment_type.PNG
-                    )
-            except ImportError:
-                pass  # Allure no está instalado
-                
+            # Una sola captura en memoria para Allure, pytest-html y disco
+            from src.utils.reporting import attach_failure_screenshot
+            attach_failure_screenshot(request.node, driver, request.node.name,
+                                      getattr(request.node, "call_error", None))
         except Exception as e:
             logger = logging.getLogger(__name__)
             logger.error(f"Error al tomar screenshot: {str(e)}")
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Registra en la traza el tiempo de preparación de cada fixture."""
+    from src.utils.tracing import tracer
+    with tracer.span("fixture", fixturedef.argname, scope=fixturedef.scope):
+        yield
+
+
+def pytest_runtest_setup(item):
+    """Reinicia la política de capturas de fallo y asocia la traza a cada prueba."""
+    from src.utils.screenshots import screenshot_policy
+    from src.utils.tracing import tracer
+    screenshot_policy.start_test(item.nodeid)
+    tracer.start_test(item.nodeid)
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
@@ -178,10 +527,20 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
+    if rep.when == "call" and call.excinfo is not None:
+        item.call_error = call.excinfo.value
+    
+    from src.utils.tracing import tracer
+    tracer.emit("test", rep.when, call.duration, rep.outcome, start=call.start)
+    
+    # Las capturas de fallo se toman en el teardown de screenshot_on_failure
+    screenshot_extras = getattr(item, "screenshot_extras", None)
+    if rep.when == "teardown" and screenshot_extras:
+        rep.extras = getattr(rep, "extras", []) + screenshot_extras
 
 
 # Marcadores personalizados
-def pytest_configure(config):
+def register_markers(config):
     """Configurar marcadores personalizados."""
     config.addinivalue_line(
         "markers", "smoke: Pruebas de smoke básicas"
@@ -212,8 +571,8 @@ def worker_id(request):
     """
     Fixture que proporciona el ID del worker para ejecución en paralelo.
     """
-    if hasattr(request.config, 'slaveinput'):
-        return request.config.slaveinput['slaveid']
+    if hasattr(request.config, 'workerinput'):
+        return request.config.workerinput['workerid']
     else:
         return 'master'
 
@@ -6,13 +6,14 @@ usando WinAppDriver.
 """
 
 import pytest
-import time
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 
 from src.pages.base_page import BasePage
 from src.data.test_data import TestData, LoginTestData
+from typing import Optional
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
 
@@ -39,10 +40,29 @@ class MainApplicationPage(BasePage):
         """
         self.send_keys_to_element(self.USERNAME_FIELD, username)
         self.send_keys_to_element(self.PASSWORD_FIELD, password)
+        baseline = self.get_ui_signature()
         self.click_element(self.LOGIN_BUTTON)
         
-        # Esperar un momento para que se procese el login
-        time.sleep(2)
+        # Esperar a que la aplicación procese el login (como máximo 2 s)
+        self.wait_for_ui_to_settle(baseline, change_timeout=2)
+    
+    def get_login_outcome(self, timeout: int = 10) -> Optional[str]:
+        """
+        Espera a que el login termine, ya sea con éxito o con error.
+        
+        Args:
+            timeout: Tiempo máximo de espera
+        
+        Returns:
+            str: 'success', 'error' o None si no aparece ninguno a tiempo
+        """
+        try:
+            outcome, _ = self.wait_for_any(
+                {"success": self.MAIN_MENU, "error": self.ERROR_MESSAGE}, timeout
+            )
+            return outcome
+        except TimeoutException:
+            return None
     
     def get_error_message(self) -> str:
         """
@@ -51,7 +71,7 @@ class MainApplicationPage(BasePage):
         Returns:
             str: Mensaje de error
         """
-        if self.is_element_visible(self.ERROR_MESSAGE, timeout=5):
+        if self.get_login_outcome(timeout=5) == "error":
             return self.get_element_text(self.ERROR_MESSAGE)
         return ""
     
@@ -62,7 +82,7 @@ class MainApplicationPage(BasePage):
         Returns:
             bool: True si está logueado
         """
-        return self.is_element_visible(self.MAIN_MENU, timeout=10)
+        return self.get_login_outcome(timeout=10) == "success"
     
     def get_window_title_text(self) -> str:
         """
@@ -181,10 +201,13 @@ class TestWPFApplicationBasicFunctionality:
         window_title = page.get_window_title_text()
         assert window_title, "La aplicación debería tener un título"
         
-        # Verificar que los elementos básicos están presentes
-        assert page.is_element_present(page.USERNAME_FIELD), "Campo username debería estar presente"
-        assert page.is_element_present(page.PASSWORD_FIELD), "Campo password debería estar presente"
-        assert page.is_element_present(page.LOGIN_BUTTON), "Botón login debería estar presente"
+        # Verificar que los elementos básicos están presentes (una sola petición)
+        present = page.are_elements_present(
+            [page.USERNAME_FIELD, page.PASSWORD_FIELD, page.LOGIN_BUTTON]
+        )
+        assert present[page.USERNAME_FIELD], "Campo username debería estar presente"
+        assert present[page.PASSWORD_FIELD], "Campo password debería estar presente"
+        assert present[page.LOGIN_BUTTON], "Botón login debería estar presente"
         
         # Tomar screenshot inicial
         page.take_screenshot("application_started")
@@ -200,6 +223,13 @@ class TestWPFApplicationBasicFunctionality:
         page = MainApplicationPage(driver)
         
         # Act & Assert
+        # Verificar con una sola petición que los elementos están habilitados
+        enabled = page.get_elements_attribute(
+            [page.USERNAME_FIELD, page.PASSWORD_FIELD, page.LOGIN_BUTTON], "IsEnabled"
+        )
+        assert all(value == "True" for value in enabled.values()), \
+            f"Los elementos deberían estar habilitados: {enabled}"
+        
         # Verificar que se puede escribir en el campo username
         page.send_keys_to_element(page.USERNAME_FIELD, "test")
         username_text = page.get_element_text(page.USERNAME_FIELD)
@@ -245,8 +275,8 @@ class TestWPFApplicationWorkflow:
         if page.is_element_visible(page.MAIN_MENU):
             page.take_screenshot("workflow_main_menu_visible")
         
-        # Simular alguna actividad adicional aquí
-        time.sleep(2)
+        # Esperar a que termine cualquier actividad pendiente de la interfaz
+        page.wait_for_ui_stable()
         
         page.take_screenshot("workflow_complete")
 
@@ -268,11 +298,12 @@ class TestWPFApplicationErrorHandling:
         # Act - Simular login lento
         page.send_keys_to_element(page.USERNAME_FIELD, "slow_user")
         page.send_keys_to_element(page.PASSWORD_FIELD, "slow_pass")
+        baseline = page.get_ui_signature()
         page.click_element(page.LOGIN_BUTTON)
         
         # Assert - Verificar que la aplicación maneja el timeout apropiadamente
         # (Esto dependerá del comportamiento específico de tu aplicación)
-        time.sleep(5)  # Simular espera
+        page.wait_for_ui_to_settle(baseline, change_timeout=5)
         
         # Verificar estado después del timeout
         page.take_screenshot("timeout_scenario")
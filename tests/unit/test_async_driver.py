@@ -0,0 +1,166 @@
+"""
+Pruebas unitarias para el cliente asíncrono de WinAppDriver.
+
+Se ejecutan contra el servidor simulado con asyncio.run(), sin plugins
+adicionales de pytest.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.drivers.async_winapp_driver import AsyncConnectionPool, AsyncWinAppDriver, command_name
+from src.pages.async_base_page import AsyncBasePage
+from src.utils.config import config
+from src.utils.metrics import command_metrics
+
+
+USERNAME_FIELD = (By.NAME, "txtUsername")
+PASSWORD_FIELD = (By.NAME, "txtPassword")
+LOGIN_BUTTON = (By.NAME, "btnLogin")
+MAIN_MENU = (By.NAME, "MainMenu")
+ERROR_LABEL = (AppiumBy.ACCESSIBILITY_ID, "lblError")
+
+
+async def login(page: AsyncBasePage, username: str, password: str) -> None:
+    """Completa el formulario de login y pulsa el botón."""
+    await page.send_keys_to_element(USERNAME_FIELD, username)
+    await page.send_keys_to_element(PASSWORD_FIELD, password)
+    await page.click_element(LOGIN_BUTTON)
+
+
+class TestAsyncWinAppDriver:
+    """Pruebas para AsyncWinAppDriver contra el servidor simulado."""
+    
+    def test_session_commands(self, fake_winappdriver):
+        """Prueba la sesión, búsqueda, texto y captura de pantalla."""
+        async def scenario():
+            async with AsyncWinAppDriver("app.exe") as driver:
+                field = await driver.find_element(*USERNAME_FIELD)
+                await field.send_keys("testuser")
+                return (await driver.title(), await field.get_text(),
+                        await driver.get_screenshot_as_png(), await driver.is_healthy())
+        
+        title, text, png, healthy = asyncio.run(scenario())
+        
+        assert title == "Aplicación WPF - Test"
+        assert text == "testuser"
+        assert png.startswith(b"\x89PNG")
+        assert healthy
+        assert fake_winappdriver.command_counts["deleteSession"] == 1
+    
+    def test_commands_recorded_with_sync_names(self, fake_winappdriver):
+        """Prueba que las métricas usan los nombres de comando del transporte síncrono."""
+        def count(name):
+            return command_metrics.to_dict()["commands"].get(name, {}).get("count", 0)
+        
+        async def scenario():
+            async with AsyncWinAppDriver("app.exe") as driver:
+                await (await driver.find_element(*USERNAME_FIELD)).click()
+                await driver.title()
+        
+        names = ("newSession", "findElement", "clickElement", "getTitle", "quit")
+        before = {name: count(name) for name in names}
+        asyncio.run(scenario())
+        
+        assert all(count(name) == before[name] + 1 for name in names)
+        assert command_name("GET", "/session/a/element/b/attribute/Name") == "getElementAttribute"
+        assert command_name("GET", "/status") == "GET /status"
+    
+    def test_w3c_errors_map_to_selenium_exceptions(self, fake_winappdriver):
+        """Prueba que 'no such element' lanza NoSuchElementException."""
+        async def scenario():
+            async with AsyncWinAppDriver("app.exe") as driver:
+                await driver.find_element(By.NAME, "noExiste")
+        
+        with pytest.raises(NoSuchElementException):
+            asyncio.run(scenario())
+    
+    def test_sessions_share_connection_pool(self, fake_winappdriver):
+        """Prueba que muchas sesiones concurrentes reutilizan pocas conexiones."""
+        fake_winappdriver.latency = {"default": 0.05}
+        pool = AsyncConnectionPool(max_connections=4)
+        
+        async def one_session():
+            async with AsyncWinAppDriver("app.exe", pool=pool) as driver:
+                await driver.find_element(*USERNAME_FIELD)
+                return await driver.title()
+        
+        async def scenario():
+            try:
+                return await asyncio.gather(*(one_session() for _ in range(8)))
+            finally:
+                await pool.close()
+        
+        start = time.monotonic()
+        titles = asyncio.run(scenario())
+        elapsed = time.monotonic() - start
+        
+        # 8 sesiones x 5 comandos a 50 ms serían 2 s en serie
+        assert titles == ["Aplicación WPF - Test"] * 8
+        assert elapsed < 1.5
+        assert pool.stats["opened"] <= 4
+        assert pool.stats["reused"] > 0
+
+
+class TestAsyncBasePage:
+    """Pruebas para AsyncBasePage contra el servidor simulado."""
+    
+    def test_concurrent_logins(self, fake_winappdriver):
+        """Prueba logins concurrentes con resultados distintos por sesión."""
+        async def run(username, password, locator):
+            async with AsyncWinAppDriver("app.exe") as driver:
+                page = AsyncBasePage(driver)
+                await login(page, username, password)
+                return await page.is_element_visible(locator, timeout=3)
+        
+        async def scenario():
+            return await asyncio.gather(
+                run("testuser", "testpass123", MAIN_MENU),
+                run("otro", "clave", ERROR_LABEL),
+            )
+        
+        assert asyncio.run(scenario()) == [True, True]
+    
+    def test_presence_and_timeout(self, fake_winappdriver):
+        """Prueba las comprobaciones sin espera y el agotamiento del tiempo."""
+        async def scenario():
+            async with AsyncWinAppDriver("app.exe") as driver:
+                page = AsyncBasePage(driver)
+                present = await page.is_element_present(USERNAME_FIELD)
+                absent = await page.is_element_present(MAIN_MENU)
+                with pytest.raises(TimeoutException):
+                    await page.wait_until(lambda: page.is_element_present(MAIN_MENU),
+                                          timeout=0.2, poll_interval=0.05)
+                return present, absent
+        
+        assert asyncio.run(scenario()) == (True, False)
+    
+    def test_concurrent_screenshots_use_shared_pipeline(self, fake_winappdriver):
+        """Prueba que las capturas de sesiones concurrentes no se sobrescriben entre sí."""
+        async def capture():
+            async with AsyncWinAppDriver("app.exe") as driver:
+                return await AsyncBasePage(driver).take_screenshot("paso")
+        
+        async def scenario():
+            return await asyncio.gather(capture(), capture())
+        
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOT_ASYNC", False), \
+                patch.object(config, "SCREENSHOT_DEDUP", False):
+            paths = asyncio.run(scenario())
+            
+            assert len(set(paths)) == 2
+            assert all(os.path.dirname(path) == config.get_screenshots_dir() for path in paths)
+            assert all(Path(path).read_bytes().startswith(b"\x89PNG") for path in paths)
@@ -0,0 +1,157 @@
+"""
+Pruebas unitarias para el circuit breaker de la creación de sesiones.
+"""
+
+import os
+import socket
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from selenium.common.exceptions import SessionNotCreatedException
+from src.drivers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, CircuitOpenError
+from src.drivers.fake_winappdriver import FakeWinAppDriver
+from src.drivers.grid import reset_grid
+from src.drivers.winapp_driver import WinAppDriver
+from src.utils.circuit_breaker_plugin import USER_PROPERTY, CircuitBreakerPlugin
+
+
+def dead_url():
+    """URL de un puerto local en el que no escucha nadie."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+class TestCircuitBreaker:
+    """Pruebas de los estados del circuito."""
+    
+    def test_opens_after_consecutive_connection_failures(self):
+        """Prueba que solo los fallos de conexión seguidos abren el circuito."""
+        breaker = CircuitBreaker(threshold=2, cooldown=60, enabled=True)
+        
+        breaker.record_failure(ConnectionRefusedError("rechazada"))
+        breaker.record_failure(SessionNotCreatedException("la aplicación no arranca"))
+        breaker.record_failure(ValueError("no llegó al servidor"))
+        breaker.record_failure(ConnectionRefusedError("rechazada"))
+        assert breaker.state == CLOSED
+        
+        breaker.record_failure(ConnectionRefusedError("rechazada"))
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError, match="2 fallos de conexión"):
+            breaker.before_call()
+        assert breaker.rejected == 1
+    
+    def test_half_open_probe(self):
+        """Prueba que tras el cooldown pasa un único sondeo que cierra o reabre el circuito."""
+        breaker = CircuitBreaker(threshold=1, cooldown=0.05, enabled=True)
+        breaker.record_failure(TimeoutError("sin respuesta"))
+        time.sleep(0.06)
+        
+        breaker.before_call()  # Sondeo
+        with pytest.raises(CircuitOpenError, match="sondeo en curso"):
+            breaker.before_call()
+        breaker.record_failure(TimeoutError("sin respuesta"))
+        assert breaker.state == OPEN
+        
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record_success()
+        breaker.before_call()
+        
+        assert [(item["from"], item["to"]) for item in breaker.drain()] == [
+            (CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)
+        ]
+        assert breaker.drain() == []
+    
+    def test_disabled(self):
+        """Prueba que desactivado nunca rechaza."""
+        breaker = CircuitBreaker(threshold=1, enabled=False)
+        breaker.record_failure(ConnectionRefusedError("rechazada"))
+        breaker.before_call()
+        assert breaker.state == CLOSED
+    
+    def test_plugin_collects_transitions(self):
+        """Prueba que el plugin reúne los cambios de estado de los reportes."""
+        plugin = CircuitBreakerPlugin(BreakerRegistry(enabled=True))
+        transition = {"ts": time.time(), "endpoint": "http://10.0.0.5:4723", "from": CLOSED, "to": OPEN,
+                      "failures": 3, "reason": "ConnectionRefusedError", "test": "t", "worker": "gw1"}
+        report = type("Report", (), {"user_properties": [(USER_PROPERTY, [transition])]})()
+        
+        plugin.pytest_runtest_logreport(report)
+        
+        assert plugin.transitions == [transition]
+        assert plugin.summary_lines()[0].endswith(
+            "gw1 http://10.0.0.5:4723: closed -> open (ConnectionRefusedError)")
+    
+    def test_registry_keeps_one_breaker_per_endpoint(self):
+        """Prueba que cada endpoint tiene su circuito y que reset() los cierra todos."""
+        breakers = BreakerRegistry(threshold=1, cooldown=60, enabled=True)
+        breakers.get("http://a:4723/").record_failure(ConnectionRefusedError("rechazada"))
+        
+        assert breakers.get("http://a:4723") is breakers.get("http://a:4723/")
+        assert breakers.get("http://a:4723").state == OPEN
+        assert breakers.get("http://b:4723").state == CLOSED
+        assert [transition["endpoint"] for transition in breakers.drain()] == ["http://a:4723"]
+        
+        breakers.reset()
+        breakers.get("http://a:4723").before_call()
+
+
+class TestStartDriverShortCircuit:
+    """Pruebas de start_driver() con WinAppDriver caído."""
+    
+    def test_fails_fast_when_open(self):
+        """Prueba que con el circuito abierto start_driver() no intenta conectar."""
+        dead = dead_url()
+        breakers = BreakerRegistry(threshold=2, cooldown=60, enabled=True)
+        
+        with patch.dict(os.environ, {"WINAPPDRIVER_URL": dead, "WINAPPDRIVER_URLS": ""}):
+            for _ in range(2):
+                win_driver = WinAppDriver("App.exe")
+                win_driver.breakers = breakers
+                with pytest.raises(Exception) as error:
+                    win_driver.start_driver()
+                assert not isinstance(error.value, CircuitOpenError)
+            
+            win_driver = WinAppDriver("App.exe")
+            win_driver.breakers = breakers
+            with patch.object(win_driver, "_new_session") as new_session:
+                with pytest.raises(CircuitOpenError):
+                    win_driver.start_driver()
+        
+        new_session.assert_not_called()
+        assert breakers.get(dead).state == OPEN
+    
+    def test_open_endpoint_does_not_block_others(self):
+        """Prueba que el circuito abierto de un endpoint no bloquea las sesiones en otro."""
+        dead = dead_url()
+        breakers = BreakerRegistry(threshold=1, cooldown=60, enabled=True)
+        breakers.get(dead).record_failure(ConnectionRefusedError("rechazada"))
+        
+        with FakeWinAppDriver() as server:
+            with patch.dict(os.environ, {"WINAPPDRIVER_URL": server.url, "WINAPPDRIVER_URLS": ""}):
+                win_driver = WinAppDriver("App.exe")
+                win_driver.breakers = breakers
+                win_driver.start_driver()
+                win_driver.stop_driver()
+            
+            # En el grid, el nodo con el circuito abierto se salta sin intentar conectar
+            reset_grid()
+            try:
+                with patch.dict(os.environ, {"WINAPPDRIVER_URLS": f"{dead}=1,{server.url}=1",
+                                             "GRID_PROBE_INTERVAL": "0", "PYTEST_XDIST_WORKER": ""}):
+                    win_driver = WinAppDriver("App.exe")
+                    win_driver.breakers = breakers
+                    win_driver.start_driver()
+                    node = win_driver.grid_node.url
+                    win_driver.stop_driver()
+            finally:
+                reset_grid()
+        
+        assert node == server.url
+        assert breakers.get(dead).state == OPEN
+        assert breakers.get(server.url).state == CLOSED
@@ -0,0 +1,128 @@
+"""
+Pruebas unitarias para los drivers del proyecto.
+
+Estas pruebas verifican el comportamiento de los drivers sin necesidad
+de un WinAppDriver real.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.drivers.winapp_driver import SessionPool
+
+
+def fake_driver_factory(app_path=None):
+    """Crea un WinAppDriver simulado que siempre está saludable."""
+    win_driver = Mock()
+    win_driver.app_path = app_path
+    win_driver.is_healthy.return_value = True
+    return win_driver
+
+
+class TestSessionPool:
+    """Pruebas para el pool de sesiones."""
+    
+    def test_session_is_reused_between_acquires(self):
+        """Prueba que una sesión devuelta se reutiliza."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+        
+        assert first is second
+        assert pool.stats["created"] == 1
+        assert pool.stats["reused"] == 1
+        first.reset_app.assert_called_once()
+    
+    def test_session_is_recycled_after_max_uses(self):
+        """Prueba que una sesión se descarta al alcanzar el máximo de usos."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=2,
+                           driver_factory=fake_driver_factory)
+        
+        first = pool.acquire()
+        pool.release(first)
+        pool.release(pool.acquire())
+        third = pool.acquire()
+        
+        assert third is not first
+        first.stop_driver.assert_called_once()
+        assert pool.stats["created"] == 2
+    
+    def test_unhealthy_session_is_replaced(self):
+        """Prueba que una sesión que no responde se sustituye."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        
+        first = pool.acquire()
+        pool.release(first)
+        first.is_healthy.return_value = False
+        second = pool.acquire()
+        
+        assert second is not first
+        first.stop_driver.assert_called_once()
+        assert pool.stats["discarded"] == 1
+    
+    def test_failed_reset_discards_session(self):
+        """Prueba que una sesión que no se puede reiniciar se descarta."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        
+        first = pool.acquire()
+        first.reset_app.side_effect = Exception("App no responde")
+        pool.release(first)
+        
+        first.stop_driver.assert_called_once()
+        assert pool.acquire() is not first
+    
+    def test_acquire_times_out_when_pool_is_exhausted(self):
+        """Prueba que acquire falla si no hay sesiones libres."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        pool.acquire()
+        
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+    
+    def test_warm_up_and_close(self):
+        """Prueba la creación anticipada y el cierre del pool."""
+        pool = SessionPool(app_path="app.exe", max_size=2, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        
+        pool.warm_up()
+        idle = list(pool._idle)
+        pool.close()
+        
+        assert len(idle) == 2
+        for win_driver in idle:
+            win_driver.start_driver.assert_called_once()
+            win_driver.stop_driver.assert_called_once()
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+    
+    def test_failed_warm_up_returns_slot(self):
+        """Prueba que una sesión que no arranca al precalentar no deja el hueco ocupado."""
+        failing = fake_driver_factory()
+        failing.start_driver.side_effect = ConnectionError("WinAppDriver no responde")
+        factory = Mock(side_effect=[failing, fake_driver_factory()])
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5, driver_factory=factory)
+        
+        with pytest.raises(ConnectionError):
+            pool.warm_up()
+        
+        assert pool._in_use == 0
+        assert pool.acquire(timeout=0.05) is not failing
+    
+    def test_session_context_manager_releases(self):
+        """Prueba que el context manager devuelve la sesión al pool."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5,
+                           driver_factory=fake_driver_factory)
+        
+        with pool.session() as win_driver:
+            assert win_driver.app_path == "app.exe"
+        
+        assert pool._idle == [win_driver]
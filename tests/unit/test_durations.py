@@ -0,0 +1,199 @@
+"""
+Pruebas unitarias para el reparto de pruebas por duración.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.utils.config import Config
+from src.utils.durations import (
+    DEFAULT_DURATION, DurationHistory, DurationScheduling, DurationSchedulingPlugin, lpt_assign,
+    parse_shard, plan_shards, shard_groups, write_shard_manifest,
+)
+
+
+def fake_node(worker_id):
+    """Simula un WorkerController de xdist."""
+    return Mock(gateway=Mock(id=worker_id), shutting_down=False)
+
+
+class TestLptAssign:
+    """Pruebas para el reparto LPT."""
+    
+    def test_longest_first_to_least_loaded(self):
+        """Prueba que las pruebas largas no acaban en el mismo worker."""
+        assignments, loads = lpt_assign([10.0, 9.0, 1.0, 1.0, 1.0, 8.0], 2)
+        
+        assert sorted(loads) == [13.0, 17.0]
+        assert {assignments[0][0], assignments[1][0]} == {0, 1}
+        assert sorted(assignments, key=len) == [[1, 5], [0, 2, 3, 4]]
+    
+    def test_more_bins_than_tasks(self):
+        """Prueba que sobran workers sin pruebas asignadas."""
+        assignments, loads = lpt_assign([2.0], 3)
+        
+        assert assignments == [[0], [], []]
+        assert loads == [2.0, 0.0, 0.0]
+
+
+class TestDurationHistory:
+    """Pruebas para el historial de duraciones."""
+    
+    def test_unseen_tests_use_module_median(self):
+        """Prueba la estimación de pruebas sin historial."""
+        history = DurationHistory({
+            "tests/test_login.py::test_a": 4.0,
+            "tests/test_login.py::test_b": 6.0,
+            "tests/test_menu.py::test_c": 1.0,
+        }, path="unused.json")
+        
+        predictions, unseen = history.predict([
+            "tests/test_login.py::test_a", "tests/test_login.py::test_nueva",
+            "tests/test_otro.py::test_d",
+        ])
+        
+        assert unseen == 2
+        assert predictions["tests/test_login.py::test_a"] == 4.0
+        assert predictions["tests/test_login.py::test_nueva"] == 5.0
+        assert predictions["tests/test_otro.py::test_d"] == 4.0  # Mediana global
+        assert DurationHistory({}, path="unused.json").predict(["t"])[0]["t"] == DEFAULT_DURATION
+    
+    def test_record_save_and_load(self):
+        """Prueba la media móvil y la persistencia del historial."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "durations.json")
+            history = DurationHistory.load(path)
+            history.record("tests/test_login.py::test_a", 4.0)
+            history.record("tests/test_login.py::test_a", 2.0)
+            history.save()
+            
+            assert DurationHistory.load(path).durations == {"tests/test_login.py::test_a": 3.0}
+            with open(path, "w", encoding="utf-8") as history_file:
+                history_file.write("{dañado")
+            assert DurationHistory.load(path).durations == {}
+
+
+class TestDurationScheduling:
+    """Pruebas para el planificador de xdist."""
+    
+    def test_initial_distribution_is_balanced(self):
+        """Prueba que el reparto inicial equilibra la duración estimada por worker."""
+        collection = [f"tests/test_app.py::test_{number}" for number in range(6)]
+        history = DurationHistory(dict(zip(collection, [10.0, 9.0, 1.0, 1.0, 1.0, 8.0])), path="unused.json")
+        scheduler = DurationScheduling(Mock(getvalue=Mock(return_value=["2*popen"])), history=history)
+        nodes = [fake_node("gw0"), fake_node("gw1")]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(node, collection)
+        
+        scheduler.schedule()
+        
+        assert scheduler.predicted == {"gw0": 13.0, "gw1": 17.0}
+        sent = [node.send_runtest_some.call_args[0][0] for node in nodes]
+        assert sorted(index for indices in sent for index in indices) == list(range(6))
+        assert {sent[0][0], sent[1][0]} == {0, 1}  # Las dos más largas, una en cada worker
+        assert scheduler.pending == []
+
+
+def fake_item(nodeid, session_fixtures=()):
+    """Simula un item de pytest que usa fixtures de sesión del proyecto."""
+    fixturedefs = {name: [Mock(scope="session", baseid="tests")] for name in session_fixtures}
+    fixturedefs["tmp_path_factory"] = [Mock(scope="session", baseid="")]
+    return Mock(nodeid=nodeid, _fixtureinfo=Mock(name2fixturedefs=fixturedefs))
+
+
+class TestSharding:
+    """Pruebas para el reparto entre máquinas de CI (--shard)."""
+    
+    def test_parse_shard(self):
+        """Prueba el formato i/n de --shard."""
+        assert parse_shard("2/3") == (2, 3)
+        for value in ("0/3", "4/3", "2", "a/b"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_shard(value)
+    
+    def test_session_fixtures_keep_tests_together(self):
+        """Prueba que las pruebas que comparten un fixture de sesión quedan juntas."""
+        items = [
+            fake_item("tests/test_a.py::test_1", ["session_pool"]),
+            fake_item("tests/test_b.py::test_2"),
+            fake_item("tests/test_c.py::test_3", ["session_pool", "servidor"]),
+            fake_item("tests/test_d.py::test_4", ["servidor", "test_data"]),
+            fake_item("tests/test_e.py::test_5", ["test_data"]),
+        ]
+        
+        groups = shard_groups(items, split_fixtures=["test_data"])
+        
+        assert [[item.nodeid[-6:] for item in group] for group in groups] == [
+            ["test_1", "test_3", "test_4"], ["test_2"], ["test_5"],
+        ]
+    
+    def test_plan_is_balanced_and_deterministic(self):
+        """Prueba que el plan cubre todas las pruebas y no cambia entre ejecuciones."""
+        items = [fake_item(f"tests/test_app.py::test_{number}") for number in range(8)]
+        history = DurationHistory({item.nodeid: float(number + 1) for number, item in enumerate(items)},
+                                  path="unused.json")
+        
+        plan = plan_shards(items, 3, history)
+        
+        assert sorted(item.nodeid for shard in plan["shards"] for item in shard) == sorted(
+            item.nodeid for item in items)
+        assert sorted(plan["loads"]) == [11.0, 12.0, 13.0]
+        assert [[item.nodeid for item in shard] for shard in plan_shards(items, 3, history)["shards"]] == [
+            [item.nodeid for item in shard] for shard in plan["shards"]]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = write_shard_manifest(plan, 2, temp_dir)
+            with open(path, encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        
+        assert os.path.basename(path) == "shard-2-of-3.json"
+        assert [test["nodeid"] for test in manifest["tests"]] == [item.nodeid for item in plan["shards"][1]]
+        assert manifest["predicted_seconds"] == plan["loads"][1]
+    
+    def test_shard_runs_do_not_diverge_history(self):
+        """Prueba que los agentes con --shard no reescriben el historial y todos calculan el mismo plan."""
+        items = [fake_item(f"tests/test_app.py::test_{number}") for number in range(8)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "durations.json")
+            committed = DurationHistory({item.nodeid: float(number + 1) for number, item in enumerate(items)},
+                                        path)
+            committed.save()
+            
+            plans = []
+            for agent in range(2):
+                plan = plan_shards(items, 2, DurationHistory.load(path))
+                plans.append(plan)
+                # El agente ejecuta su fragmento con duraciones distintas a las del historial
+                plugin = DurationSchedulingPlugin(DurationHistory.load(path), save_history=False)
+                for item in plan["shards"][agent]:
+                    plugin.pytest_runtest_logreport(Mock(nodeid=item.nodeid, duration=30.0 * (agent + 1),
+                                                         when="teardown", node=None))
+                plugin.pytest_sessionfinish(Mock())
+            
+            assert DurationHistory.load(path).durations == committed.durations
+        
+        # Aunque los historiales en memoria divergieran, cada plan es una partición de la colección
+        diverged = DurationHistory({item.nodeid: 10.0 - number for number, item in enumerate(items)}, "unused.json")
+        for plan in plans + [plan_shards(items, 2, diverged)]:
+            assert sorted(item.nodeid for shard in plan["shards"] for item in shard) == sorted(
+                item.nodeid for item in items)
+        executed = plans[0]["shards"][0] + plans[1]["shards"][1]
+        assert sorted(item.nodeid for item in executed) == sorted(item.nodeid for item in items)
+    
+    def test_relative_durations_file_resolved_from_rootdir(self):
+        """Prueba que una ruta relativa del historial no depende del directorio de trabajo."""
+        app_config = Config()
+        app_config.DURATIONS_FILE = ".test_durations.json"
+        
+        assert app_config.get_durations_file("/repo") == os.path.join("/repo", ".test_durations.json")
+        assert app_config.get_durations_file() == ".test_durations.json"
+        app_config.DURATIONS_FILE = os.path.abspath("historial.json")
+        assert app_config.get_durations_file("/repo") == app_config.DURATIONS_FILE
@@ -0,0 +1,109 @@
+"""
+Pruebas unitarias para el WinAppDriver simulado.
+
+Estas pruebas usan el cliente real (Appium/Selenium) contra el servidor
+simulado para validar el protocolo sin necesidad de Windows.
+"""
+
+import time
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from src.drivers.fake_winappdriver import load_ui_tree
+from src.drivers.winapp_driver import SessionPool
+
+
+class TestFakeWinAppDriver:
+    """Pruebas para el servidor simulado."""
+    
+    def test_load_default_fixture(self):
+        """Prueba la carga del árbol de interfaz de ejemplo."""
+        definition = load_ui_tree()
+        
+        assert definition["window"]["control_type"] == "Window"
+        assert definition["window"]["children"]
+    
+    def test_session_and_window_commands(self, fake_win_driver):
+        """Prueba la creación de sesión y los comandos de ventana."""
+        driver = fake_win_driver.get_driver()
+        
+        assert driver.title == "Aplicación WPF - Test"
+        assert len(driver.window_handles) == 1
+        assert driver.get_screenshot_as_png().startswith(b"\x89PNG")
+        assert "txtUsername" in driver.page_source
+    
+    def test_valid_login_shows_main_menu(self, fake_win_driver):
+        """Prueba que las reglas on_click simulan el login."""
+        driver = fake_win_driver.get_driver()
+        
+        driver.find_element(By.NAME, "txtUsername").send_keys("testuser")
+        driver.find_element(By.NAME, "txtPassword").send_keys("testpass123")
+        driver.find_element(By.NAME, "btnLogin").click()
+        
+        assert driver.find_elements(By.NAME, "MainMenu") == []
+        time.sleep(0.6)
+        assert driver.find_element(By.XPATH, "//Menu[@Name='MainMenu']").is_displayed()
+    
+    def test_invalid_login_shows_error(self, fake_win_driver):
+        """Prueba que un login inválido muestra el mensaje de error."""
+        driver = fake_win_driver.get_driver()
+        
+        driver.find_element(By.NAME, "txtUsername").send_keys("otro")
+        driver.find_element(By.NAME, "btnLogin").click()
+        time.sleep(0.4)
+        
+        error = driver.find_element(AppiumBy.ACCESSIBILITY_ID, "lblError")
+        assert error.text == "Usuario o contraseña incorrectos"
+    
+    def test_missing_element_raises(self, fake_win_driver):
+        """Prueba que un elemento inexistente devuelve 'no such element'."""
+        with pytest.raises(NoSuchElementException):
+            fake_win_driver.get_driver().find_element(By.NAME, "noExiste")
+    
+    def test_reset_app_makes_elements_stale(self, fake_win_driver):
+        """Prueba que reiniciar la aplicación invalida las referencias."""
+        driver = fake_win_driver.get_driver()
+        field = driver.find_element(By.NAME, "txtUsername")
+        field.send_keys("texto")
+        
+        fake_win_driver.reset_app()
+        
+        with pytest.raises(StaleElementReferenceException):
+            field.text
+        assert driver.find_element(By.NAME, "txtUsername").text == ""
+    
+    def test_latency_and_command_counts(self, fake_winappdriver, fake_win_driver):
+        """Prueba la latencia configurada y el conteo de comandos."""
+        fake_winappdriver.latency = {"default": 0.0, "getTitle": 0.1}
+        fake_winappdriver.reset_counts()
+        
+        start = time.monotonic()
+        fake_win_driver.get_driver().title
+        
+        assert time.monotonic() - start >= 0.1
+        assert fake_winappdriver.command_counts == {"getTitle": 1}
+
+
+class TestSessionPoolWithFakeServer:
+    """Pruebas del pool de sesiones contra el servidor simulado."""
+    
+    def test_pool_reuses_session_and_resets_app(self, fake_winappdriver):
+        """Prueba que el pool reutiliza la sesión y reinicia la aplicación."""
+        pool = SessionPool(app_path="app.exe", max_size=1, max_uses=5)
+        
+        with pool.session() as win_driver:
+            win_driver.get_driver().find_element(By.NAME, "txtUsername").send_keys("x")
+        with pool.session() as reused:
+            text = reused.get_driver().find_element(By.NAME, "txtUsername").text
+        pool.close()
+        
+        assert reused is win_driver
+        assert text == ""
+        assert fake_winappdriver.command_counts["newSession"] == 1
+        assert fake_winappdriver.command_counts["deleteSession"] == 1
@@ -0,0 +1,122 @@
+"""
+Pruebas unitarias para el grid de varios WinAppDriver.
+"""
+
+import os
+import socket
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.drivers.fake_winappdriver import FakeWinAppDriver
+from src.drivers.grid import WinAppDriverGrid, get_grid, reset_grid
+from src.drivers.winapp_driver import WinAppDriver
+
+
+def unused_url():
+    """URL de un puerto local en el que no escucha nadie."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def fake_nodes():
+    """Dos WinAppDriver simulados que hacen de nodos del grid."""
+    with FakeWinAppDriver() as first, FakeWinAppDriver() as second:
+        yield first, second
+
+
+@pytest.fixture
+def grid_env():
+    """Configura WINAPPDRIVER_URLS durante la prueba y descarta el grid al terminar."""
+    def configure(value):
+        reset_grid()
+        # Sin worker de xdist, el reparto empieza siempre por el primer nodo
+        patcher = patch.dict(os.environ, {"WINAPPDRIVER_URLS": value, "GRID_PROBE_INTERVAL": "0",
+                                          "PYTEST_XDIST_WORKER": ""})
+        patcher.start()
+        patches.append(patcher)
+    
+    patches = []
+    yield configure
+    reset_grid()
+    for patcher in patches:
+        patcher.stop()
+
+
+class TestWinAppDriverGrid:
+    """Pruebas del reparto y la cuarentena de nodos."""
+    
+    def test_least_loaded_routing_respects_capacity(self):
+        """Prueba que cada sesión va al nodo con menor carga relativa."""
+        grid = WinAppDriverGrid([("http://a:4723", 2), ("http://b:4723", 1)], probe_interval=0)
+        
+        urls = [grid.acquire(timeout=0.1).url for _ in range(3)]
+        
+        assert sorted(urls) == ["http://a:4723", "http://a:4723", "http://b:4723"]
+        with pytest.raises(TimeoutError):
+            grid.acquire(timeout=0.05)
+        grid.release(grid.nodes[1])
+        assert grid.acquire(timeout=0.1).url == "http://b:4723"
+    
+    def test_failing_node_is_quarantined(self):
+        """Prueba que tras varios fallos el nodo deja de recibir sesiones."""
+        grid = WinAppDriverGrid([("http://a:4723", 4), ("http://b:4723", 4)], probe_interval=0,
+                                failure_threshold=2, quarantine_seconds=60)
+        node_a = grid.nodes[0]
+        for _ in range(2):
+            grid.release(grid.acquire(exclude=["http://b:4723"]), error=ConnectionError("caído"))
+        
+        assert [grid.acquire().url for _ in range(3)] == ["http://b:4723"] * 3
+        assert grid.get_stats()[0]["quarantined"] is True
+        grid.report_success(node_a)  # Un sondeo correcto no levanta la cuarentena
+        with pytest.raises(RuntimeError):
+            grid.acquire(exclude=["http://b:4723"])
+    
+    def test_probes(self, fake_nodes):
+        """Prueba el sondeo de /status contra nodos vivos y caídos."""
+        dead = unused_url()
+        grid = WinAppDriverGrid([(fake_nodes[0].url, 1), (dead, 1)], probe_interval=0,
+                                probe_timeout=1, failure_threshold=1)
+        
+        assert grid.probe_all() == {fake_nodes[0].url: True, dead: False}
+        assert grid.acquire(timeout=0.1).url == fake_nodes[0].url
+        assert [node["quarantined"] for node in grid.get_stats()] == [False, True]
+
+
+class TestGridRouting:
+    """Pruebas de start_driver() contra varios servidores simulados."""
+    
+    def test_sessions_are_spread_across_nodes(self, fake_nodes, grid_env):
+        """Prueba que start_driver() reparte las sesiones sin cambiar el código de la prueba."""
+        grid_env(",".join(f"{server.url}=2" for server in fake_nodes))
+        drivers = [WinAppDriver("App.exe") for _ in range(4)]
+        try:
+            for win_driver in drivers:
+                win_driver.start_driver()
+            
+            assert [len(server.sessions) for server in fake_nodes] == [2, 2]
+            with pytest.raises(TimeoutError):
+                get_grid().acquire(timeout=0.05)  # Los cuatro huecos están ocupados
+        finally:
+            for win_driver in drivers:
+                win_driver.stop_driver()
+        
+        assert [node["active"] for node in get_grid().get_stats()] == [0, 0]
+    
+    def test_failover_to_healthy_node(self, fake_nodes, grid_env):
+        """Prueba que si un nodo no responde la sesión se crea en otro."""
+        dead = unused_url()
+        grid_env(f"{dead}=4,{fake_nodes[0].url}=1")
+        win_driver = WinAppDriver("App.exe")
+        try:
+            win_driver.start_driver()
+            
+            assert win_driver.grid_node.url == fake_nodes[0].url
+            assert len(fake_nodes[0].sessions) == 1
+            assert get_grid().get_stats()[0]["failures"] == 1
+        finally:
+            win_driver.stop_driver()
@@ -0,0 +1,117 @@
+"""
+Pruebas unitarias para los histogramas de latencia de los comandos.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from src.utils.config import config
+from src.utils.metrics import CommandMetrics, LatencyHistogram, command_metrics
+
+
+class TestLatencyHistogram:
+    """Pruebas para el histograma de latencias."""
+    
+    def test_quantiles_are_estimated_within_bucket(self):
+        """Prueba la estimación de percentiles a partir de los buckets."""
+        histogram = LatencyHistogram((0.1, 0.2, 0.5))
+        for seconds in [0.05] * 90 + [0.4] * 10:
+            histogram.observe(seconds)
+        
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) <= 0.1
+        assert 0.2 <= histogram.quantile(0.95) <= 0.4
+        assert histogram.to_dict()["counts"] == [90, 0, 10, 0]
+    
+    def test_merge_round_trip(self):
+        """Prueba que un histograma serializado se puede sumar a otro."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.observe(0.01)
+        second.observe(3.0)
+        
+        first.merge(LatencyHistogram.from_dict(second.to_dict()))
+        
+        assert first.count == 2
+        assert first.min == 0.01
+        assert first.max == 3.0
+
+
+class TestCommandMetrics:
+    """Pruebas para las métricas por comando y estrategia."""
+    
+    def test_commands_and_strategies(self):
+        """Prueba que las búsquedas se agregan también por estrategia."""
+        metrics = CommandMetrics()
+        metrics.observe("findElement", 0.3, "accessibility id")
+        metrics.observe("findElement", 0.1, "xpath")
+        metrics.observe("clickElement", 0.02)
+        
+        data = metrics.to_dict()
+        
+        assert data["commands"]["findElement"]["count"] == 2
+        assert set(data["strategies"]) == {"accessibility id", "xpath"}
+        assert metrics.slowest(1)[0][0] == "findElement"
+    
+    def test_prometheus_text(self):
+        """Prueba el formato de texto de Prometheus con buckets acumulativos."""
+        metrics = CommandMetrics(buckets=(0.1, 1.0))
+        metrics.observe("findElement", 0.05, "xpath")
+        metrics.observe("findElement", 0.5, "xpath")
+        
+        text = metrics.to_prometheus()
+        
+        assert "# TYPE winappdriver_command_duration_seconds histogram" in text
+        assert 'winappdriver_command_duration_seconds_bucket{command="findElement",le="0.1"} 1' in text
+        assert 'winappdriver_command_duration_seconds_bucket{command="findElement",le="+Inf"} 2' in text
+        assert 'winappdriver_find_duration_seconds_count{strategy="xpath"} 2' in text
+    
+    def test_dump_and_merge_worker_dumps(self):
+        """Prueba el volcado por worker y la suma en el proceso principal."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for worker_id in ("gw0", "gw1"):
+                worker_metrics = CommandMetrics()
+                worker_metrics.observe("getElementText", 0.2)
+                worker_metrics.dump(temp_dir, worker_id=worker_id)
+            
+            totals = CommandMetrics()
+            assert totals.merge_worker_dumps(temp_dir) == 2
+            path = totals.dump(temp_dir, worker_id="")
+            
+            assert sorted(os.listdir(temp_dir)) == ["command_latency.json", "command_latency.prom"]
+            with open(path, encoding="utf-8") as json_file:
+                assert json.load(json_file)["commands"]["getElementText"]["count"] == 2
+    
+    def test_disabled(self):
+        """Prueba que con METRICS_ENABLED desactivado no se registra nada."""
+        metrics = CommandMetrics()
+        with patch.object(config, "METRICS_ENABLED", False):
+            metrics.observe("findElement", 0.1)
+        
+        assert metrics.to_dict()["commands"] == {}
+
+
+class TestTransportMetrics:
+    """Pruebas de la instrumentación del transporte contra el servidor simulado."""
+    
+    def test_transport_observes_commands(self, fake_win_driver):
+        """Prueba que cada comando W3C queda registrado por comando y estrategia."""
+        driver = fake_win_driver.get_driver()
+        
+        def count(key, name):
+            return command_metrics.to_dict()[key].get(name, {}).get("count", 0)
+        
+        before = {name: count("commands", name) for name in ("findElement", "clickElement", "getPageSource")}
+        finds_before = count("strategies", "accessibility id")
+        
+        driver.find_element(AppiumBy.ACCESSIBILITY_ID, "txtUsername").click()
+        driver.page_source
+        
+        assert all(count("commands", name) == value + 1 for name, value in before.items())
+        assert count("strategies", "accessibility id") == finds_before + 1
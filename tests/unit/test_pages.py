@@ -0,0 +1,333 @@
+"""
+Pruebas unitarias para los Page Objects.
+
+Estas pruebas ejecutan BasePage contra el WinAppDriver simulado y
+validan sus componentes auxiliares.
+"""
+
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.pages.base_page import BasePage
+from src.pages.element_cache import ElementCache
+from src.pages.page_snapshot import PageSnapshot
+from src.utils.config import config
+
+
+USERNAME_FIELD = (By.NAME, "txtUsername")
+LOGIN_BUTTON = (By.NAME, "btnLogin")
+
+
+class TestElementCache:
+    """Pruebas para la caché de elementos."""
+    
+    def test_hits_and_misses(self):
+        """Prueba los contadores de aciertos y fallos."""
+        cache = ElementCache()
+        
+        assert cache.get(USERNAME_FIELD) is None
+        cache.put(USERNAME_FIELD, "elemento")
+        
+        assert cache.get(USERNAME_FIELD) == "elemento"
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+    
+    def test_invalidate(self):
+        """Prueba la invalidación individual y total."""
+        cache = ElementCache()
+        cache.put(USERNAME_FIELD, "usuario")
+        cache.put(LOGIN_BUTTON, "boton")
+        
+        cache.invalidate(USERNAME_FIELD)
+        assert USERNAME_FIELD not in cache
+        assert LOGIN_BUTTON in cache
+        
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+class TestBasePageElementCache:
+    """Pruebas de BasePage con la caché de elementos activada."""
+    
+    def test_cache_avoids_repeated_lookups(self, fake_winappdriver, fake_win_driver):
+        """Prueba que el mismo localizador solo se resuelve una vez."""
+        page = BasePage(fake_win_driver.get_driver(), use_element_cache=True)
+        fake_winappdriver.reset_counts()
+        
+        page.send_keys_to_element(USERNAME_FIELD, "testuser")
+        page.send_keys_to_element(USERNAME_FIELD, "otro")
+        text = page.get_element_text(USERNAME_FIELD)
+        
+        assert text == "otro"
+        assert fake_winappdriver.command_counts["findElement"] == 1
+        assert page.get_cache_stats()["hits"] == 2
+    
+    def test_stale_element_is_found_again(self, fake_win_driver):
+        """Prueba que un elemento obsoleto se vuelve a buscar de forma transparente."""
+        page = BasePage(fake_win_driver.get_driver(), use_element_cache=True)
+        page.send_keys_to_element(USERNAME_FIELD, "antes")
+        
+        fake_win_driver.reset_app()
+        page.send_keys_to_element(USERNAME_FIELD, "despues")
+        
+        assert page.get_element_text(USERNAME_FIELD) == "despues"
+        assert page.get_cache_stats()["stale"] == 1
+    
+    def test_click_uses_cached_element(self, fake_winappdriver, fake_win_driver):
+        """Prueba que el clic reutiliza el elemento cacheado."""
+        page = BasePage(fake_win_driver.get_driver(), use_element_cache=True)
+        page.wait_for_clickable(LOGIN_BUTTON)
+        fake_winappdriver.reset_counts()
+        
+        page.click_element(LOGIN_BUTTON)
+        
+        assert "findElement" not in fake_winappdriver.command_counts
+        assert fake_winappdriver.command_counts["click"] == 1
+    
+    def test_invalidate_cache_forces_lookup(self, fake_winappdriver, fake_win_driver):
+        """Prueba que invalidar la caché obliga a volver a buscar."""
+        page = BasePage(fake_win_driver.get_driver(), use_element_cache=True)
+        page.find_element(USERNAME_FIELD)
+        
+        page.invalidate_cache()
+        fake_winappdriver.reset_counts()
+        page.find_element(USERNAME_FIELD)
+        
+        assert fake_winappdriver.command_counts["findElement"] == 1
+    
+    def test_cache_disabled_by_default(self, fake_win_driver):
+        """Prueba que la caché es opcional."""
+        page = BasePage(fake_win_driver.get_driver())
+        
+        assert page.element_cache is None
+        assert page.get_cache_stats() == {}
+
+
+SAMPLE_SOURCE = (
+    '<?xml version="1.0" encoding="utf-16"?>'
+    '<Window Name="App" AutomationId="MainWindow" ClassName="Window">'
+    '<Edit Name="txtUsername" AutomationId="txtUsername" ClassName="TextBox" Value.Value="juan"/>'
+    '<Button Name="Entrar" AutomationId="btnLogin" ClassName="Button" IsEnabled="False"/>'
+    '<Text Name="Listo" AutomationId="lblStatus" ClassName="TextBlock"/>'
+    '</Window>'
+)
+
+
+class TestPageSnapshot:
+    """Pruebas para la instantánea del page source."""
+    
+    def test_index_by_strategy(self):
+        """Prueba la búsqueda por Name, AutomationId, ClassName, tag y XPath."""
+        snapshot = PageSnapshot(SAMPLE_SOURCE)
+        
+        assert snapshot.find((By.NAME, "txtUsername")).text == "juan"
+        assert snapshot.find(("accessibility id", "btnLogin")).name == "Entrar"
+        assert snapshot.find((By.CLASS_NAME, "TextBlock")).text == "Listo"
+        assert len(snapshot.find_all((By.TAG_NAME, "Button"))) == 1
+        assert snapshot.find((By.XPATH, "//Button[@AutomationId='btnLogin']")).name == "Entrar"
+        assert snapshot.find((By.NAME, "noExiste")) is None
+    
+    def test_element_properties(self):
+        """Prueba las propiedades de solo lectura de los elementos."""
+        button = PageSnapshot(SAMPLE_SOURCE).find(("accessibility id", "btnLogin"))
+        
+        assert button.is_enabled() is False
+        assert button.is_displayed() is True
+        assert button.get_attribute("ClassName") == "Button"
+    
+    def test_unsupported_strategy(self):
+        """Prueba que una estrategia desconocida genera error."""
+        with pytest.raises(ValueError):
+            PageSnapshot(SAMPLE_SOURCE).find((By.CSS_SELECTOR, ".x"))
+
+
+class TestBasePageSnapshot:
+    """Pruebas de la resolución masiva de localizadores en BasePage."""
+    
+    def test_bulk_reads_use_single_request(self, fake_winappdriver, fake_win_driver):
+        """Prueba que varias lecturas cuestan una sola petición."""
+        page = BasePage(fake_win_driver.get_driver())
+        locators = [USERNAME_FIELD, LOGIN_BUTTON, (By.NAME, "MainMenu")]
+        fake_winappdriver.reset_counts()
+        
+        present = page.are_elements_present(locators)
+        
+        assert fake_winappdriver.command_counts == {"pageSource": 1}
+        assert present == {USERNAME_FIELD: True, LOGIN_BUTTON: True, (By.NAME, "MainMenu"): False}
+    
+    def test_texts_and_attributes_from_shared_snapshot(self, fake_winappdriver, fake_win_driver):
+        """Prueba que textos y atributos pueden compartir la misma instantánea."""
+        page = BasePage(fake_win_driver.get_driver())
+        page.send_keys_to_element(USERNAME_FIELD, "testuser")
+        fake_winappdriver.reset_counts()
+        
+        snapshot = page.take_snapshot()
+        texts = page.get_elements_text([USERNAME_FIELD, (By.NAME, "StatusBar")], snapshot)
+        classes = page.get_elements_attribute([USERNAME_FIELD, LOGIN_BUTTON], "ClassName", snapshot)
+        
+        assert texts == {USERNAME_FIELD: "testuser", (By.NAME, "StatusBar"): "Listo"}
+        assert classes == {USERNAME_FIELD: "TextBox", LOGIN_BUTTON: "Button"}
+        assert fake_winappdriver.command_counts == {"pageSource": 1}
+
+
+ERROR_LABEL = (By.NAME, "lblError")
+MAIN_MENU = (By.NAME, "MainMenu")
+
+
+def submit_login(page, username, password=""):
+    """Rellena el formulario de login del árbol simulado y pulsa el botón."""
+    page.send_keys_to_element(USERNAME_FIELD, username)
+    page.send_keys_to_element((By.NAME, "txtPassword"), password)
+    page.click_element(LOGIN_BUTTON)
+
+
+class TestBasePageWaits:
+    """Pruebas de las esperas basadas en condiciones de BasePage."""
+    
+    def test_wait_for_element_to_appear(self, fake_win_driver):
+        """Prueba que la espera termina en cuanto aparece el elemento."""
+        page = BasePage(fake_win_driver.get_driver())
+        submit_login(page, "testuser", "testpass123")
+        
+        start = time.monotonic()
+        element = page.wait_for_element_to_appear(MAIN_MENU, timeout=5)
+        
+        assert element.is_displayed()
+        assert time.monotonic() - start < 2
+    
+    def test_wait_for_element_to_disappear(self, fake_win_driver):
+        """Prueba la espera de desaparición de un elemento."""
+        page = BasePage(fake_win_driver.get_driver())
+        submit_login(page, "otro")
+        page.wait_for_element_to_appear(ERROR_LABEL, timeout=5)
+        
+        submit_login(page, "testuser", "testpass123")
+        
+        assert page.wait_for_element_to_disappear(ERROR_LABEL, timeout=5)
+    
+    def test_wait_for_text_change(self, fake_win_driver):
+        """Prueba la espera de cambio de texto."""
+        page = BasePage(fake_win_driver.get_driver())
+        submit_login(page, "otro")
+        page.wait_for_element_to_appear(ERROR_LABEL, timeout=5)
+        
+        submit_login(page, "")
+        
+        new_text = page.wait_for_text_change(ERROR_LABEL, timeout=5)
+        assert new_text == "Por favor complete todos los campos"
+    
+    def test_wait_for_ui_to_settle_after_action(self, fake_win_driver):
+        """Prueba que la espera detecta el cambio y la estabilidad de la interfaz."""
+        page = BasePage(fake_win_driver.get_driver())
+        page.send_keys_to_element(USERNAME_FIELD, "testuser")
+        page.send_keys_to_element((By.NAME, "txtPassword"), "testpass123")
+        baseline = page.get_ui_signature()
+        page.click_element(LOGIN_BUTTON)
+        
+        assert page.wait_for_ui_to_settle(baseline, change_timeout=5, poll_interval=0.05)
+        assert page.are_elements_present([MAIN_MENU])[MAIN_MENU]
+    
+    def test_wait_for_ui_stable_times_out(self, fake_win_driver):
+        """Prueba que la estabilidad no se alcanza si se exigen demasiados sondeos."""
+        page = BasePage(fake_win_driver.get_driver())
+        
+        assert not page.wait_for_ui_stable(polls=100, poll_interval=0.01, timeout=0.2)
+    
+    def test_wait_for_any_returns_first_outcome(self, fake_win_driver):
+        """Prueba que wait_for_any devuelve el resultado que aparece primero."""
+        page = BasePage(fake_win_driver.get_driver())
+        submit_login(page, "otro")
+        
+        start = time.monotonic()
+        outcome, element = page.wait_for_any({"success": MAIN_MENU, "error": ERROR_LABEL}, timeout=10)
+        
+        assert outcome == "error"
+        assert element.text == "Usuario o contraseña incorrectos"
+        assert time.monotonic() - start < 2
+    
+    def test_wait_for_any_accepts_callables(self, fake_win_driver):
+        """Prueba que wait_for_any admite condiciones como funciones."""
+        page = BasePage(fake_win_driver.get_driver())
+        
+        outcome, value = page.wait_for_any(
+            {"menu": MAIN_MENU, "title": lambda driver: driver.title}, timeout=2
+        )
+        
+        assert outcome == "title"
+        assert value == "Aplicación WPF - Test"
+    
+    def test_wait_for_any_times_out(self, fake_win_driver):
+        """Prueba que wait_for_any falla si ninguna condición se cumple."""
+        page = BasePage(fake_win_driver.get_driver())
+        
+        with pytest.raises(TimeoutException):
+            page.wait_for_any({"menu": MAIN_MENU, "error": ERROR_LABEL}, timeout=0.3)
+
+
+class TestImplicitWaitScope:
+    """Pruebas de las comprobaciones sin acumulación del wait implícito."""
+    
+    def test_absence_probe_skips_implicit_wait(self, fake_winappdriver, fake_win_driver):
+        """Prueba que la ausencia se detecta sin pagar el wait implícito."""
+        driver = fake_win_driver.get_driver()
+        with patch.object(config, 'IMPLICIT_WAIT', 1):
+            driver.implicitly_wait(1)
+            page = BasePage(driver)
+            
+            start = time.monotonic()
+            present = page.is_element_present(MAIN_MENU)
+            elapsed = time.monotonic() - start
+        
+        assert present is False
+        assert elapsed < 0.5
+        assert fake_winappdriver.sessions[driver.session_id].implicit_wait == 1
+        stats = page.get_probe_stats()
+        assert stats["probes"] == 1
+        assert stats["negative"] == 1
+        assert stats["implicit_wait_avoided"] == 1
+    
+    def test_probe_can_keep_implicit_wait(self, fake_win_driver):
+        """Prueba el parámetro para conservar el wait implícito."""
+        driver = fake_win_driver.get_driver()
+        driver.implicitly_wait(0.3)
+        page = BasePage(driver)
+        
+        start = time.monotonic()
+        assert page.is_element_present(MAIN_MENU, skip_implicit_wait=False) is False
+        
+        assert time.monotonic() - start >= 0.3
+        assert page.get_probe_stats()["implicit_wait_avoided"] == 0
+    
+    def test_nested_scopes_restore_once(self, fake_winappdriver, fake_win_driver):
+        """Prueba que los bloques anidados solo cambian el timeout una vez."""
+        driver = fake_win_driver.get_driver()
+        driver.implicitly_wait(2)
+        page = BasePage(driver)
+        fake_winappdriver.reset_counts()
+        
+        with page.implicit_wait_disabled():
+            with page.implicit_wait_disabled():
+                assert fake_winappdriver.sessions[driver.session_id].implicit_wait == 0
+        
+        assert fake_winappdriver.command_counts["getTimeouts"] == 1
+        assert fake_winappdriver.command_counts["setTimeouts"] == 2
+        assert fake_winappdriver.sessions[driver.session_id].implicit_wait == 2
+    
+    def test_restores_session_implicit_wait(self, fake_winappdriver, fake_win_driver):
+        """Prueba que se restaura el wait implícito de la sesión, no el de la configuración."""
+        driver = fake_win_driver.get_driver()
+        driver.implicitly_wait(0.5)
+        page = BasePage(driver)
+        
+        with patch.object(config, 'IMPLICIT_WAIT', 2):
+            with page.implicit_wait_disabled():
+                assert fake_winappdriver.sessions[driver.session_id].implicit_wait == 0
+        
+        assert fake_winappdriver.sessions[driver.session_id].implicit_wait == 0.5
@@ -0,0 +1,83 @@
+"""
+Pruebas unitarias para la validación del entorno al iniciar la sesión.
+"""
+
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.drivers.fake_winappdriver import FakeWinAppDriver
+from src.utils.config import Config
+from src.utils.preflight import (
+    baseline_latencies, check_app_path, check_disk_space, check_writable, format_summary, run_preflight
+)
+
+
+def preflight_config(reports_dir, **env):
+    """Configuración con los reportes en un directorio temporal."""
+    variables = {"REPORTS_DIR": reports_dir, "SCREENSHOTS_DIR": os.path.join(reports_dir, "screenshots"),
+                 "METRICS_DIR": os.path.join(reports_dir, "metrics"),
+                 "LOG_FILE": os.path.join(reports_dir, "automation.log"), "WINAPPDRIVER_URLS": "",
+                 "FAKE_WINAPPDRIVER": "true", "PREFLIGHT_MIN_FREE_MB": "1", **env}
+    with patch.dict(os.environ, variables):
+        return Config()
+
+
+class TestPreflightChecks:
+    """Pruebas de las comprobaciones individuales."""
+    
+    def test_app_path(self):
+        """Prueba que APP_PATH solo se comprueba con WinAppDriver local y real."""
+        local = ["http://127.0.0.1:4723"]
+        
+        assert not check_app_path(r"C:\No\Existe.exe", local)["ok"]
+        assert check_app_path(__file__, local)["ok"]
+        assert check_app_path(r"C:\No\Existe.exe", ["http://10.0.0.5:4723"])["skipped"]
+        assert check_app_path(r"C:\No\Existe.exe", local, simulated=True)["skipped"]
+        assert check_app_path("Microsoft.WindowsCalculator_8wekyb3d8bbwe!App", local)["skipped"]
+    
+    def test_writable_and_disk_space(self):
+        """Prueba la escritura en los directorios y el espacio libre."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            blocker = os.path.join(temp_dir, "archivo")
+            Path(blocker).write_text("no es un directorio")
+            
+            assert check_writable(os.path.join(temp_dir, "nuevo"))["ok"]
+            assert not check_writable(os.path.join(blocker, "reports"))["ok"]
+            assert check_disk_space(temp_dir, 1)["ok"]
+            assert not check_disk_space(temp_dir, 10 ** 12)["ok"]
+
+
+class TestRunPreflight:
+    """Pruebas de la validación completa."""
+    
+    def test_healthy_environment_publishes_latency(self):
+        """Prueba que con el entorno correcto todo pasa y se mide la latencia."""
+        with tempfile.TemporaryDirectory() as temp_dir, FakeWinAppDriver() as server:
+            results = run_preflight(preflight_config(temp_dir, WINAPPDRIVER_URL=server.url), timeout=2)
+        
+        assert all(item["ok"] for item in results), format_summary(results)
+        assert list(baseline_latencies(results)) == [server.url]
+    
+    def test_unresponsive_endpoint_fails_within_timeout(self):
+        """Prueba que un WinAppDriver colgado o caído falla en el timeout, no en el de la prueba."""
+        with tempfile.TemporaryDirectory() as temp_dir, socket.socket() as hung, socket.socket() as dead:
+            hung.bind(("127.0.0.1", 0))
+            hung.listen()  # Acepta la conexión pero nunca responde
+            dead.bind(("127.0.0.1", 0))
+            urls = [f"http://127.0.0.1:{sock.getsockname()[1]}" for sock in (hung, dead)]
+            app_config = preflight_config(temp_dir, WINAPPDRIVER_URLS=",".join(f"{url}=1" for url in urls))
+            
+            started = time.monotonic()
+            results = run_preflight(app_config, timeout=0.5)
+            elapsed = time.monotonic() - started
+        
+        failed = [item["name"] for item in results if not item["ok"]]
+        assert failed == [f"WinAppDriver {url}" for url in urls]
+        assert elapsed < 1.5
+        assert "FALLO" in format_summary(results)
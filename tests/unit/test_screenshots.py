@@ -0,0 +1,360 @@
+"""
+Pruebas unitarias para la escritura de capturas en segundo plano.
+"""
+
+import base64
+import json
+import os
+import tempfile
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+import sys
+from selenium.common.exceptions import TimeoutException
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.utils.config import config
+from src.utils.helpers import resolve_screenshot, take_screenshot
+from src.utils.reporting import attach_failure_screenshot, html_extras
+from src.pages.base_page import BasePage
+from src.utils.screenshots import (
+    ScreenshotPolicy,
+    ScreenshotStore,
+    ScreenshotWriter,
+    merge_worker_artifacts,
+    screenshot_writer,
+)
+
+
+PNG = b"\x89PNG\r\n\x1a\nfake"
+
+
+class TestScreenshotWriter:
+    """Pruebas para ScreenshotWriter."""
+    
+    def test_writes_bytes_and_base64(self):
+        """Prueba la escritura de capturas en bytes y en base64."""
+        writer = ScreenshotWriter(max_queue_size=4)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            raw_path = os.path.join(temp_dir, "nuevo", "raw.png")
+            b64_path = os.path.join(temp_dir, "nuevo", "b64.png")
+            
+            writer.submit(PNG, raw_path)
+            writer.submit(base64.b64encode(PNG).decode("ascii"), b64_path)
+            writer.close()
+            
+            assert Path(raw_path).read_bytes() == PNG
+            assert Path(b64_path).read_bytes() == PNG
+        stats = writer.get_stats()
+        assert stats["submitted"] == 2
+        assert stats["written"] == 2
+        assert stats["queue_depth"] == 0
+    
+    def test_full_queue_applies_backpressure(self):
+        """Prueba que con la cola llena submit() espera en lugar de descartar."""
+        writer = ScreenshotWriter(max_queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+        original_write = writer._write
+        
+        def slow_write(*args):
+            started.set()
+            release.wait(2)
+            original_write(*args)
+        
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(writer, "_write", side_effect=slow_write):
+            writer.submit(PNG, os.path.join(temp_dir, "1.png"))
+            started.wait(2)
+            writer.submit(PNG, os.path.join(temp_dir, "2.png"))
+            threading.Timer(0.1, release.set).start()
+            writer.submit(PNG, os.path.join(temp_dir, "3.png"))
+            
+            assert writer.flush(timeout=2)
+            assert len(os.listdir(temp_dir)) == 3
+        assert writer.get_stats()["blocked"] == 1
+        writer.close()
+    
+    def test_write_errors_are_counted(self):
+        """Prueba que un error de escritura no detiene el hilo de fondo."""
+        writer = ScreenshotWriter(max_queue_size=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            blocker = os.path.join(temp_dir, "archivo")
+            Path(blocker).write_text("x")
+            
+            writer.submit(PNG, os.path.join(blocker, "fallo.png"))
+            writer.submit(PNG, os.path.join(temp_dir, "ok.png"))
+            writer.flush()
+            
+            assert os.path.exists(os.path.join(temp_dir, "ok.png"))
+        assert writer.get_stats()["failed"] == 1
+        writer.close()
+    
+    def test_take_screenshot_uses_background_writer(self):
+        """Prueba que take_screenshot solo pide la captura en el hilo de la prueba."""
+        driver = Mock()
+        driver.get_screenshot_as_base64.return_value = base64.b64encode(PNG).decode("ascii")
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOT_ASYNC", True), \
+                patch.object(config, "SCREENSHOT_DEDUP", False):
+            filepath = take_screenshot(driver, "prueba", "fallo")
+            screenshot_writer.flush()
+            
+            assert Path(filepath).read_bytes() == PNG
+        driver.save_screenshot.assert_not_called()
+
+
+class TestScreenshotStore:
+    """Pruebas para el almacén direccionado por contenido."""
+    
+    def test_identical_screenshots_are_stored_once(self):
+        """Prueba que dos capturas idénticas comparten el mismo archivo."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ScreenshotStore(temp_dir)
+            
+            first = store.put(PNG, "prueba_a_fallo.png")
+            second = store.put(PNG, os.path.join(temp_dir, "prueba_b_fallo.png"))
+            other = store.put(PNG + b"otra", "prueba_c_fallo.png")
+            
+            assert first == second != other
+            assert len(os.listdir(os.path.join(temp_dir, "objects"))) == 2
+            assert store.get_stats()["deduplicated"] == 1
+            assert store.get_stats()["bytes_saved"] == len(PNG)
+    
+    def test_references_resolve_through_index(self):
+        """Prueba que las referencias se resuelven también desde otro proceso."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = ScreenshotStore(temp_dir).put(PNG, "prueba_fallo.png")
+            other_process = ScreenshotStore(temp_dir)
+            
+            assert other_process.resolve(os.path.join(temp_dir, "prueba_fallo.png")) == path
+            assert other_process.resolve("desconocida.png") is None
+    
+    def test_take_screenshot_with_dedup(self):
+        """Prueba take_screenshot con deduplicación y escritura en segundo plano."""
+        driver = Mock()
+        driver.get_screenshot_as_base64.return_value = base64.b64encode(PNG).decode("ascii")
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOT_ASYNC", True), \
+                patch.object(config, "SCREENSHOT_DEDUP", True):
+            first = take_screenshot(driver, "prueba", "uno")
+            second = take_screenshot(driver, "prueba", "dos")
+            screenshot_writer.flush()
+            
+            assert not os.path.exists(first)
+            assert resolve_screenshot(first) == resolve_screenshot(second)
+            assert Path(resolve_screenshot(first)).read_bytes() == PNG
+            assert len(os.listdir(os.path.join(config.get_screenshots_dir(""), "objects"))) == 1
+    
+    
+    def test_merge_worker_artifacts(self):
+        """Prueba el índice unificado de las capturas de los workers."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "REPORTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOTS_DIR", os.path.join(temp_dir, "screenshots")):
+            with patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw0"}):
+                ScreenshotStore().put(PNG, "prueba_uno.png")
+            os.makedirs(config.get_screenshots_dir("gw1"))
+            Path(config.get_screenshots_dir("gw1"), "prueba_dos.png").write_bytes(PNG)
+            
+            index_path = merge_worker_artifacts()
+            with open(index_path, encoding="utf-8") as index_file:
+                entries = [json.loads(line) for line in index_file]
+        
+        assert [(entry["worker"], entry["name"]) for entry in entries] == [
+            ("gw0", "prueba_uno.png"), ("gw1", "prueba_dos.png")]
+        assert entries[0]["path"] == os.path.join("screenshots", "objects", f"{entries[0]['digest']}.png")
+        assert entries[1]["path"] == os.path.join("screenshots", "gw1", "prueba_dos.png")
+    
+    def test_identical_screenshots_stored_once_across_workers(self):
+        """Prueba que los workers comparten el almacén: la misma imagen se guarda una sola vez."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "REPORTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOTS_DIR", os.path.join(temp_dir, "screenshots")):
+            for worker_id in ("gw0", "gw1"):
+                with patch.dict(os.environ, {"PYTEST_XDIST_WORKER": worker_id}):
+                    ScreenshotStore().put(PNG, f"prueba_{worker_id}.png")
+            
+            objects = os.listdir(os.path.join(config.get_screenshots_dir(""), "objects"))
+            with open(merge_worker_artifacts(), encoding="utf-8") as index_file:
+                entries = [json.loads(line) for line in index_file]
+        
+        assert len(objects) == 1
+        assert [entry["worker"] for entry in entries] == ["gw0", "gw1"]
+        assert {entry["path"] for entry in entries} == {os.path.join("screenshots", "objects", objects[0])}
+
+
+class TestReporting:
+    """Pruebas para los adjuntos de capturas en los reportes."""
+    
+    def test_html_extras_by_file_reference(self):
+        """Prueba que el reporte no autocontenido referencia el archivo."""
+        extras = html_extras(PNG, "captura", "/reports/screenshots/objects/a.png",
+                             report_dir="/reports", self_contained=False)
+        
+        assert [extra["content"] for extra in extras] == ["screenshots/objects/a.png"]
+    
+    def test_html_extras_embed_buffer_without_pillow(self):
+        """Prueba que sin miniatura se incrusta el mismo buffer."""
+        with patch("src.utils.reporting.Image", None):
+            extras = html_extras(PNG, "captura", "/reports/a.png", report_dir="/reports")
+        
+        assert len(extras) == 1
+        assert base64.b64decode(extras[0]["content"]) == PNG
+    
+    def test_html_extras_thumbnail_links_full_image(self):
+        """Prueba que con miniatura se enlaza la imagen completa."""
+        with patch("src.utils.reporting.make_thumbnail", return_value=b"mini"):
+            extras = html_extras(PNG, "captura", "/reports/a.png", report_dir="/reports")
+        
+        assert base64.b64decode(extras[0]["content"]) == b"mini"
+        assert extras[1]["content"] == "a.png"
+    
+    def test_attach_failure_screenshot_reads_once(self):
+        """Prueba que la captura se pide una vez y se reutiliza el buffer."""
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = PNG
+        item = Mock(spec=["config"])
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOTS_DIR", temp_dir), \
+                patch.object(config, "SCREENSHOT_DEDUP", True), \
+                patch("allure.attach") as allure_attach:
+            item.config.option.htmlpath = os.path.join(temp_dir, "report.html")
+            item.config.option.self_contained_html = False
+            
+            reference = attach_failure_screenshot(item, driver, "prueba")
+            screenshot_writer.flush()
+            
+            assert Path(resolve_screenshot(reference)).read_bytes() == PNG
+        driver.get_screenshot_as_png.assert_called_once()
+        assert allure_attach.call_args[0][0] is PNG
+        assert os.path.basename(os.path.dirname(item.screenshot_extras[0]["content"])) == "objects"
+    
+    def test_attach_failure_screenshot_reuses_chain_capture(self):
+        """Prueba que el fixture de fallo adjunta el buffer de la captura ya tomada en la cadena."""
+        driver = Mock()
+        item = Mock(spec=["config"])
+        error = TimeoutException("sin elemento")
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=False)
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOT_DEDUP", False), \
+                patch("src.utils.screenshots.screenshot_policy", policy), \
+                patch.object(screenshot_writer, "flush") as flush, \
+                patch("allure.attach") as allure_attach:
+            # El archivo aún no existe: sigue en la cola del escritor en segundo plano
+            path = os.path.join(temp_dir, "captura.png")
+            policy.record_capture(path, error, png=PNG)
+            item.config.option.htmlpath = os.path.join(temp_dir, "report.html")
+            item.config.option.self_contained_html = False
+            
+            assert attach_failure_screenshot(item, driver, "prueba", error) == path
+        driver.get_screenshot_as_png.assert_not_called()
+        flush.assert_not_called()
+        assert allure_attach.call_args[0][0] is PNG
+        assert item.screenshot_extras[0]["content"] == "captura.png"
+    
+    def test_attach_chain_capture_without_buffer_by_reference(self):
+        """Prueba que sin buffer la captura de la cadena se referencia sin releerla."""
+        item = Mock(spec=["config"])
+        error = TimeoutException("sin elemento")
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=False)
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(config, "SCREENSHOT_DEDUP", False), \
+                patch("src.utils.screenshots.screenshot_policy", policy), \
+                patch("allure.attach") as allure_attach:
+            path = os.path.join(temp_dir, "captura.png")
+            policy.record_capture(path, error)
+            item.config.option.htmlpath = os.path.join(temp_dir, "report.html")
+            item.config.option.self_contained_html = True
+            
+            assert attach_failure_screenshot(item, Mock(), "prueba", error) == path
+        allure_attach.assert_not_called()
+        assert item.screenshot_extras[0]["content"] == "captura.png"
+
+
+class TestScreenshotPolicy:
+    """Pruebas para la política de capturas de fallo."""
+    
+    def test_one_capture_per_failure_chain(self):
+        """Prueba que la misma excepción solo se captura una vez."""
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=False)
+        error = TimeoutException("sin elemento")
+        
+        assert policy.should_capture(error)
+        policy.record_capture("a.png", error)
+        
+        assert not policy.should_capture(error)
+        assert policy.captured_path(error) == "a.png"
+        assert policy.get_stats()["skipped_chain"] == 1
+    
+    def test_test_budget_resets_per_test(self):
+        """Prueba el presupuesto de capturas por prueba."""
+        policy = ScreenshotPolicy(test_budget=2, session_budget=0, skip_unchanged=False)
+        policy.start_test("prueba_1")
+        for _ in range(2):
+            assert policy.should_capture()
+            policy.record_capture("a.png")
+        
+        assert not policy.should_capture()
+        policy.start_test("prueba_2")
+        assert policy.should_capture()
+        assert policy.get_stats()["skipped_test_budget"] == 1
+    
+    def test_session_budget(self):
+        """Prueba el presupuesto de capturas de la sesión."""
+        policy = ScreenshotPolicy(test_budget=0, session_budget=1, skip_unchanged=False)
+        policy.start_test("prueba_1")
+        policy.record_capture("a.png")
+        policy.start_test("prueba_2")
+        
+        assert not policy.should_capture()
+        assert not policy.needs_screen_hash()
+        assert policy.get_stats()["skipped_session_budget"] == 1
+    
+    def test_unchanged_screen_reuses_previous_capture(self):
+        """Prueba que una pantalla sin cambios no se vuelve a capturar."""
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=True)
+        policy.start_test("prueba")
+        policy.record_capture("a.png", screen_hash="h1")
+        error = TimeoutException("sin elemento")
+        
+        assert not policy.should_capture(error, "h1")
+        assert policy.captured_path(error) == "a.png"
+        assert policy.should_capture(None, "h2")
+    
+    def test_base_page_captures_failure_chain_once(self):
+        """Prueba que un fallo anidado en BasePage genera una sola captura."""
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = PNG
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=True)
+        page = BasePage(driver)
+        page.wait = Mock()
+        page.wait.until.side_effect = TimeoutException("timeout")
+        with patch("src.pages.base_page.screenshot_policy", policy), \
+                patch.object(page, "save_screenshot", return_value="a.png") as save:
+            # send_keys_to_element -> find_element: ambos niveles intentan capturar
+            with pytest.raises(TimeoutException) as excinfo:
+                page.send_keys_to_element(("id", "campo"), "texto")
+            page.capture_failure("fixture", excinfo.value)
+        
+        save.assert_called_once()
+        driver.get_screenshot_as_png.assert_called_once()
+        assert policy.get_stats()["skipped_chain"] == 2
+    
+    def test_base_page_skips_unchanged_screen_by_image_hash(self):
+        """Prueba que la pantalla repetida se detecta con el hash de la imagen, sin pedir el page source."""
+        driver = Mock(spec=["get_screenshot_as_png"])
+        driver.get_screenshot_as_png.return_value = PNG
+        policy = ScreenshotPolicy(test_budget=0, session_budget=0, skip_unchanged=True)
+        page = BasePage(driver)
+        with patch("src.pages.base_page.screenshot_policy", policy), \
+                patch.object(page, "save_screenshot", return_value="a.png") as save:
+            first = page.capture_failure("paso1", TimeoutException("primero"))
+            second = page.capture_failure("paso2", TimeoutException("segundo"))
+        
+        save.assert_called_once_with(PNG, "paso1")
+        assert (first, second) == ("a.png", "")
+        assert policy.get_stats()["skipped_unchanged"] == 1
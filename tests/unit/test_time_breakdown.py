@@ -0,0 +1,105 @@
+"""
+Pruebas unitarias para el desglose de tiempo de las pruebas.
+"""
+
+import json
+import os
+import tempfile
+import time
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.utils.time_breakdown import TimeBreakdownPlugin, summarize, wasted
+from src.utils.tracing import tracer
+
+
+def event(event_type, start, duration, name="evento"):
+    """Construye un evento de la traza."""
+    return {"type": event_type, "name": name, "ts": start, "duration": duration}
+
+
+class TestSummarize:
+    """Pruebas para la atribución del tiempo a las categorías."""
+    
+    def test_categories_and_python_remainder(self):
+        """Prueba que lo no cubierto por eventos se atribuye a Python."""
+        events = [
+            event("driver", 100.0, 2.0, name="start"),
+            event("command", 102.5, 0.5),
+            event("sleep", 103.0, 1.0, name="time.sleep"),
+            event("driver", 109.0, 1.0, name="stop"),
+        ]
+        
+        breakdown = summarize(events, 100.0, 110.0)
+        
+        assert breakdown["wall"] == 10.0
+        assert breakdown["driver_start"] == 2.0
+        assert breakdown["commands"] == 0.5
+        assert breakdown["sleep"] == 1.0
+        assert breakdown["driver_teardown"] == 1.0
+        assert breakdown["python"] == pytest.approx(5.5)
+        assert wasted(breakdown) == 4.0
+    
+    def test_nested_events_count_once(self):
+        """Prueba que los comandos dentro de una espera cuentan como espera."""
+        events = [
+            event("wait", 10.0, 3.0),
+            event("command", 10.5, 0.2),
+            event("sleep", 10.7, 1.0, name="time.sleep"),
+            event("screenshot", 12.5, 1.0),
+            event("step", 10.0, 4.0),
+        ]
+        
+        breakdown = summarize(events, 10.0, 14.0)
+        
+        assert breakdown["waits"] == 3.0
+        assert breakdown["commands"] == 0.0
+        assert breakdown["sleep"] == 0.0
+        assert breakdown["screenshots"] == 0.5  # Solo la parte fuera de la espera
+        assert breakdown["python"] == pytest.approx(0.5)
+    
+    def test_events_are_clipped_to_the_test(self):
+        """Prueba que los eventos fuera de la prueba no se atribuyen."""
+        breakdown = summarize([event("command", 0.0, 5.0), event("wait", 9.0, 5.0)], 4.0, 10.0)
+        
+        assert breakdown["commands"] == 1.0
+        assert breakdown["waits"] == 1.0
+
+
+class TestTimeBreakdownPlugin:
+    """Pruebas del plugin de desglose de tiempo."""
+    
+    def test_sleep_and_trace_events_are_recorded(self):
+        """Prueba que el plugin recoge time.sleep y los eventos de la prueba en curso."""
+        plugin = TimeBreakdownPlugin()
+        protocol = plugin.pytest_runtest_protocol(None, None)
+        next(protocol)
+        try:
+            time.sleep(0.01)
+            tracer.emit("command", "findElement", 0.02)
+            types = [recorded["type"] for recorded in plugin.events]
+        finally:
+            protocol.close()
+        
+        assert "sleep" in types
+        assert "command" in types
+        assert plugin.events == []
+    
+    def test_report_and_top_wasted(self):
+        """Prueba el reporte JSON y el orden por tiempo perdido."""
+        plugin = TimeBreakdownPlugin(top=1)
+        plugin.results = {
+            "tests/test_a.py::test_rapida": summarize([event("command", 0.0, 1.0)], 0.0, 2.0),
+            "tests/test_b.py::test_espera": summarize([event("wait", 0.0, 1.5)], 0.0, 2.0),
+        }
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = plugin.write_report(os.path.join(temp_dir, "time_breakdown.json"))
+            with open(path, encoding="utf-8") as report_file:
+                report = json.load(report_file)
+        
+        assert report["totals"]["wall"] == 4.0
+        assert report["totals"]["waits"] == 1.5
+        assert [nodeid for nodeid, _ in plugin.top_wasted()] == ["tests/test_b.py::test_espera"]
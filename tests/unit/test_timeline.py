@@ -0,0 +1,71 @@
+"""
+Pruebas unitarias para la exportación de la línea de tiempo de Chrome/Perfetto.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.utils.timeline import export_timeline, to_trace_events
+
+
+def write_trace(path, events):
+    """Escribe eventos como una traza JSONL."""
+    with open(path, "w", encoding="utf-8") as trace_file:
+        for event in events:
+            trace_file.write(json.dumps(event) + "\n")
+
+
+def event(event_type, name, start, duration, worker="gw0", thread="MainThread", **fields):
+    """Construye un evento de la traza."""
+    return dict(type=event_type, name=name, ts=start, duration=duration, worker=worker,
+                thread=thread, pid=100, test="tests/test_login.py::test_ok", **fields)
+
+
+class TestTimeline:
+    """Pruebas para la conversión al formato Trace Event."""
+    
+    def test_spans_and_track_metadata(self):
+        """Prueba que cada evento es un span con sus metadatos de proceso e hilo."""
+        trace_events = list(to_trace_events([
+            event("test", "call", 10.0, 2.0),
+            event("command", "findElement", 10.5, 0.25, using="accessibility id"),
+        ]))
+        
+        metadata = [item for item in trace_events if item["ph"] == "M"]
+        spans = [item for item in trace_events if item["ph"] == "X"]
+        
+        assert {item["args"].get("name") for item in metadata if item["name"] == "process_name"} == {
+            "gw0 (pid 100)"}
+        assert spans[0]["name"] == "tests/test_login.py::test_ok (call)"
+        assert spans[1]["ts"] == 10_500_000
+        assert spans[1]["dur"] == 250_000
+        assert spans[1]["cat"] == "command"
+        assert spans[1]["args"]["using"] == "accessibility id"
+        assert spans[0]["pid"] == spans[1]["pid"] and spans[0]["tid"] == spans[1]["tid"]
+    
+    def test_export_one_process_per_worker(self):
+        """Prueba la exportación de varios workers, ordenada y filtrada por inicio."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = os.path.join(temp_dir, "automation.gw0.trace.jsonl")
+            second = os.path.join(temp_dir, "automation.gw1.trace.jsonl")
+            # Los eventos se escriben al terminar: el exterior llega el último
+            write_trace(first, [event("wait", "Elemento visible", 20.1, 0.5),
+                                event("action", "click_element", 20.0, 1.0),
+                                event("step", "ejecución anterior", 1.0, 1.0)])
+            write_trace(second, [event("fixture", "driver", 20.0, 0.3, worker="gw1")])
+            
+            path, spans = export_timeline(os.path.join(temp_dir, "timeline.json"),
+                                          paths=[first, second], since=10.0)
+            with open(path, encoding="utf-8") as timeline_file:
+                timeline = json.load(timeline_file)
+        
+        assert spans == 3
+        names = [item["name"] for item in timeline["traceEvents"] if item["ph"] == "X"]
+        assert names == ["click_element", "Elemento visible", "driver"]
+        pids = {item["args"]["name"]: item["pid"] for item in timeline["traceEvents"]
+                if item["name"] == "process_name"}
+        assert pids["gw0 (pid 100)"] != pids["gw1 (pid 100)"]
@@ -0,0 +1,97 @@
+"""
+Pruebas unitarias para la traza estructurada JSONL.
+"""
+
+import os
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from selenium.common.exceptions import TimeoutException
+
+from src.utils.config import config
+from src.utils.tracing import create_trace_handler, read_trace, trace_files, tracer
+from src.utils.waits import AdaptiveWait, PollingPolicy
+
+
+@pytest.fixture
+def trace_path():
+    """Conecta un handler de traza sobre un archivo temporal durante la prueba."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "automation.trace.jsonl")
+        with patch.object(config, "TRACE_MAX_BYTES", 2000), \
+                patch.object(config, "TRACE_BACKUP_COUNT", 3):
+            handler = create_trace_handler(path)
+        tracer.logger.addHandler(handler)
+        previous_test = tracer.test_id
+        try:
+            yield path
+        finally:
+            tracer.logger.removeHandler(handler)
+            handler.close()
+            tracer.start_test(previous_test)
+
+
+class TestTracer:
+    """Pruebas para el emisor de eventos."""
+    
+    def test_events_are_json_lines(self, trace_path):
+        """Prueba que cada evento es una línea JSON con la prueba en curso."""
+        tracer.start_test("tests/test_login.py::test_ok")
+        tracer.emit("command", "findElement", 0.25, using="accessibility id")
+        
+        events = list(read_trace([trace_path], event_type="command"))
+        
+        assert len(events) == 1
+        assert events[0]["type"] == "command"
+        assert events[0]["test"] == "tests/test_login.py::test_ok"
+        assert events[0]["duration"] == 0.25
+        assert events[0]["outcome"] == "ok"
+        assert events[0]["using"] == "accessibility id"
+    
+    def test_span_records_exception_outcome(self, trace_path):
+        """Prueba que un bloque fallido se registra con el nombre de la excepción."""
+        with pytest.raises(ValueError):
+            with tracer.span("screenshot", "captura"):
+                raise ValueError("sin driver")
+        
+        events = list(read_trace([trace_path], event_type="screenshot"))
+        assert events[0]["outcome"] == "ValueError"
+    
+    def test_wait_events(self, trace_path):
+        """Prueba que las esperas registran sondeos y resultado."""
+        wait = AdaptiveWait(Mock(), 0.05, policy=PollingPolicy.fixed(0.01))
+        with pytest.raises(TimeoutException):
+            wait.until(lambda driver: False, "Elemento no visible")
+        
+        events = list(read_trace([trace_path], event_type="wait"))
+        assert events[0]["name"] == "Elemento no visible"
+        assert events[0]["outcome"] == "timeout"
+        assert events[0]["polls"] == wait.last_polls
+
+
+class TestTraceRotation:
+    """Pruebas para la rotación y lectura de la traza."""
+    
+    def test_rotations_are_gzipped_and_read_in_order(self, trace_path):
+        """Prueba que las rotaciones se comprimen y se leen en orden cronológico."""
+        for number in range(40):
+            tracer.emit("step", f"paso {number}", 0.01)
+        
+        files = trace_files(trace_path)
+        
+        assert len(files) == 4
+        assert all(path.endswith(".gz") for path in files[:-1])
+        names = [event["name"] for event in read_trace(files, event_type="step")]
+        assert names == [f"paso {number}" for number in range(40 - len(names), 40)]
+    
+    def test_corrupt_lines_are_skipped(self, trace_path):
+        """Prueba que una línea truncada no interrumpe la lectura."""
+        tracer.emit("step", "paso", 0.01)
+        with open(trace_path, "a", encoding="utf-8") as trace_file:
+            trace_file.write('{"type": "step", "na')
+        
+        assert [event["name"] for event in read_trace([trace_path], event_type="step")] == ["paso"]
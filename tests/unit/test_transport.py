@@ -0,0 +1,99 @@
+"""
+Pruebas unitarias para la capa de transporte HTTP con WinAppDriver.
+"""
+
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.command import Command
+
+from src.drivers.transport import TransportSettings, WinAppDriverConnection
+from src.drivers.winapp_driver import WinAppDriver
+from src.utils.config import Config
+
+
+class TestTransportSettings:
+    """Pruebas para los parámetros de transporte."""
+    
+    @patch.dict('os.environ', {'TRANSPORT_POOL_SIZE': '8', 'TRANSPORT_FIND_TIMEOUT': '12',
+                               'TRANSPORT_GZIP': 'true'})
+    def test_settings_from_config(self):
+        """Prueba la lectura de los parámetros desde la configuración."""
+        settings = TransportSettings.from_config(Config())
+        
+        assert settings.pool_size == 8
+        assert settings.read_timeouts["find"] == 12
+        assert settings.read_timeouts["session"] == 120
+        assert settings.gzip_page_source is True
+    
+    def test_timeout_per_command_class(self):
+        """Prueba que cada clase de comando usa su timeout de lectura."""
+        connection = WinAppDriverConnection("http://127.0.0.1:4723", TransportSettings(
+            read_timeouts={"session": 90, "find": 10, "source": 40, "default": 5}))
+        
+        assert connection.timeout_for(Command.NEW_SESSION).read_timeout == 90
+        assert connection.timeout_for(Command.GET_PAGE_SOURCE).read_timeout == 40
+        assert connection.timeout_for(Command.CLICK_ELEMENT).read_timeout == 5
+        connection.implicit_wait = 3
+        assert connection.timeout_for(Command.FIND_ELEMENT).read_timeout == 13
+
+
+class TestTransportWithFakeServer:
+    """Pruebas del transporte contra el servidor simulado."""
+    
+    def test_driver_uses_transport_and_tracks_implicit_wait(self, fake_win_driver):
+        """Prueba que el driver se construye sobre la conexión configurada."""
+        driver = fake_win_driver.get_driver()
+        connection = driver.command_executor
+        
+        driver.implicitly_wait(2)
+        
+        assert isinstance(connection, WinAppDriverConnection)
+        assert connection.implicit_wait == 2
+    
+    def test_connections_are_reused(self, fake_win_driver):
+        """Prueba que los comandos reutilizan la misma conexión keep-alive."""
+        driver = fake_win_driver.get_driver()
+        for _ in range(5):
+            driver.title
+        
+        pools = driver.command_executor._conn.pools
+        pool = pools[next(iter(pools.keys()))]
+        assert pool.num_connections == 1
+    
+    def test_gzip_page_source(self, fake_winappdriver):
+        """Prueba que page_source se pide comprimido cuando está activado."""
+        with patch.dict('os.environ', {'TRANSPORT_GZIP': 'true'}):
+            win_driver = WinAppDriver("app.exe")
+            win_driver.start_driver()
+        try:
+            driver = win_driver.get_driver()
+            driver.title
+            assert fake_winappdriver.compressed_responses == 0
+            
+            assert "txtUsername" in driver.page_source
+            assert fake_winappdriver.compressed_responses == 1
+        finally:
+            win_driver.stop_driver()
+    
+    def test_hung_command_fails_within_read_timeout(self, fake_winappdriver):
+        """Prueba que un comando sin respuesta falla en el tiempo configurado."""
+        with patch.dict('os.environ', {'TRANSPORT_READ_TIMEOUT': '0.3'}):
+            win_driver = WinAppDriver("app.exe")
+            win_driver.start_driver()
+        fake_winappdriver.latency = {"default": 0.0, "getTitle": 2.0}
+        try:
+            start = time.monotonic()
+            with pytest.raises(TimeoutException):
+                win_driver.get_driver().title
+            
+            assert time.monotonic() - start < 1.5
+            assert win_driver.get_driver().command_executor.stats["timeouts"] == 1
+        finally:
+            fake_winappdriver.latency = {"default": 0.0}
+            win_driver.stop_driver()
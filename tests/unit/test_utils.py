@@ -6,6 +6,8 @@ funcionan correctamente.
 """
 
 import pytest
+import logging
+import logging.handlers
 import os
 import tempfile
 from pathlib import Path
@@ -14,10 +16,13 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 
 from src.utils.config import Config
+from src.utils import helpers
 from src.utils.helpers import (
     generate_test_data_filename,
     get_project_root,
-    retry_on_failure
+    retry_on_failure,
+    setup_logging,
+    stop_logging
 )
 
 
@@ -131,6 +136,98 @@ class TestHelpers:
         assert call_count == 3  # 1 intento inicial + 2 reintentos
 
 
+class TestLogging:
+    """Pruebas para la configuración de logging."""
+    
+    @pytest.fixture(autouse=True)
+    def isolated_logging(self):
+        """Retira el logging de la sesión durante la prueba y lo restaura al final."""
+        root = logging.getLogger()
+        level = root.level
+        stop_logging()
+        yield
+        stop_logging()
+        root.setLevel(level)
+        setup_logging()
+    
+    def test_setup_logging_is_idempotent(self):
+        """Prueba que las llamadas repetidas no duplican handlers."""
+        root = logging.getLogger()
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(helpers.config, "LOG_FILE", os.path.join(temp_dir, "test.log")), \
+                patch.object(helpers.config, "LOG_ASYNC", True):
+            before = len(root.handlers)
+            setup_logging()
+            setup_logging()
+            
+            assert len(root.handlers) == before + 1
+            stop_logging()
+            assert len(root.handlers) == before
+    
+    def test_async_logging_writes_from_listener(self):
+        """Prueba que el logger raíz solo encola y el listener escribe el archivo."""
+        root = logging.getLogger()
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(helpers.config, "LOG_FILE", os.path.join(temp_dir, "test.log")), \
+                patch.object(helpers.config, "LOG_ASYNC", True):
+            setup_logging()
+            assert isinstance(root.handlers[-1], logging.handlers.QueueHandler)
+            logging.getLogger("prueba").info("Clic realizado en elemento: %s", ("id", "boton"))
+            stop_logging()
+            
+            content = Path(helpers.config.get_log_file()).read_text(encoding="utf-8")
+        assert "prueba - INFO - Clic realizado en elemento: ('id', 'boton')" in content
+
+
+class TestWorkerSharding:
+    """Pruebas para la separación de logs y capturas por worker de pytest-xdist."""
+    
+    def test_paths_sharded_by_worker(self):
+        """Prueba que cada worker usa su propio log y directorio de capturas."""
+        config = Config()
+        config.LOG_FILE = os.path.join("reports", "automation.log")
+        config.SCREENSHOTS_DIR = os.path.join("reports", "screenshots")
+        with patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw1"}):
+            assert config.get_log_file() == os.path.join("reports", "automation.gw1.log")
+            assert config.get_screenshots_dir() == os.path.join("reports", "screenshots", "gw1")
+            assert config.get_log_file("") == config.LOG_FILE
+            
+            config.WORKER_SHARDING = False
+            assert config.get_log_file() == config.LOG_FILE
+            assert config.get_screenshots_dir() == config.SCREENSHOTS_DIR
+    
+    def test_merge_worker_logs_in_time_order(self):
+        """Prueba la unión de los logs de los workers en orden temporal."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(helpers.config, "LOG_FILE", os.path.join(temp_dir, "automation.log")):
+            Path(temp_dir, "automation.log").write_text(
+                "2024-01-31 10:00:00.000 - conftest - INFO - inicio\n", encoding="utf-8")
+            Path(temp_dir, "automation.gw0.log").write_text(
+                "2024-01-31 10:00:01.000 - a - INFO - uno\n"
+                "2024-01-31 10:00:03.000 - a - ERROR - tres\n"
+                "Traceback (most recent call last):\n", encoding="utf-8")
+            Path(temp_dir, "automation.gw1.log").write_text(
+                "2024-01-31 10:00:02.000 - b - INFO - dos\n", encoding="utf-8")
+            
+            merged = helpers.merge_worker_logs()
+            lines = Path(merged).read_text(encoding="utf-8").splitlines()
+        
+        assert os.path.basename(merged) == "automation.merged.log"
+        assert lines == [
+            "2024-01-31 10:00:00.000 [master] - conftest - INFO - inicio",
+            "2024-01-31 10:00:01.000 [gw0] - a - INFO - uno",
+            "2024-01-31 10:00:02.000 [gw1] - b - INFO - dos",
+            "2024-01-31 10:00:03.000 [gw0] - a - ERROR - tres",
+            "Traceback (most recent call last):",
+        ]
+    
+    def test_merge_without_workers(self):
+        """Prueba que sin logs de workers no se genera nada."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(helpers.config, "LOG_FILE", os.path.join(temp_dir, "automation.log")):
+            assert helpers.merge_worker_logs() is None
+
+
 class TestConfigEnvironmentVariables:
     """Pruebas para variables de entorno en la configuración."""
     
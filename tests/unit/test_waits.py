@@ -0,0 +1,135 @@
+"""
+Pruebas unitarias para las esperas con política de sondeo.
+"""
+
+import itertools
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from src.utils.config import Config
+from src.utils.tracing import tracer
+from src.utils.waits import AdaptiveWait, PollingPolicy, wait_stats
+
+
+def first_intervals(policy, count):
+    """Obtiene los primeros intervalos generados por una política."""
+    return list(itertools.islice(policy.intervals(), count))
+
+
+class TestPollingPolicy:
+    """Pruebas para las políticas de sondeo."""
+    
+    def test_fixed_strategy(self):
+        """Prueba el intervalo fijo."""
+        assert first_intervals(PollingPolicy.fixed(0.3), 3) == [0.3, 0.3, 0.3]
+    
+    def test_exponential_strategy_is_capped(self):
+        """Prueba el backoff exponencial con tope."""
+        policy = PollingPolicy("exponential", initial_interval=0.1, backoff_factor=2, max_interval=0.5)
+        
+        assert first_intervals(policy, 5) == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+    
+    def test_burst_strategy(self):
+        """Prueba la ráfaga inicial rápida."""
+        policy = PollingPolicy("burst", interval=0.5, initial_interval=0.05, burst_count=2)
+        
+        assert first_intervals(policy, 4) == [0.05, 0.05, 0.5, 0.5]
+    
+    def test_invalid_strategy(self):
+        """Prueba que una estrategia desconocida genera error."""
+        with pytest.raises(ValueError):
+            PollingPolicy("aleatoria")
+    
+    @patch.dict('os.environ', {'POLL_STRATEGY': 'Exponential', 'POLL_MAX_INTERVAL': '2'})
+    def test_policy_from_config(self):
+        """Prueba la creación de la política desde la configuración."""
+        policy = PollingPolicy.from_config(Config())
+        
+        assert policy.strategy == "exponential"
+        assert policy.max_interval == 2
+
+
+class TestAdaptiveWait:
+    """Pruebas para AdaptiveWait."""
+    
+    def test_until_counts_polls(self):
+        """Prueba que se registran los sondeos necesarios."""
+        results = iter([False, False, "ok"])
+        wait = AdaptiveWait(Mock(), 1, policy=PollingPolicy.fixed(0.01))
+        wait_stats.reset()
+        
+        assert wait.until(lambda driver: next(results)) == "ok"
+        assert wait.last_polls == 3
+        assert wait_stats.get_stats()["polls"] == 3
+        assert wait_stats.get_stats()["waits"] == 1
+    
+    def test_until_ignores_no_such_element(self):
+        """Prueba que NoSuchElementException se ignora durante el sondeo."""
+        calls = {"count": 0}
+        
+        def condition(driver):
+            calls["count"] += 1
+            if calls["count"] < 2:
+                raise NoSuchElementException("todavía no")
+            return True
+        
+        wait = AdaptiveWait(Mock(), 1, policy=PollingPolicy.fixed(0.01))
+        
+        assert wait.until(condition) is True
+    
+    def test_until_times_out(self):
+        """Prueba que se agota el tiempo y se registra el timeout."""
+        wait = AdaptiveWait(Mock(), 0.1, policy=PollingPolicy.fixed(0.02))
+        wait_stats.reset()
+        
+        with pytest.raises(TimeoutException):
+            wait.until(lambda driver: False, "sin resultado")
+        assert wait_stats.get_stats()["timeouts"] == 1
+        assert wait.last_polls > 1
+    
+    def test_until_not(self):
+        """Prueba la espera inversa."""
+        results = iter([True, False])
+        wait = AdaptiveWait(Mock(), 1, policy=PollingPolicy.fixed(0.01))
+        
+        assert wait.until_not(lambda driver: next(results)) is False
+        assert wait.last_polls == 2
+    
+    def test_condition_error_is_recorded(self):
+        """Prueba que una excepción no ignorada de la condición también registra la espera."""
+        events = []
+        wait = AdaptiveWait(Mock(), 1, policy=PollingPolicy.fixed(0.01))
+        wait_stats.reset()
+        
+        def condition(driver):
+            raise RuntimeError("condición rota")
+        
+        tracer.subscribe(events.append)
+        try:
+            with pytest.raises(RuntimeError):
+                wait.until(condition, "condición rota")
+        finally:
+            tracer.unsubscribe(events.append)
+        
+        assert wait.last_polls == 1
+        assert wait_stats.get_stats()["waits"] == 1
+        assert wait_stats.get_stats()["timeouts"] == 0
+        assert [(event["name"], event["outcome"]) for event in events if event["type"] == "wait"] == [
+            ("condición rota", "error")]
+    
+    def test_exponential_policy_needs_fewer_polls(self):
+        """Prueba que el backoff reduce los sondeos en esperas largas."""
+        fixed = AdaptiveWait(Mock(), 0.3, policy=PollingPolicy.fixed(0.01))
+        backoff = AdaptiveWait(Mock(), 0.3, policy=PollingPolicy(
+            "exponential", initial_interval=0.01, backoff_factor=2, max_interval=0.2))
+        
+        for wait in (fixed, backoff):
+            with pytest.raises(TimeoutException):
+                wait.until(lambda driver: False)
+        
+        assert backoff.last_polls < fixed.last_polls